@@ -0,0 +1,88 @@
+"""Toplu (NumPy) pozisyon değerlendirme ölçümü.
+
+Rastgele oynanmış oyunların tüm pozisyonlarını üç yolla puanlar ve
+saniyedeki pozisyon sayısını raporlar:
+    board   - chess_batch.evaluate_board ile her ChessBoard tek tek (aynı puan terimleri)
+    ai      - chess_ai.evaluate ile tek tek (yalnızca malzeme + kare tabloları)
+    batch   - snapshot'lardan N x 64 dizi oluşturma + chess_batch.evaluate_batch
+Toplu sonuçların evaluate_board ile birebir aynı olduğu da doğrulanır.
+
+Kullanım:
+    python benchmarks/batch_eval_bench.py --games 100
+    python benchmarks/batch_eval_bench.py --format json
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import numpy as np
+
+from chess_ai import evaluate
+from chess_batch import evaluate_batch, evaluate_board, game_snapshots, positions_from_snapshots
+from chess_game import ChessBoard
+
+
+def random_snapshots(games, plies, seed=1):
+    """Sabit tohumla rastgele oyunlar oyna ve tüm pozisyonlarının snapshot'larını döndür"""
+    rng = random.Random(seed)
+    snapshots = []
+    for _ in range(games):
+        game = ChessBoard()
+        for _ in range(plies):
+            legal_moves = [(from_pos, to_pos) for from_pos, targets in game.get_legal_moves().items()
+                           for to_pos in targets]
+            if not legal_moves:
+                break
+            game.make_move(*rng.choice(legal_moves))
+        snapshots.extend(game_snapshots(game))
+    return snapshots
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Toplu pozisyon değerlendirme ölçümü")
+    parser.add_argument('--games', type=int, default=100)
+    parser.add_argument('--plies', type=int, default=80)
+    parser.add_argument('--format', choices=['table', 'json'], default='table')
+    args = parser.parse_args()
+
+    snapshots = random_snapshots(args.games, args.plies)
+    boards = [ChessBoard.from_snapshot(snapshot) for snapshot in snapshots]
+
+    timings = {}
+    start = time.perf_counter()
+    expected = [evaluate_board(board) for board in boards]
+    timings['board'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for board in boards:
+        evaluate(board)
+    timings['ai'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    scores = evaluate_batch(positions_from_snapshots(snapshots))
+    timings['batch'] = time.perf_counter() - start
+
+    if not np.array_equal(scores, expected):
+        print("HATA: toplu puanlar evaluate_board ile uyuşmuyor", file=sys.stderr)
+        return 1
+
+    results = [{'path': name, 'seconds': round(seconds, 4),
+                'positions_per_second': round(len(snapshots) / seconds)}
+               for name, seconds in timings.items()]
+    if args.format == 'json':
+        print(json.dumps({'positions': len(snapshots), 'results': results}, indent=2))
+    else:
+        print(f"{len(snapshots)} pozisyon")
+        print(f"{'yol':<8}{'saniye':>10}{'pozisyon/s':>14}")
+        for row in results:
+            print(f"{row['path']:<8}{row['seconds']:>10}{row['positions_per_second']:>14}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+"""Toplu şah durumu ve yasal hamle sayımı ölçümü.
+
+Rastgele oynanmış oyunların pozisyonlarında şah durumu ve yasal hamle
+sayısını iki yolla hesaplar ve saniyedeki pozisyon sayısını raporlar:
+    board   - her pozisyon için ChessBoard.from_snapshot + get_game_status
+    batch   - snapshot'lardan durum dizisi + chess_batch.batch_status
+Sonuçların birebir aynı olduğu da doğrulanır.
+
+Kullanım:
+    python benchmarks/batch_status_bench.py --games 50
+    python benchmarks/batch_status_bench.py --format json
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import numpy as np
+
+from chess_batch import batch_status, game_snapshots, states_from_snapshots
+from chess_game import ChessBoard
+
+
+def random_snapshots(games, plies, seed=1):
+    """Sabit tohumla rastgele oyunlar oyna ve tüm pozisyonlarının snapshot'larını döndür"""
+    rng = random.Random(seed)
+    snapshots = []
+    for _ in range(games):
+        game = ChessBoard()
+        for _ in range(plies):
+            legal_moves = [(from_pos, to_pos) for from_pos, targets in game.get_legal_moves().items()
+                           for to_pos in targets]
+            if not legal_moves:
+                break
+            game.make_move(*rng.choice(legal_moves))
+        snapshots.extend(game_snapshots(game))
+    return snapshots
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Toplu şah durumu ve yasal hamle sayımı ölçümü")
+    parser.add_argument('--games', type=int, default=50)
+    parser.add_argument('--plies', type=int, default=120)
+    parser.add_argument('--format', choices=['table', 'json'], default='table')
+    args = parser.parse_args()
+
+    snapshots = random_snapshots(args.games, args.plies)
+
+    start = time.perf_counter()
+    in_check, counts = [], []
+    for snapshot in snapshots:
+        status = ChessBoard.from_snapshot(snapshot).get_game_status()
+        in_check.append(status['in_check'])
+        counts.append(sum(len(targets) for targets in status['legal_moves'].values()))
+    board_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = batch_status(states_from_snapshots(snapshots))
+    batch_seconds = time.perf_counter() - start
+
+    if not (np.array_equal(result['in_check'], in_check) and np.array_equal(result['legal_move_count'], counts)):
+        print("HATA: toplu sonuçlar ChessBoard ile uyuşmuyor", file=sys.stderr)
+        return 1
+
+    results = [{'path': name, 'seconds': round(seconds, 4), 'positions_per_second': round(len(snapshots) / seconds)}
+               for name, seconds in (('board', board_seconds), ('batch', batch_seconds))]
+    if args.format == 'json':
+        print(json.dumps({'positions': len(snapshots), 'results': results}, indent=2))
+    else:
+        print(f"{len(snapshots)} pozisyon")
+        print(f"{'yol':<8}{'saniye':>10}{'pozisyon/s':>14}")
+        for row in results:
+            print(f"{row['path']:<8}{row['seconds']:>10}{row['positions_per_second']:>14}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
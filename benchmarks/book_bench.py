@@ -0,0 +1,110 @@
+"""Açılış kitabı ölçümü.
+
+Verilen PGN dosyasından (yoksa sabit tohumlu rastgele oyunlardan) geçici
+bir kitap oluşturur; oluşturma süresini, kitabın açılma süresini, kitapta
+olan ve olmayan pozisyonlarda arama süresini ve aynı pozisyonlarda
+ChessAI aramasının süresini (kitabın yerini tuttuğu maliyet) raporlar.
+
+Kullanım:
+    python benchmarks/book_bench.py --games 2000
+    python benchmarks/book_bench.py --pgn oyunlar.pgn --format json
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from chess_ai import ChessAI
+from chess_book import DEFAULT_MAX_PLY, OpeningBook, book_entries, pgn_games, write_book
+from chess_game import ChessBoard
+
+
+def random_games(count, plies, seed=1):
+    """Sabit tohumla rastgele yasal hamlelerle oynanmış tahtalar üret"""
+    rng = random.Random(seed)
+    games = []
+    for _ in range(count):
+        game = ChessBoard()
+        for _ in range(plies):
+            legal_moves = [(from_pos, to_pos) for from_pos, targets in game.get_legal_moves().items()
+                           for to_pos in targets]
+            if not legal_moves:
+                break
+            game.make_move(*rng.choice(legal_moves))
+        games.append(game)
+    return games
+
+
+def book_positions(games, count):
+    """Kitaptaki oyunların ilk hamlelerinden ölçüm için pozisyonlar topla"""
+    positions = []
+    for game in games[:count]:
+        board = ChessBoard()
+        for move in game.move_history[:game.current_move + 1][:12]:
+            positions.append(ChessBoard.from_snapshot(board.snapshot()))
+            board.push(move)
+    return positions
+
+
+def per_call(function, inputs):
+    start = time.perf_counter()
+    for item in inputs:
+        function(item)
+    return round(1e6 * (time.perf_counter() - start) / len(inputs), 2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Açılış kitabı ölçümü")
+    parser.add_argument('--pgn', help="kitabın oluşturulacağı PGN dosyası")
+    parser.add_argument('--games', type=int, default=1000, help="PGN verilmezse üretilecek rastgele oyun sayısı")
+    parser.add_argument('--search-depth', type=int, default=3, help="karşılaştırılan ChessAI arama derinliği")
+    parser.add_argument('--format', choices=['table', 'json'], default='table')
+    args = parser.parse_args()
+
+    if args.pgn:
+        games = list(pgn_games([args.pgn]))
+    else:
+        games = random_games(args.games, DEFAULT_MAX_PLY)
+    positions = book_positions(games, 20)
+    # Kitapta olmayan pozisyonlar: rastgele oyunların daha ileri hamleleri
+    misses = [ChessBoard.from_snapshot(game.snapshot()) for game in random_games(50, 40, seed=2)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'book.bin')
+        start = time.perf_counter()
+        entries = write_book(path, book_entries(games))
+        build_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        book = OpeningBook(path)
+        open_us = round(1e6 * (time.perf_counter() - start), 1)
+        result = {
+            'entries': entries,
+            'file_bytes': os.path.getsize(path),
+            'build_seconds': round(build_seconds, 2),
+            'open_us': open_us,
+            'lookup_hit_us': per_call(lambda game: book.entries(game.zobrist_key), positions),
+            'lookup_miss_us': per_call(lambda game: book.entries(game.zobrist_key), misses),
+            'choose_us': per_call(book.choose, positions),
+        }
+        book.close()
+
+    ai = ChessAI()
+    result['search_us'] = per_call(lambda game: ai.search(game, time_ms=60000, max_depth=args.search_depth),
+                                   positions[:24])
+    result['search_depth'] = args.search_depth
+
+    if args.format == 'json':
+        print(json.dumps(result, indent=2))
+    else:
+        for name, value in result.items():
+            print(f"{name:<16}{value:>14}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""ChessBoard bellek ölçümü.
+
+Çok sayıda pozisyonu bellekte tutmanın maliyetini ölçer: her senaryoda N
+tahta oluşturulur ve tracemalloc ile pozisyon başına ayrılan bayt sayısı ile
+pozisyon başına oluşturma süresi raporlanır. Sürümler arası karşılaştırma
+için JSON çıktı verir.
+
+Senaryolar:
+    start   - ChessBoard() başlangıç pozisyonu
+    fen     - ChessBoard.from_fen ile yüklenen oyun ortası pozisyonları
+    dict    - ChessBoard.from_dict ile kopyalanan pozisyonlar (işçinin kopyalama yolu)
+    played  - başlangıçtan 40 hamle oynanmış tahtalar (hamle geçmişi ve geri alma yığını dahil)
+
+Kullanım:
+    python benchmarks/memory_bench.py --count 2000
+    python benchmarks/memory_bench.py --format json --output memory.json
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from chess_game import ChessBoard
+
+PLIES = 40
+
+
+def random_games(count, plies, seed=1):
+    """Sabit tohumla rastgele yasal hamlelerden oluşan oyunlar (hamle listeleri) üret"""
+    rng = random.Random(seed)
+    games = []
+    for _ in range(count):
+        game = ChessBoard()
+        moves = []
+        for _ in range(plies):
+            legal_moves = [(from_pos, to_pos) for from_pos, targets in game.get_legal_moves().items()
+                           for to_pos in targets]
+            if not legal_moves:
+                break
+            move = rng.choice(legal_moves)
+            game.make_move(*move)
+            moves.append(move)
+        games.append((moves, game.to_fen(), game.to_dict()))
+    return games
+
+
+def play(moves):
+    game = ChessBoard()
+    for move in moves:
+        game.make_move(*move)
+    return game
+
+
+def measure(build, inputs):
+    """inputs'taki her öğe için build çağır, tahtaları bellekte tut ve pozisyon başına bayt/süre döndür"""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    boards = [build(item) for item in inputs]
+    elapsed = time.perf_counter() - start
+    for board in boards:
+        # Oyun durumu önbelleği ölçüme girmesin
+        board.cached_status = None
+    gc.collect()
+    current = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del boards
+    return {
+        'bytes_per_position': round(current / len(inputs)),
+        'microseconds_per_position': round(1e6 * elapsed / len(inputs), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ChessBoard bellek ölçümü")
+    parser.add_argument('--count', type=int, default=1000, help="senaryo başına tahta sayısı")
+    parser.add_argument('--format', choices=['table', 'json'], default='table')
+    parser.add_argument('--output', help="sonuçları dosyaya yaz (varsayılan: ekran)")
+    args = parser.parse_args()
+
+    # Girdiler ölçümden önce hazırlanır; oyunlar arasında tekrar eden pozisyonlar olabilir
+    games = random_games(min(args.count, 200), PLIES)
+    games = (games * (args.count // len(games) + 1))[:args.count]
+
+    results = []
+    for name, build, inputs in [
+        ('start', lambda _: ChessBoard(), range(args.count)),
+        ('fen', ChessBoard.from_fen, [fen for _, fen, _ in games]),
+        ('dict', ChessBoard.from_dict, [data for _, _, data in games]),
+        ('played', play, [moves for moves, _, _ in games]),
+    ]:
+        row = measure(build, inputs)
+        row['scenario'] = name
+        results.append(row)
+
+    if args.format == 'json':
+        text = json.dumps({'python': sys.version.split()[0], 'count': args.count, 'results': results}, indent=2)
+    else:
+        lines = [f"{'senaryo':<10}{'bayt/pozisyon':>15}{'µs/pozisyon':>14}"]
+        for row in results:
+            lines.append(f"{row['scenario']:<10}{row['bytes_per_position']:>15}{row['microseconds_per_position']:>14}")
+        text = '\n'.join(lines)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""ChessBoard perft ölçümü ve doğruluk testi.
+
+Referans pozisyonlarda artan derinliklerde perft çalıştırır; düğüm sayısını
+beklenen değerle karşılaştırır, süre, saniyedeki düğüm sayısı ve tepe bellek
+kullanımını raporlar. Sürümler arası karşılaştırma için JSON/CSV çıktı verir.
+
+Kullanım:
+    python benchmarks/perft_bench.py
+    python benchmarks/perft_bench.py --max-depth 3 --format json --output perft.json
+    python benchmarks/perft_bench.py --max-depth 5 --no-memory   # başlangıç pozisyonu 5. derinlik (yavaş)
+"""
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from chess_game import ChessBoard
+
+# (isim, FEN (None = başlangıç pozisyonu), bu pozisyondan yapılacak hamleler,
+# derinliğe göre beklenen düğüm sayıları). Beklenen değerler standart perft
+# sonuçlarıdır; kiwipete ve position3-5 rok, geçerken alma ve terfiyi sınar.
+REFERENCE_POSITIONS = [
+    ('start', None, [], {1: 20, 2: 400, 3: 8902, 4: 197281, 5: 4865609}),
+    ('sicilian', None, ['e2e4', 'c7c5', 'g1f3', 'd7d6', 'd2d4', 'c5d4', 'f3d4'], {1: 28, 2: 1137, 3: 31987}),
+    ('scandinavian', None, ['e2e4', 'd7d5', 'e4d5', 'd8d5'], {1: 29, 2: 1307, 3: 36145}),
+    ('queens_gambit', None, ['d2d4', 'd7d5', 'c2c4', 'e7e6'], {1: 30, 2: 986}),
+    ('italian', None, ['e2e4', 'e7e5', 'g1f3', 'b8c6'], {1: 27, 2: 835}),
+    ('kiwipete', 'r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1', [],
+     {1: 48, 2: 2039, 3: 97862}),
+    ('position3', '8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1', [], {1: 14, 2: 191, 3: 2812, 4: 43238}),
+    ('position4', 'r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1', [],
+     {1: 6, 2: 264, 3: 9467}),
+    ('position5', 'rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8', [], {1: 44, 2: 1486, 3: 62379}),
+]
+
+
+def parse_square(text):
+    """'e2' gibi bir kareyi (satır, sütun) çiftine çevir"""
+    return 8 - int(text[1]), ord(text[0]) - ord('a')
+
+
+def build_position(fen, moves):
+    """FEN'den (veya başlangıç pozisyonundan) verilen hamleleri oynayarak tahtayı kur"""
+    game = ChessBoard.from_fen(fen) if fen else ChessBoard()
+    for move in moves:
+        success, message = game.make_move(parse_square(move[:2]), parse_square(move[2:4]))
+        if not success:
+            raise ValueError(f"{move}: {message}")
+    return game
+
+
+def run_benchmark(max_depth, measure_memory=True):
+    """Tüm referans pozisyonları ölç ve sonuç satırlarını döndür"""
+    results = []
+    for name, fen, moves, expected_counts in REFERENCE_POSITIONS:
+        game = build_position(fen, moves)
+        for depth, expected in sorted(expected_counts.items()):
+            if depth > max_depth:
+                break
+
+            start = time.perf_counter()
+            nodes = game.perft(depth)
+            elapsed = time.perf_counter() - start
+
+            # Bellek ölçümü süreyi etkilemesin diye ayrı bir çalıştırmada yapılır
+            peak_bytes = None
+            if measure_memory:
+                tracemalloc.start()
+                game.perft(depth)
+                peak_bytes = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+
+            results.append({
+                'position': name,
+                'depth': depth,
+                'nodes': nodes,
+                'expected': expected,
+                'ok': nodes == expected,
+                'seconds': round(elapsed, 6),
+                'nodes_per_second': round(nodes / elapsed) if elapsed > 0 else None,
+                'peak_memory_bytes': peak_bytes,
+            })
+    return results
+
+
+def format_results(results, output_format):
+    if output_format == 'json':
+        return json.dumps({'python': sys.version.split()[0], 'results': results}, indent=2)
+
+    if output_format == 'csv':
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=list(results[0].keys()) if results else [])
+        writer.writeheader()
+        writer.writerows(results)
+        return buffer.getvalue()
+
+    lines = [f"{'pozisyon':<16}{'derinlik':>9}{'düğüm':>10}{'beklenen':>10}{'süre (s)':>11}{'düğüm/s':>10}{'bellek (KB)':>13}"]
+    for row in results:
+        memory = '-' if row['peak_memory_bytes'] is None else f"{row['peak_memory_bytes'] / 1024:.1f}"
+        status = '' if row['ok'] else '  HATALI'
+        lines.append(f"{row['position']:<16}{row['depth']:>9}{row['nodes']:>10}{row['expected']:>10}"
+                     f"{row['seconds']:>11.3f}{row['nodes_per_second'] or 0:>10}{memory:>13}{status}")
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ChessBoard perft ölçümü")
+    parser.add_argument('--max-depth', type=int, default=4, help="en fazla perft derinliği")
+    parser.add_argument('--format', choices=['table', 'json', 'csv'], default='table')
+    parser.add_argument('--output', help="sonuçları dosyaya yaz (varsayılan: ekran)")
+    parser.add_argument('--no-memory', action='store_true', help="bellek ölçümünü atla")
+    args = parser.parse_args()
+
+    results = run_benchmark(args.max_depth, measure_memory=not args.no_memory)
+    text = format_results(results, args.format)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text)
+    else:
+        print(text)
+
+    # Düğüm sayısı tutmayan pozisyon varsa hata kodu ile çık
+    return 0 if all(row['ok'] for row in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+"""ChessGUI çizim döngüsü ölçümü.
+
+Eski döngüyü (her turda tüm ekranı çiz, kare hızı sınırı yok) yeni döngüyle
+(kare hızı sınırı, yalnızca değişen kareleri çiz, olay yoksa çizimi atla)
+karşılaştırır. Her senaryo için CPU kullanımı, çizilen kare sayısı ve kare
+başına çizim süresini raporlar. Pencere açmadan (SDL dummy sürücüsü) çalışır.
+
+Kullanım:
+    python benchmarks/render_bench.py --seconds 3 --fps 60
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+
+from chess_gui import ChessGUI
+
+
+def run_loop(gui, seconds, capped, event_every):
+    """Döngüyü verilen süre boyunca çalıştır; event_every karede bir fare hareketi olayı gönder"""
+    frame_times = []
+    iterations = 0
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    gui.full_redraw = True
+
+    while time.perf_counter() - wall_start < seconds:
+        iterations += 1
+        if event_every and iterations % event_every == 0:
+            pygame.event.post(pygame.event.Event(pygame.MOUSEMOTION, pos=(0, 0), rel=(0, 0), buttons=(0, 0, 0)))
+        events = pygame.event.get()
+
+        if capped:
+            if events or gui.full_redraw:
+                start = time.perf_counter()
+                gui.render()
+                frame_times.append(time.perf_counter() - start)
+            gui.clock.tick(gui.FPS)
+        else:
+            # Eski davranış: her turda her şeyi baştan çiz
+            start = time.perf_counter()
+            gui.full_redraw = True
+            gui.render()
+            frame_times.append(time.perf_counter() - start)
+
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+    return {
+        'iterations': iterations,
+        'frames_drawn': len(frame_times),
+        'cpu_percent': round(100 * cpu / wall, 1),
+        'mean_frame_ms': round(1000 * statistics.mean(frame_times), 3) if frame_times else 0.0,
+        'max_frame_ms': round(1000 * max(frame_times), 3) if frame_times else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ChessGUI çizim döngüsü ölçümü")
+    parser.add_argument('--seconds', type=float, default=3.0, help="senaryo başına süre")
+    parser.add_argument('--fps', type=int, default=60)
+    parser.add_argument('--format', choices=['table', 'json'], default='table')
+    args = parser.parse_args()
+
+    os.chdir(ROOT)
+    gui = ChessGUI(fps=args.fps)
+    # Arka plan işçisi ölçümü etkilemesin
+    gui.worker.shutdown()
+
+    results = []
+    for name, capped, event_every in [
+        ('eski / boşta', False, 0),
+        ('yeni / boşta', True, 0),
+        ('eski / olaylı', False, 10),
+        ('yeni / olaylı', True, 10),
+    ]:
+        row = run_loop(gui, args.seconds, capped, event_every)
+        row['scenario'] = name
+        results.append(row)
+
+    if args.format == 'json':
+        print(json.dumps({'fps': args.fps, 'seconds': args.seconds, 'results': results}, indent=2))
+    else:
+        print(f"{'senaryo':<16}{'tur':>9}{'çizilen':>9}{'CPU %':>8}{'ort. ms':>10}{'en çok ms':>11}")
+        for row in results:
+            print(f"{row['scenario']:<16}{row['iterations']:>9}{row['frames_drawn']:>9}{row['cpu_percent']:>8}"
+                  f"{row['mean_frame_ms']:>10}{row['max_frame_ms']:>11}")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
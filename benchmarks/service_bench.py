@@ -0,0 +1,116 @@
+"""Analiz servisi gecikme ölçümü.
+
+chess_service.py'yi alt süreç olarak başlatır ve aynı 'status' sorgusunu
+farklı yollarla ölçer:
+    spawn        - her sorgu için yeni Python süreci (chess_game içe aktarılır)
+    spawn+gui    - her sorgu için yeni Python süreci (chess_gui, yani pygame de içe aktarılır)
+    connect      - her sorgu için servise yeni bağlantı
+    reuse        - tek bağlantı üzerinden sıralı sorgular
+    pipelined    - tek bağlantı üzerinden yanıt beklemeden gönderilen sorgular
+Her yol için sorgu başına ortalama milisaniye raporlanır.
+
+Kullanım:
+    python benchmarks/service_bench.py --queries 500
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from chess_service import AnalysisClient
+
+FEN = 'r1bqkbnr/pppp1ppp/2n5/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R w KQkq - 2 3'
+SPAWN_SCRIPT = ("import sys; sys.path.insert(0, {root!r}); {imports}; "
+                "from chess_game import ChessBoard; ChessBoard.from_fen({fen!r}).get_game_status()")
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def spawn_ms(count, imports):
+    env = dict(os.environ, SDL_VIDEODRIVER='dummy', PYGAME_HIDE_SUPPORT_PROMPT='1')
+    script = SPAWN_SCRIPT.format(root=ROOT, imports=imports, fen=FEN)
+    start = time.perf_counter()
+    for _ in range(count):
+        subprocess.run([sys.executable, '-c', script], check=True, env=env, cwd=ROOT,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return 1000 * (time.perf_counter() - start) / count
+
+
+async def service_ms(port, queries):
+    results = {}
+    start = time.perf_counter()
+    for _ in range(min(queries, 200)):
+        client = await AnalysisClient.connect(port=port)
+        await client.request('status', fen=FEN)
+        await client.close()
+    results['connect'] = 1000 * (time.perf_counter() - start) / min(queries, 200)
+
+    client = await AnalysisClient.connect(port=port)
+    start = time.perf_counter()
+    for _ in range(queries):
+        await client.request('status', fen=FEN)
+    results['reuse'] = 1000 * (time.perf_counter() - start) / queries
+
+    start = time.perf_counter()
+    await asyncio.gather(*[client.request('status', fen=FEN) for _ in range(queries)])
+    results['pipelined'] = 1000 * (time.perf_counter() - start) / queries
+    await client.close()
+    return results
+
+
+async def wait_for_service(port, timeout=10):
+    deadline = time.perf_counter() + timeout
+    while True:
+        try:
+            client = await AnalysisClient.connect(port=port)
+            await client.request('ping')
+            await client.close()
+            return
+        except OSError:
+            if time.perf_counter() > deadline:
+                raise
+            await asyncio.sleep(0.05)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Analiz servisi gecikme ölçümü")
+    parser.add_argument('--queries', type=int, default=500, help="servis yolları için sorgu sayısı")
+    parser.add_argument('--spawns', type=int, default=5, help="süreç başlatma yolları için sorgu sayısı")
+    parser.add_argument('--format', choices=['table', 'json'], default='table')
+    args = parser.parse_args()
+
+    results = {
+        'spawn': spawn_ms(args.spawns, 'pass'),
+        'spawn+gui': spawn_ms(args.spawns, 'import chess_gui'),
+    }
+    port = free_port()
+    service = subprocess.Popen([sys.executable, os.path.join(ROOT, 'chess_service.py'), '--port', str(port),
+                                '--workers', '1'], stderr=subprocess.DEVNULL)
+    try:
+        asyncio.run(wait_for_service(port))
+        results.update(asyncio.run(service_ms(port, args.queries)))
+    finally:
+        service.terminate()
+        service.wait()
+
+    if args.format == 'json':
+        print(json.dumps({name: round(value, 3) for name, value in results.items()}, indent=2))
+    else:
+        print(f"{'yol':<12}{'ms/sorgu':>10}")
+        for name, value in results.items():
+            print(f"{name:<12}{value:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Pozisyon kopyalama ölçümü: to_dict/from_dict ile snapshot/from_snapshot.
+
+Rastgele oynanmış oyunlardan alınan pozisyonlar üzerinde her iki yolun
+dışa aktarma, geri yükleme ve tam kopya (ikisi birden) sürelerini ve
+pickle ile süreçler arasında gönderilecek boyutu raporlar.
+
+Kullanım:
+    python benchmarks/snapshot_bench.py --positions 500 --repeat 5
+    python benchmarks/snapshot_bench.py --format json
+"""
+import argparse
+import json
+import os
+import pickle
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from chess_game import ChessBoard
+
+
+def random_positions(count, max_plies=80, seed=1):
+    """Sabit tohumla rastgele yasal hamleler oynanmış tahtalar üret"""
+    rng = random.Random(seed)
+    boards = []
+    for _ in range(count):
+        game = ChessBoard()
+        for _ in range(rng.randint(0, max_plies)):
+            legal_moves = [(from_pos, to_pos) for from_pos, targets in game.get_legal_moves().items()
+                           for to_pos in targets]
+            if not legal_moves:
+                break
+            game.make_move(*rng.choice(legal_moves))
+        boards.append(game)
+    return boards
+
+
+def timed(function, inputs, repeat):
+    """function'ı tüm girdiler üzerinde repeat kez çalıştır; en iyi turun çağrı başına µs değeri"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for item in inputs:
+            function(item)
+        best = min(best, time.perf_counter() - start)
+    return round(1e6 * best / len(inputs), 2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pozisyon kopyalama ölçümü")
+    parser.add_argument('--positions', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--format', choices=['table', 'json'], default='table')
+    args = parser.parse_args()
+
+    boards = random_positions(args.positions)
+    results = []
+    for name, export, load in [
+        ('dict', ChessBoard.to_dict, ChessBoard.from_dict),
+        ('snapshot', ChessBoard.snapshot, ChessBoard.from_snapshot),
+    ]:
+        exported = [export(board) for board in boards]
+        results.append({
+            'path': name,
+            'export_us': timed(export, boards, args.repeat),
+            'load_us': timed(load, exported, args.repeat),
+            'copy_us': timed(lambda board: load(export(board)), boards, args.repeat),
+            'pickled_bytes': round(sum(len(pickle.dumps(item)) for item in exported) / len(exported)),
+        })
+
+    if args.format == 'json':
+        print(json.dumps({'positions': args.positions, 'results': results}, indent=2))
+    else:
+        print(f"{'yol':<10}{'dışa µs':>10}{'yükleme µs':>12}{'kopya µs':>10}{'pickle bayt':>13}")
+        for row in results:
+            print(f"{row['path']:<10}{row['export_us']:>10}{row['load_us']:>12}{row['copy_us']:>10}"
+                  f"{row['pickled_bytes']:>13}")
+
+
+if __name__ == "__main__":
+    main()
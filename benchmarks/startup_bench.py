@@ -0,0 +1,87 @@
+"""Başlangıç (içe aktarma) süresi ölçümü.
+
+Her ölçüm yeni bir Python sürecinde yapılır; böylece modüller önbellekten
+değil gerçekten yüklenir. Raporlanan adımlar:
+    chess_game / chess_ai / chess_pgn / chess_service - kurallar ve motor modülleri
+    chess_gui     - arayüz modülü (pygame içe aktarılır ama başlatılmaz)
+    gui_init      - ChessGUI(headless=True) kurulumu (dummy video sürücüsü)
+    first_render  - ilk tam çizim (taş görüntüleri ve font burada yüklenir)
+Her adım için ortanca milisaniye ve pygame'in yüklenip yüklenmediği yazılır.
+
+Kullanım:
+    python benchmarks/startup_bench.py --repeat 10
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+MODULES = ('chess_game', 'chess_ai', 'chess_pgn', 'chess_service')
+MODULE_SCRIPT = """
+import sys, time
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+import {module}
+print(time.perf_counter() - start, 'pygame' in sys.modules)
+"""
+GUI_SCRIPT = """
+import os, sys, time
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+import chess_gui
+imported = time.perf_counter()
+gui = chess_gui.ChessGUI(headless=True)
+created = time.perf_counter()
+gui.render()
+rendered = time.perf_counter()
+gui.worker.shutdown()
+print(imported - start, created - imported, rendered - created)
+"""
+
+
+def run_script(script, cwd):
+    env = dict(os.environ, PYGAME_HIDE_SUPPORT_PROMPT='1', PYTHONWARNINGS='ignore')
+    output = subprocess.run([sys.executable, '-c', script], check=True, capture_output=True,
+                            text=True, env=env, cwd=cwd).stdout
+    return output.split()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Başlangıç süresi ölçümü")
+    parser.add_argument('--repeat', type=int, default=5, help="adım başına süreç sayısı")
+    parser.add_argument('--format', choices=['table', 'json'], default='table')
+    args = parser.parse_args()
+
+    results = []
+    for module in MODULES:
+        samples = [run_script(MODULE_SCRIPT.format(root=ROOT, module=module), ROOT) for _ in range(args.repeat)]
+        results.append({'step': module,
+                        'ms': round(1000 * statistics.median(float(seconds) for seconds, _ in samples), 1),
+                        'pygame': samples[0][1] == 'True'})
+
+    # Arayüz geçici bir klasörde kurulur; saves/ oluşturulmadığı da görülür
+    with tempfile.TemporaryDirectory() as directory:
+        os.symlink(os.path.join(os.path.abspath(ROOT), 'pieces'), os.path.join(directory, 'pieces'))
+        samples = [run_script(GUI_SCRIPT.format(root=os.path.abspath(ROOT)), directory) for _ in range(args.repeat)]
+        saves_created = os.path.exists(os.path.join(directory, 'saves'))
+    for index, step in enumerate(('chess_gui', 'gui_init', 'first_render')):
+        results.append({'step': step,
+                        'ms': round(1000 * statistics.median(float(sample[index]) for sample in samples), 1),
+                        'pygame': True})
+
+    if args.format == 'json':
+        print(json.dumps({'results': results, 'saves_created': saves_created}, indent=2))
+    else:
+        print(f"{'adım':<16}{'ms':>10}  pygame")
+        for row in results:
+            print(f"{row['step']:<16}{row['ms']:>10}  {'evet' if row['pygame'] else 'hayır'}")
+        print(f"saves/ oluşturuldu: {'evet' if saves_created else 'hayır'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""PNG tahta çizimi ölçümü.
+
+Rastgele oynanmış oyunların pozisyonlarını chess_render.BoardRenderer ile
+PNG'ye çizer ve saniyedeki görüntü sayısını raporlar:
+    naive   - her görüntü için taş dosyaları yeniden okunup ölçeklenir
+    cold    - hazır sprite'larla çizim + PNG kodlama (önbellek boş)
+    cached  - aynı pozisyonlar yeniden istendiğinde LRU önbelleğinden
+    mixed   - kayıt listesine benzer istek dizisi: pozisyonların bir kısmı tekrar eder
+Ortalama PNG boyutu ve mixed senaryosundaki önbellek isabet oranı da yazılır.
+
+Kullanım:
+    python benchmarks/thumbnail_bench.py --games 20 --size 40
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from chess_batch import game_snapshots
+from chess_game import ChessBoard
+from chess_render import BoardRenderer
+
+
+def random_snapshots(games, plies, seed=1):
+    """Sabit tohumla rastgele oyunlar oyna ve tüm pozisyonlarının snapshot'larını döndür"""
+    rng = random.Random(seed)
+    snapshots = []
+    for _ in range(games):
+        game = ChessBoard()
+        for _ in range(plies):
+            legal_moves = [(from_pos, to_pos) for from_pos, targets in game.get_legal_moves().items()
+                           for to_pos in targets]
+            if not legal_moves:
+                break
+            game.make_move(*rng.choice(legal_moves))
+        snapshots.extend(game_snapshots(game))
+    return snapshots
+
+
+def images_per_second(function, inputs):
+    start = time.perf_counter()
+    for item in inputs:
+        function(item)
+    return round(len(inputs) / (time.perf_counter() - start), 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PNG tahta çizimi ölçümü")
+    parser.add_argument('--games', type=int, default=20)
+    parser.add_argument('--plies', type=int, default=60)
+    parser.add_argument('--size', type=int, default=40, help="kare boyutu (piksel)")
+    parser.add_argument('--compress-level', type=int, default=1, help="PNG zlib düzeyi (0-9)")
+    parser.add_argument('--format', choices=['table', 'json'], default='table')
+    args = parser.parse_args()
+
+    snapshots = random_snapshots(args.games, args.plies)
+    renderer = BoardRenderer(square_size=args.size, compress_level=args.compress_level)
+
+    results = {'positions': len(snapshots)}
+    results['naive'] = images_per_second(
+        lambda snapshot: BoardRenderer(square_size=args.size, cache_size=0,
+                                       compress_level=args.compress_level).render(snapshot),
+        snapshots[:max(1, len(snapshots) // 20)])
+    results['cold'] = images_per_second(renderer.render, snapshots)
+    results['png_bytes'] = round(sum(len(data) for data in renderer.cache.values()) / len(renderer.cache))
+    results['cached'] = images_per_second(renderer.render, snapshots)
+
+    # Kayıt listesi gibi: isteklerin yarısı sık görülen pozisyonlara (ilk dörtte bir), kalanı yenilere
+    rng = random.Random(2)
+    popular = snapshots[:len(snapshots) // 4]
+    requests = [rng.choice(popular) if rng.random() < 0.5 else snapshot
+                for snapshot in random_snapshots(args.games, args.plies, seed=3)]
+    renderer.clear_cache()
+    results['mixed'] = images_per_second(renderer.render, requests)
+    results['mixed_hit_rate'] = round(renderer.hits / (renderer.hits + renderer.misses), 3)
+
+    if args.format == 'json':
+        print(json.dumps(results, indent=2))
+    else:
+        for name, value in results.items():
+            unit = 'görüntü/s' if name in ('naive', 'cold', 'cached', 'mixed') else ''
+            print(f"{name:<16}{value:>12} {unit}")
+
+
+if __name__ == "__main__":
+    main()
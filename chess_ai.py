@@ -0,0 +1,411 @@
+import time
+
+from chess_game import (
+    BISHOP, FIFTY_MOVE_PLIES, KING, KNIGHT, PAWN, QUEEN, ROOK, SQUARES, decode_move
+)
+
+# Taş değerleri (santipiyon)
+PIECE_VALUES = {PAWN: 100, KNIGHT: 320, BISHOP: 330, ROOK: 500, QUEEN: 900, KING: 0}
+
+# Kare tabloları beyaz açısından yazılmıştır (ilk satır = 8. yatay)
+PIECE_SQUARE_TABLES = {
+    PAWN: [
+        0, 0, 0, 0, 0, 0, 0, 0,
+        50, 50, 50, 50, 50, 50, 50, 50,
+        10, 10, 20, 30, 30, 20, 10, 10,
+        5, 5, 10, 25, 25, 10, 5, 5,
+        0, 0, 0, 20, 20, 0, 0, 0,
+        5, -5, -10, 0, 0, -10, -5, 5,
+        5, 10, 10, -20, -20, 10, 10, 5,
+        0, 0, 0, 0, 0, 0, 0, 0,
+    ],
+    KNIGHT: [
+        -50, -40, -30, -30, -30, -30, -40, -50,
+        -40, -20, 0, 0, 0, 0, -20, -40,
+        -30, 0, 10, 15, 15, 10, 0, -30,
+        -30, 5, 15, 20, 20, 15, 5, -30,
+        -30, 0, 15, 20, 20, 15, 0, -30,
+        -30, 5, 10, 15, 15, 10, 5, -30,
+        -40, -20, 0, 5, 5, 0, -20, -40,
+        -50, -40, -30, -30, -30, -30, -40, -50,
+    ],
+    BISHOP: [
+        -20, -10, -10, -10, -10, -10, -10, -20,
+        -10, 0, 0, 0, 0, 0, 0, -10,
+        -10, 0, 5, 10, 10, 5, 0, -10,
+        -10, 5, 5, 10, 10, 5, 5, -10,
+        -10, 0, 10, 10, 10, 10, 0, -10,
+        -10, 10, 10, 10, 10, 10, 10, -10,
+        -10, 5, 0, 0, 0, 0, 5, -10,
+        -20, -10, -10, -10, -10, -10, -10, -20,
+    ],
+    ROOK: [
+        0, 0, 0, 0, 0, 0, 0, 0,
+        5, 10, 10, 10, 10, 10, 10, 5,
+        -5, 0, 0, 0, 0, 0, 0, -5,
+        -5, 0, 0, 0, 0, 0, 0, -5,
+        -5, 0, 0, 0, 0, 0, 0, -5,
+        -5, 0, 0, 0, 0, 0, 0, -5,
+        -5, 0, 0, 0, 0, 0, 0, -5,
+        0, 0, 0, 5, 5, 0, 0, 0,
+    ],
+    QUEEN: [
+        -20, -10, -10, -5, -5, -10, -10, -20,
+        -10, 0, 0, 0, 0, 0, 0, -10,
+        -10, 0, 5, 5, 5, 5, 0, -10,
+        -5, 0, 5, 5, 5, 5, 0, -5,
+        0, 0, 5, 5, 5, 5, 0, -5,
+        -10, 5, 5, 5, 5, 5, 0, -10,
+        -10, 0, 5, 0, 0, 0, 0, -10,
+        -20, -10, -10, -5, -5, -10, -10, -20,
+    ],
+    KING: [
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -20, -30, -30, -40, -40, -30, -30, -20,
+        -10, -20, -20, -20, -20, -20, -20, -10,
+        20, 20, 0, 0, 0, 0, 20, 20,
+        20, 30, 10, 0, 0, 10, 30, 20,
+    ],
+}
+
+# Bitboard indeksine göre (taş değeri + kare tablosu) puanları; siyah tablolar aynalanır
+PIECE_SQUARE_SCORES = []
+for _index in range(12):
+    _piece_type = _index % 6
+    _table = PIECE_SQUARE_TABLES[_piece_type]
+    if _index >= 6:
+        _table = [_table[(7 - row) * 8 + col] for row, col in SQUARES]
+    PIECE_SQUARE_SCORES.append([PIECE_VALUES[_piece_type] + value for value in _table])
+
+MATE_SCORE = 100000
+MATE_THRESHOLD = MATE_SCORE - 1000
+INFINITY = MATE_SCORE + 1
+
+# Transpozisyon tablosu kayıt türleri
+EXACT, LOWER_BOUND, UPPER_BOUND = 0, 1, 2
+
+# Piyonların terfi ettiği 1. ve 8. yataylar
+PROMOTION_RANKS = 0xFF | 0xFF << 56
+
+
+class SearchTimeout(Exception):
+    """Arama süresi dolduğunda aramayı sonlandırmak için"""
+
+
+def evaluate(game):
+    """Pozisyonu sırası gelen taraf açısından puanla (malzeme + kare tabloları)"""
+    score = 0
+    for index, bitboard in enumerate(game.bitboards):
+        table = PIECE_SQUARE_SCORES[index]
+        total = 0
+        while bitboard:
+            low = bitboard & -bitboard
+            total += table[low.bit_length() - 1]
+            bitboard ^= low
+        score += total if index < 6 else -total
+    return score if game.current_turn == 'white' else -score
+
+
+class TranspositionTable:
+    """Sabit boyutlu transpozisyon tablosu.
+
+    Kayıtlar Zobrist anahtarına göre tek bir yuvaya yazılır. Yuva boşsa, önceki
+    bir aramadan kalmışsa veya yeni kayıt en az onun kadar derinse üzerine yazılır.
+    """
+
+    def __init__(self, size=1 << 18):
+        self.size = size
+        self.entries = [None] * size
+        self.generation = 0
+
+    def new_search(self):
+        self.generation += 1
+
+    def clear(self):
+        self.entries = [None] * self.size
+
+    def get(self, key):
+        entry = self.entries[key % self.size]
+        if entry is not None and entry[0] == key:
+            return entry
+        return None
+
+    def store(self, key, depth, score, flag, move):
+        index = key % self.size
+        entry = self.entries[index]
+        if entry is None or entry[5] != self.generation or depth >= entry[1]:
+            self.entries[index] = (key, depth, score, flag, move, self.generation)
+
+
+class ChessAI:
+    """Yinelemeli derinleştirmeli alfa-beta araması yapan bilgisayar oyuncusu"""
+
+    def __init__(self, tt_size=1 << 18, book=None):
+        self.tt = TranspositionTable(tt_size)
+        # Açılış kitabı (chess_book.OpeningBook); pozisyon kitaptaysa arama yapılmaz
+        self.book = book
+        self.history = [[0] * 64 for _ in range(64)]
+        self.killers = []
+        self.nodes = 0
+        self.deadline = None
+        self.root_best = None
+        self.stop_requested = False
+
+    def stop(self):
+        """Çalışan aramayı (başka bir iş parçacığından) durdur"""
+        self.stop_requested = True
+
+    def clear_stop(self):
+        """Önceki stop() isteğini temizle; search bayrağı kendisi sıfırlamaz"""
+        self.stop_requested = False
+
+    def best_move(self, game, time_ms=1000, max_depth=64):
+        """Süre sınırı içinde en iyi hamleyi (from_pos, to_pos, promotion) olarak döndür"""
+        move, _, _ = self.search(game, time_ms=time_ms, max_depth=max_depth)
+        return move
+
+    def search(self, game, time_ms=1000, max_depth=64):
+        """En iyi hamleyi ((from_pos, to_pos, promotion) olarak), puanını ve tamamlanan derinliği döndür.
+
+        promotion terfi olmayan hamlelerde None'dır. Arama tahta üzerinde push/pop ile yapılır; oyunun hamle geçmişi değişmez.
+        Pozisyon açılış kitabındaysa kitap hamlesi derinlik 0 ile hemen döndürülür.
+        """
+        if self.book is not None:
+            book_move = self.book.choose(game)
+            if book_move is not None:
+                return move_tuple(book_move), 0, 0
+
+        self.tt.new_search()
+        self.nodes = 0
+        self.deadline = time.perf_counter() + time_ms / 1000
+        self.killers = [[None, None] for _ in range(max_depth + 64)]
+        for row in self.history:
+            for i in range(64):
+                row[i] //= 8
+
+        best_move, best_score, completed_depth = None, 0, 0
+        for depth in range(1, max_depth + 1):
+            self.root_best = None
+            ply = game.ply
+            try:
+                score = self.negamax(game, depth, -INFINITY, INFINITY, 0)
+            except SearchTimeout:
+                # Süre dolduğunda yarıda kalan hamleler geri alınır
+                while game.ply > ply:
+                    game.pop()
+                break
+            if self.root_best is None:
+                # Yasal hamle yok (mat veya pat)
+                break
+            best_move, best_score, completed_depth = self.root_best, score, depth
+            # Mat bulunduysa daha derine inmeye gerek yok
+            if abs(score) >= MATE_THRESHOLD:
+                break
+
+        if best_move is None:
+            # Süre ilk derinliği bile tamamlamaya yetmediyse herhangi bir yasal hamle oyna
+            best_move = self.first_legal_move(game)
+        if best_move is None:
+            return None, best_score, completed_depth
+        return move_tuple(best_move), best_score, completed_depth
+
+    def first_legal_move(self, game):
+        color = game.current_turn
+        for move in self.generate_moves(game):
+            game.push(move)
+            legal = not game.is_king_in_check(color)
+            game.pop()
+            if legal:
+                return move
+        return None
+
+    def generate_moves(self, game, captures_only=False):
+        """Sırası gelen tarafın (şah kontrolü yapılmamış) hamlelerini encode_move kodları olarak üret.
+
+        Son sıraya ulaşan piyon hamleleri her terfi taşı için ayrı üretilir.
+        """
+        moves = []
+        board = game.board
+        color = game.current_turn
+        enemies = game.occupancy['black' if color == 'white' else 'white']
+        own = game.occupancy[color]
+        while own:
+            low = own & -own
+            own ^= low
+            from_square = low.bit_length() - 1
+            piece = board[from_square >> 3][from_square & 7]
+            targets = game.target_mask(from_square, piece)
+            if captures_only:
+                targets &= enemies
+            promoting = piece.index % 6 == PAWN and targets & PROMOTION_RANKS
+            while targets:
+                target = targets & -targets
+                targets ^= target
+                move = from_square | (target.bit_length() - 1) << 6
+                if promoting:
+                    # Vezir önce: hamle sıralamasında eşit puanlı hamleler arasında önde kalır
+                    for promotion in (QUEEN, KNIGHT, ROOK, BISHOP):
+                        moves.append(move | promotion << 12)
+                else:
+                    moves.append(move)
+        return moves
+
+    def order_moves(self, game, moves, tt_move, ply):
+        """Hamleleri sırala: TT hamlesi, alımlar (MVV-LVA), katil hamleler, geçmiş puanı"""
+        board = game.board
+        killers = self.killers[ply]
+        scored = []
+        for move in moves:
+            from_square = move & 63
+            to_square = (move >> 6) & 63
+            if move == tt_move:
+                score = 1 << 30
+            else:
+                target = board[to_square >> 3][to_square & 7]
+                if target is not None:
+                    attacker = board[from_square >> 3][from_square & 7]
+                    score = (1 << 28) + PIECE_VALUES[target.index % 6] * 16 \
+                        - PIECE_VALUES[attacker.index % 6] // 16
+                elif move == killers[0] or move == killers[1]:
+                    score = 1 << 27
+                else:
+                    score = self.history[from_square][to_square]
+            scored.append((score, move))
+        scored.sort(key=lambda item: item[0], reverse=True)
+        return [move for _, move in scored]
+
+    def check_time(self):
+        self.nodes += 1
+        if self.nodes & 1023 == 0 and (self.stop_requested or time.perf_counter() > self.deadline):
+            raise SearchTimeout()
+
+    def negamax(self, game, depth, alpha, beta, ply):
+        self.check_time()
+
+        key = game.zobrist_key
+        # Oyunda veya arama yolunda daha önce görülen pozisyon ve elli hamle kuralı beraberlik sayılır
+        if ply > 0 and (game.position_counts[key] > 1 or game.halfmove_clock >= FIFTY_MOVE_PLIES):
+            return 0
+        tt_move = None
+        entry = self.tt.get(key)
+        if entry is not None:
+            tt_move = entry[4]
+            if ply > 0 and entry[1] >= depth:
+                score = score_from_tt(entry[2], ply)
+                flag = entry[3]
+                if flag == EXACT:
+                    return score
+                if flag == LOWER_BOUND and score >= beta:
+                    return score
+                if flag == UPPER_BOUND and score <= alpha:
+                    return score
+
+        if depth <= 0:
+            return self.quiescence(game, alpha, beta, ply)
+
+        original_alpha = alpha
+        best_score = -INFINITY
+        best_move = None
+        board = game.board
+        color = game.current_turn
+        for move in self.order_moves(game, self.generate_moves(game), tt_move, ply):
+            to_square = (move >> 6) & 63
+            is_capture = board[to_square >> 3][to_square & 7] is not None
+            game.push(move)
+            if game.is_king_in_check(color):
+                game.pop()
+                continue
+            score = -self.negamax(game, depth - 1, -beta, -alpha, ply + 1)
+            game.pop()
+
+            if score > best_score:
+                best_score = score
+                best_move = move
+                if ply == 0:
+                    self.root_best = move
+            if score > alpha:
+                alpha = score
+            if alpha >= beta:
+                if not is_capture:
+                    killers = self.killers[ply]
+                    if killers[0] != move:
+                        killers[1] = killers[0]
+                        killers[0] = move
+                    self.history[move & 63][to_square] += depth * depth
+                break
+
+        if best_move is None:
+            # Yasal hamle yoksa: şah altındaysa mat, değilse pat
+            if game.is_king_in_check(game.current_turn):
+                return -MATE_SCORE + ply
+            return 0
+
+        if best_score <= original_alpha:
+            flag = UPPER_BOUND
+        elif best_score >= beta:
+            flag = LOWER_BOUND
+        else:
+            flag = EXACT
+        self.tt.store(key, depth, score_to_tt(best_score, ply), flag, best_move)
+        return best_score
+
+    def quiescence(self, game, alpha, beta, ply):
+        """Yalnızca alım hamlelerini arayarak ufuk etkisini azalt"""
+        self.check_time()
+
+        stand_pat = evaluate(game)
+        if stand_pat >= beta:
+            return stand_pat
+        if stand_pat > alpha:
+            alpha = stand_pat
+
+        color = game.current_turn
+        for move in self.order_moves(game, self.generate_moves(game, captures_only=True), None, ply):
+            game.push(move)
+            if game.is_king_in_check(color):
+                game.pop()
+                continue
+            score = -self.quiescence(game, -beta, -alpha, ply + 1)
+            game.pop()
+            if score >= beta:
+                return score
+            if score > alpha:
+                alpha = score
+        return alpha
+
+
+def move_tuple(move):
+    """encode_move kodunu (from_pos, to_pos, promotion) demetine çevir (terfi yoksa promotion None)"""
+    from_pos, to_pos, promotion = decode_move(move)
+    return from_pos, to_pos, promotion or None
+
+
+def score_to_tt(score, ply):
+    """Mat puanlarını kök yerine bulunduğu düğüme göre sakla"""
+    if score >= MATE_THRESHOLD:
+        return score + ply
+    if score <= -MATE_THRESHOLD:
+        return score - ply
+    return score
+
+
+def score_from_tt(score, ply):
+    if score >= MATE_THRESHOLD:
+        return score - ply
+    if score <= -MATE_THRESHOLD:
+        return score + ply
+    return score
+
+
+_default_ai = None
+
+
+def get_default_ai():
+    """Çağrılar arasında transpozisyon tablosunu koruyan ortak yapay zeka"""
+    global _default_ai
+    if _default_ai is None:
+        _default_ai = ChessAI()
+    return _default_ai
@@ -0,0 +1,434 @@
+"""NumPy ile toplu pozisyon değerlendirme.
+
+Pozisyonlar N x 64 boyutlu int8 dizisi olarak tutulur: her eleman
+snapshot() baytlarındaki gibi karedeki taşın bitboard indeksi + 1'dir
+(0 boş kare). evaluate_batch() malzeme, kare tabloları, hareketlilik ve
+şah güvenliği puanlarını kare başına Python döngüsü olmadan, yalnızca
+dizi işlemleriyle hesaplar. Puanlar beyaz açısındandır (santipiyon).
+
+evaluate_board() aynı puanı tek bir ChessBoard için hesaplar; toplu
+sonuçları doğrulamak ve karşılaştırmak içindir.
+
+batch_status() ise sıra, rok ve geçerken alma bilgisini de içeren
+N x SNAPSHOT_SIZE durum dizisinden (states_from_snapshots) her pozisyon için
+şah durumunu ve yasal hamle sayısını hesaplar; sonuçlar ChessBoard ile
+birebir aynıdır.
+"""
+import numpy as np
+
+from chess_ai import PIECE_SQUARE_SCORES
+from chess_game import (
+    BISHOP, BISHOP_DIRECTIONS, CASTLING_MOVES, CASTLING_TARGETS, COLOR_OFFSET, KING, KNIGHT,
+    KNIGHT_OFFSETS, PAWN, QUEEN, ROOK, ROOK_DIRECTIONS, SNAPSHOT_NO_EP, SNAPSHOT_SIZE, SQUARES
+)
+
+# Hareketlilik: taşın gidebildiği (boş veya rakip taşlı) kare başına puan
+MOBILITY_WEIGHTS = {KNIGHT: 4, BISHOP: 5, ROOK: 2, QUEEN: 1}
+# Şah güvenliği: şahın önündeki üç karede (bir ve iki sıra ileride) duran kendi piyonları başına puan
+KING_SHIELD_WEIGHTS = (10, 5)
+
+# evaluate_batch pozisyonları bu boyutta parçalar halinde işler (ara diziler önbellekte kalsın)
+BATCH_CHUNK = 2048
+
+# Tahta dışı kareler için dizinin sonuna eklenen satır
+OFF_BOARD = 64
+# Kare türü bayrakları (tahta dışı kare iki bayrağı da taşır); beyaz taş WHITE_KIND bayrağı
+# olmayan karelere, siyah taş BLACK_KIND bayrağı olmayan karelere gidebilir
+EMPTY_KIND, WHITE_KIND, BLACK_KIND = 0, 1, 2
+KIND_OF_CODE = np.array([EMPTY_KIND] + [WHITE_KIND] * 6 + [BLACK_KIND] * 6, dtype=np.int8)
+
+
+def _target_table(offsets, steps=1):
+    """Her kare için offsets yönlerindeki hedef kare indeksleri (tahta dışı: OFF_BOARD).
+
+    steps > 1 ise her yön için 1..steps adım uzaklıktaki kareler sırayla verilir.
+    """
+    table = np.full((len(offsets), steps, 64), OFF_BOARD, dtype=np.intp)
+    for direction, (row_step, col_step) in enumerate(offsets):
+        for square, (row, col) in enumerate(SQUARES):
+            for step in range(steps):
+                to_row, to_col = row + row_step * (step + 1), col + col_step * (step + 1)
+                if 0 <= to_row < 8 and 0 <= to_col < 8:
+                    table[direction, step, square] = to_row * 8 + to_col
+    return table
+
+
+KNIGHT_TARGETS = _target_table(KNIGHT_OFFSETS)[:, 0, :]
+ROOK_RAY_TARGETS = _target_table(ROOK_DIRECTIONS, 7)
+BISHOP_RAY_TARGETS = _target_table(BISHOP_DIRECTIONS, 7)
+# Şah kalkanı kareleri: renk -> (bir sıra ileride, iki sıra ileride) için (3, 64) indeks tabloları
+KING_SHIELD_TARGETS = {
+    color: tuple(_target_table([(forward * distance, -1), (forward * distance, 0), (forward * distance, 1)])[:, 0, :]
+                 for distance in (1, 2))
+    for color, forward in (('white', -1), ('black', 1))
+}
+# Taş kodu (indeks + 1) ve kare -> beyaz açısından malzeme + kare tablosu puanı
+PIECE_SQUARE_ARRAY = np.zeros((13, 64), dtype=np.int32)
+for _index, _scores in enumerate(PIECE_SQUARE_SCORES):
+    PIECE_SQUARE_ARRAY[_index + 1] = _scores if _index < 6 else [-score for score in _scores]
+# Kare-öncelikli düzen (64 x 13); düz indeks: kare * 13 + taş kodu
+PIECE_SQUARE_ARRAY = np.ascontiguousarray(PIECE_SQUARE_ARRAY.T)
+SQUARE_ROWS = np.arange(64)[:, None] * 13
+
+
+def positions_from_snapshots(snapshots):
+    """snapshot() baytlarından N x 64 int8 pozisyon dizisi oluştur"""
+    data = b''.join(snapshot[:64] for snapshot in snapshots)
+    return np.frombuffer(data, dtype=np.int8).reshape(-1, 64)
+
+
+def positions_from_boards(boards):
+    """ChessBoard listesinden N x 64 int8 pozisyon dizisi oluştur"""
+    return positions_from_snapshots(board.snapshot() for board in boards)
+
+
+def game_snapshots(game):
+    """Oyunun başlangıcından mevcut hamlesine kadar her pozisyonun snapshot'ı"""
+    current = game.current_move
+    while game.current_move >= 0:
+        game.undo_move()
+    snapshots = [game.snapshot()]
+    while game.current_move < current:
+        game.redo_move()
+        snapshots.append(game.snapshot())
+    return snapshots
+
+
+def save_snapshots(paths):
+    """Kayıt dosyalarındaki oyunların (geri alınmış hamleler dahil) tüm pozisyonları"""
+    from chess_pgn import load_saved_game
+    snapshots = []
+    for path in paths:
+        game, _ = load_saved_game(path)
+        while game.redo_move()[0]:
+            pass
+        snapshots.extend(game_snapshots(game))
+    return snapshots
+
+
+def _slider_mobility(empty, white_free, black_free, ray_targets):
+    """Her kareden ray_targets yönlerinde kayan beyaz ve siyah taşın gidebileceği kare sayıları (64 x N).
+
+    empty, white_free, black_free: (65 x N) boş kare, beyaz ve siyah taşın
+    gidebileceği kare maskeleri (son satır tahta dışı).
+    """
+    white_counts = np.zeros((64, empty.shape[1]), dtype=np.int8)
+    black_counts = np.zeros_like(white_counts)
+    reachable = np.empty(white_counts.shape, dtype=bool)
+    for steps in ray_targets:
+        open_ray = np.ones(white_counts.shape, dtype=bool)
+        for targets in steps:
+            np.logical_and(open_ray, white_free[targets], out=reachable)
+            white_counts += reachable
+            np.logical_and(open_ray, black_free[targets], out=reachable)
+            black_counts += reachable
+            open_ray &= empty[targets]
+    return white_counts, black_counts
+
+
+def evaluate_batch(positions, chunk_size=BATCH_CHUNK):
+    """N x 64 int8 pozisyon dizisini puanla; beyaz açısından N uzunluğunda int32 puan vektörü döndür"""
+    positions = np.asarray(positions, dtype=np.int8).reshape(-1, 64)
+    if len(positions) <= chunk_size:
+        return _evaluate_chunk(positions)
+    return np.concatenate([_evaluate_chunk(positions[start:start + chunk_size])
+                           for start in range(0, len(positions), chunk_size)])
+
+
+def _evaluate_chunk(positions):
+    # Hesaplar kare-öncelikli (64 x N) düzende yapılır: bir karenin N pozisyondaki
+    # değerleri bellekte yan yana durur ve hedef kare seçimi satır kopyalamaya dönüşür
+    squares = np.ascontiguousarray(positions.T)
+    count = squares.shape[1]
+    kinds = np.empty((65, count), dtype=np.int8)
+    kinds[:64] = KIND_OF_CODE[squares]
+    kinds[OFF_BOARD] = WHITE_KIND | BLACK_KIND
+    empty = kinds == EMPTY_KIND
+    white_free = kinds & WHITE_KIND == 0
+    black_free = kinds & BLACK_KIND == 0
+
+    # Malzeme ve kare tabloları
+    scores = PIECE_SQUARE_ARRAY.take(SQUARE_ROWS + squares).sum(axis=0)
+
+    # Hareketlilik
+    knight_white = white_free[KNIGHT_TARGETS].sum(axis=0)
+    knight_black = black_free[KNIGHT_TARGETS].sum(axis=0)
+    rook_white, rook_black = _slider_mobility(empty, white_free, black_free, ROOK_RAY_TARGETS)
+    bishop_white, bishop_black = _slider_mobility(empty, white_free, black_free, BISHOP_RAY_TARGETS)
+    for color, sign, knights, rooks, bishops in (('white', 1, knight_white, rook_white, bishop_white),
+                                                 ('black', -1, knight_black, rook_black, bishop_black)):
+        offset = COLOR_OFFSET[color] + 1
+        mobility = (MOBILITY_WEIGHTS[KNIGHT] * (knights * (squares == offset + KNIGHT)).sum(axis=0) +
+                    MOBILITY_WEIGHTS[BISHOP] * (bishops * (squares == offset + BISHOP)).sum(axis=0) +
+                    MOBILITY_WEIGHTS[ROOK] * (rooks * (squares == offset + ROOK)).sum(axis=0) +
+                    MOBILITY_WEIGHTS[QUEEN] * ((rooks + bishops) * (squares == offset + QUEEN)).sum(axis=0))
+        scores += sign * mobility
+
+    # Şah güvenliği: şahın önündeki kendi piyonları
+    columns = np.arange(count)
+    padded = np.empty((65, count), dtype=np.int8)
+    padded[:64] = squares
+    padded[OFF_BOARD] = 0
+    for color, sign in (('white', 1), ('black', -1)):
+        offset = COLOR_OFFSET[color] + 1
+        kings = squares == offset + KING
+        has_king = kings.any(axis=0)
+        king_squares = kings.argmax(axis=0)
+        for weight, targets in zip(KING_SHIELD_WEIGHTS, KING_SHIELD_TARGETS[color]):
+            shield = (padded[targets[:, king_squares], columns] == offset + PAWN).sum(axis=0)
+            scores += sign * weight * shield * has_king
+    return scores.astype(np.int32)
+
+
+def evaluate_board(game):
+    """evaluate_batch ile aynı puanı tek bir ChessBoard için hesapla (beyaz açısından)"""
+    score = 0
+    for index, bitboard in enumerate(game.bitboards):
+        table = PIECE_SQUARE_SCORES[index]
+        piece_type = index % 6
+        sign = 1 if index < 6 else -1
+        while bitboard:
+            low = bitboard & -bitboard
+            square = low.bit_length() - 1
+            bitboard ^= low
+            score += sign * table[square]
+            if piece_type in MOBILITY_WEIGHTS:
+                piece = game.board[square >> 3][square & 7]
+                mobility = bin(game.target_mask(square, piece)).count('1')
+                score += sign * MOBILITY_WEIGHTS[piece_type] * mobility
+
+    for color, sign, forward in (('white', 1, -1), ('black', -1, 1)):
+        king_square = game.king_squares[color]
+        if king_square is None:
+            continue
+        row, col = SQUARES[king_square]
+        pawns = game.bitboards[COLOR_OFFSET[color] + PAWN]
+        for distance, weight in enumerate(KING_SHIELD_WEIGHTS, 1):
+            shield_row = row + forward * distance
+            for shield_col in (col - 1, col, col + 1):
+                if 0 <= shield_row < 8 and 0 <= shield_col < 8 and pawns >> (shield_row * 8 + shield_col) & 1:
+                    score += sign * weight
+    return score
+
+
+
+# Toplu yasal hamle sayımı: her pozisyon uint64 bitboard'larla temsil edilir
+# (bit k = kare k, a8 = 0) ve saldırılar kaydırma işlemleriyle tüm pozisyonlar için birlikte hesaplanır.
+_FILE_A = np.uint64(sum(1 << (row * 8) for row in range(8)))
+_FILE_H = np.uint64(sum(1 << (row * 8 + 7) for row in range(8)))
+_FILE_B = np.uint64(int(_FILE_A) << 1)
+_FILE_G = np.uint64(int(_FILE_H) >> 1)
+_ALL = np.uint64(0xFFFFFFFFFFFFFFFF)
+_NOT_A = _ALL ^ _FILE_A
+_NOT_H = _ALL ^ _FILE_H
+_NOT_AB = _NOT_A & (_ALL ^ _FILE_B)
+_NOT_GH = _NOT_H & (_ALL ^ _FILE_G)
+# Piyonun başlangıç sırasından bir kare ilerleyince vardığı sıralar (3. ve 6. yatay)
+_ROW_3 = np.uint64(0xFF << 40)
+_ROW_6 = np.uint64(0xFF << 16)
+
+# Yönler: (kare indeksi farkı, kaydırma sonrası uygulanan sütun maskesi, doğrultu)
+# Doğrultu: 0 dikey, 1 yatay, 2 ve 3 çaprazlar; açmaz taş yalnızca kendi doğrultusunda hareket edebilir
+DIRECTIONS = {
+    'N': (-8, _ALL, 0), 'S': (8, _ALL, 0),
+    'E': (1, _NOT_A, 1), 'W': (-1, _NOT_H, 1),
+    'NE': (-7, _NOT_A, 2), 'SW': (7, _NOT_H, 2),
+    'NW': (-9, _NOT_H, 3), 'SE': (9, _NOT_A, 3),
+}
+ROOK_LINES = ('N', 'S', 'E', 'W')
+BISHOP_LINES = ('NE', 'NW', 'SE', 'SW')
+KNIGHT_SHIFTS = tuple(
+    (row_step * 8 + col_step, {2: _NOT_AB, 1: _NOT_A, -1: _NOT_H, -2: _NOT_GH}[col_step])
+    for row_step, col_step in KNIGHT_OFFSETS
+)
+
+
+def _shift(bits, offset):
+    """Bitboard'ları kare indeksi farkı kadar kaydır (negatif: küçük indekslere)"""
+    if offset > 0:
+        return bits << np.uint64(offset)
+    return bits >> np.uint64(-offset)
+
+
+def _step(bits, direction):
+    offset, mask, _ = DIRECTIONS[direction]
+    return _shift(bits, offset) & mask
+
+
+def _ray(generators, empty, direction):
+    """generators'tan direction yönünde kayan saldırılar (ilk dolu kare dahil); Kogge-Stone doldurma"""
+    offset, mask, _ = DIRECTIONS[direction]
+    empty = empty & mask
+    for distance in (1, 2, 4):
+        generators = generators | (empty & _shift(generators, offset * distance))
+        empty = empty & _shift(empty, offset * distance)
+    return _shift(generators, offset) & mask
+
+
+def _knight_attacks(knights):
+    attacks = np.zeros_like(knights)
+    for offset, mask in KNIGHT_SHIFTS:
+        attacks |= _shift(knights, offset) & mask
+    return attacks
+
+
+def _king_attacks(kings):
+    attacks = np.zeros_like(kings)
+    for direction in DIRECTIONS:
+        attacks |= _step(kings, direction)
+    return attacks
+
+
+def _pawn_attacks(pawns, white):
+    """Piyonların saldırdığı kareler; white: piyonların beyaz olduğu pozisyonlar için True dizisi"""
+    white_attacks = _step(pawns, 'NE') | _step(pawns, 'NW')
+    black_attacks = _step(pawns, 'SE') | _step(pawns, 'SW')
+    return np.where(white, white_attacks, black_attacks)
+
+
+def _popcount(bits):
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(bits).astype(np.int32)
+    # NumPy 2.0 öncesi: SWAR bit sayımı
+    bits = bits - ((bits >> np.uint64(1)) & np.uint64(0x5555555555555555))
+    bits = (bits & np.uint64(0x3333333333333333)) + ((bits >> np.uint64(2)) & np.uint64(0x3333333333333333))
+    bits = (bits + (bits >> np.uint64(4))) & np.uint64(0x0F0F0F0F0F0F0F0F)
+    return ((bits * np.uint64(0x0101010101010101)) >> np.uint64(56)).astype(np.int32)
+
+
+def states_from_snapshots(snapshots):
+    """snapshot() baytlarından N x SNAPSHOT_SIZE uint8 durum dizisi (kareler, sıra, rok, geçerken alma)"""
+    data = b''.join(snapshots)
+    return np.frombuffer(data, dtype=np.uint8).reshape(-1, SNAPSHOT_SIZE)
+
+
+def _bitboards(states):
+    """Durum dizisinden taş kodu başına (N,) uint64 bitboard listesi (indeks 0 kullanılmaz)"""
+    squares = states[:, :64]
+    bitboards = [None]
+    for code in range(1, 13):
+        packed = np.packbits(squares == code, axis=1, bitorder='little')
+        bitboards.append(np.ascontiguousarray(packed).view('<u8').ravel().astype(np.uint64))
+    return bitboards
+
+
+def _attackers(square, occupied, them, white_to_move):
+    """square bitboard'larındaki karelere (occupied doluluğuyla) saldıran rakip taşlar"""
+    pawns, knights, bishops, rooks, queens, kings = them
+    empty = ~occupied
+    attackers = (_knight_attacks(square) & knights) | (_king_attacks(square) & kings)
+    attackers |= _pawn_attacks(square, white_to_move) & pawns
+    for direction in ROOK_LINES:
+        attackers |= _ray(square, empty, direction) & (rooks | queens)
+    for direction in BISHOP_LINES:
+        attackers |= _ray(square, empty, direction) & (bishops | queens)
+    return attackers
+
+
+def batch_status(states):
+    """Durum dizisindeki (states_from_snapshots) her pozisyon için şah durumu ve yasal hamle sayısı.
+
+    Dönen sözlük: in_check (bool dizisi), legal_move_count (int32 dizisi),
+    checkmate ve stalemate. Hamle sayısı ChessBoard.get_legal_moves ile
+    aynıdır: her (kaynak, hedef) çifti bir kez sayılır, terfi seçenekleri ayrı
+    sayılmaz.
+    """
+    states = np.asarray(states, dtype=np.uint8).reshape(-1, SNAPSHOT_SIZE)
+    bitboards = _bitboards(states)
+    white_to_move = states[:, 64] == 0
+    castling_rights = states[:, 65]
+    ep_squares = states[:, 66].astype(np.uint64)
+    zero = np.zeros(len(states), dtype=np.uint64)
+
+    def side(white_offset, black_offset):
+        return np.where(white_to_move, bitboards[white_offset], bitboards[black_offset])
+
+    us = [side(1 + piece, 7 + piece) for piece in range(6)]
+    them = [side(7 + piece, 1 + piece) for piece in range(6)]
+    pawns, knights, bishops, rooks, queens, king = us
+    own = pawns | knights | bishops | rooks | queens | king
+    enemies = them[0] | them[1] | them[2] | them[3] | them[4] | them[5]
+    occupied = own | enemies
+    empty = ~occupied
+
+    # Rakibin saldırdığı kareler; şah kendi kaydığı ışının üzerinde kaçamasın diye şahsız doluluk
+    empty_without_king = empty | king
+    attacked = _knight_attacks(them[KNIGHT]) | _king_attacks(them[KING])
+    attacked |= _pawn_attacks(them[PAWN], ~white_to_move)
+    for direction in ROOK_LINES:
+        attacked |= _ray(them[ROOK] | them[QUEEN], empty_without_king, direction)
+    for direction in BISHOP_LINES:
+        attacked |= _ray(them[BISHOP] | them[QUEEN], empty_without_king, direction)
+
+    checkers = _attackers(king, occupied, them, white_to_move)
+    in_check = checkers != 0
+    checker_count = _popcount(checkers)
+
+    # Şah çekilirken diğer taşlar yalnızca şah çekeni alabilir veya araya girebilir
+    evasion = np.where(in_check, checkers, _ALL)
+    pinned_lines = [zero.copy() for _ in range(4)]
+    for direction in DIRECTIONS:
+        line = DIRECTIONS[direction][2]
+        ray = _ray(king, empty, direction)
+        evasion |= np.where((ray & checkers) != 0, ray, zero)
+        # Işındaki ilk taş bizimse ve arkasındaki ilk taş bu doğrultuda kayan rakip taşsa açmazdır
+        sliders = them[ROOK] | them[QUEEN] if line < 2 else them[BISHOP] | them[QUEEN]
+        blocker = ray & own
+        pinners = _ray(blocker, empty, direction) & sliders
+        pinned_lines[line] |= np.where(pinners != 0, blocker, zero)
+    evasion = np.where(checker_count > 1, zero, evasion)
+    pinned = pinned_lines[0] | pinned_lines[1] | pinned_lines[2] | pinned_lines[3]
+    targets = ~own & evasion
+
+    def movers(pieces, direction):
+        """direction yönünde hareket edebilecek (açmaz değil veya açmazı bu doğrultuda) taşlar"""
+        return pieces & (~pinned | pinned_lines[DIRECTIONS[direction][2]])
+
+    counts = np.zeros(len(states), dtype=np.int32)
+    free_knights = knights & ~pinned
+    for offset, mask in KNIGHT_SHIFTS:
+        counts += _popcount(_shift(free_knights, offset) & mask & targets)
+    # Aynı yönde kayan taşların ışınları kesişmez (arkadaki taşın ışını öndeki taşta biter)
+    for direction in ROOK_LINES:
+        counts += _popcount(_ray(movers(rooks | queens, direction), empty, direction) & targets)
+    for direction in BISHOP_LINES:
+        counts += _popcount(_ray(movers(bishops | queens, direction), empty, direction) & targets)
+
+    # Piyonlar: ileri itme, başlangıç sırasından iki kare ve çapraz alma
+    for white, forward, captures, start_row in ((True, 'N', ('NE', 'NW'), _ROW_3), (False, 'S', ('SE', 'SW'), _ROW_6)):
+        side_pawns = np.where(white_to_move == white, pawns, zero)
+        single = _step(movers(side_pawns, forward), forward) & empty
+        double = _step(single & start_row, forward) & empty
+        counts += _popcount(single & evasion) + _popcount(double & evasion)
+        for direction in captures:
+            counts += _popcount(_step(movers(side_pawns, direction), direction) & enemies & evasion)
+
+    # Geçerken alma: hamleden sonraki dolulukla şahın tehdit altında kalıp kalmadığına bakılır
+    has_ep = ep_squares != SNAPSHOT_NO_EP
+    ep_bit = np.where(has_ep, np.uint64(1) << np.where(has_ep, ep_squares, 0), zero)
+    captured_bit = np.where(white_to_move, _step(ep_bit, 'S'), _step(ep_bit, 'N'))
+    remaining = [them[PAWN] & ~captured_bit] + them[1:]
+    for capture_from in ('SE', 'SW', 'NE', 'NW'):
+        if capture_from in ('SE', 'SW'):
+            candidate = np.where(white_to_move, _step(ep_bit, capture_from), zero) & pawns
+        else:
+            candidate = np.where(white_to_move, zero, _step(ep_bit, capture_from)) & pawns
+        after = (occupied ^ candidate ^ captured_bit) | ep_bit
+        safe = _attackers(king, after, remaining, white_to_move) == 0
+        counts += ((candidate != 0) & safe).astype(np.int32)
+
+    # Şah hamleleri ve rok (ChessBoard.castling_targets ile aynı koşullar)
+    counts += _popcount(_king_attacks(king) & ~own & ~attacked)
+    for to_square, (right, _, passed, empty_mask) in CASTLING_MOVES.items():
+        mover_white = to_square in CASTLING_TARGETS['white']
+        allowed = ((white_to_move == mover_white) & ((castling_rights & right) != 0) & ~in_check &
+                   ((occupied & np.uint64(empty_mask)) == 0) &
+                   ((attacked & np.uint64((1 << passed) | (1 << to_square))) == 0))
+        counts += allowed.astype(np.int32)
+
+    return {
+        'in_check': in_check,
+        'legal_move_count': counts,
+        'checkmate': in_check & (counts == 0),
+        'stalemate': ~in_check & (counts == 0),
+    }
@@ -0,0 +1,212 @@
+"""Açılış kitabı.
+
+Kitap, Polyglot benzeri 16 baytlık kayıtlardan oluşan sıralı bir ikili
+dosyadır: pozisyonun Zobrist anahtarı (8 bayt), encode_move hamle kodu
+(2 bayt), ağırlık (2 bayt) ve kullanılmayan 4 bayt; hepsi büyük-endian.
+Kayıtlar anahtara, aynı anahtar içinde azalan ağırlığa göre sıralıdır.
+OpeningBook dosyayı mmap ile açar ve ikili arama yapar; dosya belleğe
+okunmadığı için açılış anında hazırdır.
+
+Anahtarlar ChessBoard'un kendi Zobrist anahtarlarıdır; dosya biçimi
+Polyglot'a benzese de Polyglot kitaplarıyla uyumlu değildir.
+
+Komut satırı:
+    python chess_book.py build --pgn oyunlar.pgn --saves saves   # book.bin oluştur
+    python chess_book.py probe "rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq - 0 1"
+"""
+import argparse
+import collections
+import itertools
+import mmap
+import os
+import random
+import struct
+import sys
+
+from chess_game import ChessBoard, decode_move
+
+# Kitap dosyasının varsayılan yeri (saves/ gibi çalışma klasörüne göre)
+BOOK_PATH = 'book.bin'
+ENTRY = struct.Struct('>QHHI')
+KEY = struct.Struct('>Q')
+MAX_WEIGHT = 0xFFFF
+# Oyunların ilk kaç yarım hamlesi kitaba girer
+DEFAULT_MAX_PLY = 24
+
+
+class OpeningBook:
+    """mmap ile açılan, salt okunur açılış kitabı"""
+
+    def __init__(self, path=BOOK_PATH):
+        self.path = path
+        self.file = open(path, 'rb')
+        size = os.fstat(self.file.fileno()).st_size
+        if size % ENTRY.size:
+            self.file.close()
+            raise ValueError(f"Geçersiz kitap dosyası: {path}")
+        # Boş dosya mmap ile açılamaz; boş kitap gibi davranır
+        self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+        self.count = size // ENTRY.size
+
+    def close(self):
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self.count
+
+    def first_index(self, key):
+        """Anahtarı key'den küçük olmayan ilk kaydın indeksi (ikili arama)"""
+        low, high = 0, self.count
+        data = self.data
+        while low < high:
+            middle = (low + high) // 2
+            if KEY.unpack_from(data, middle * ENTRY.size)[0] < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def entries(self, key):
+        """Pozisyon anahtarına ait (hamle kodu, ağırlık) kayıtları, ağırlığa göre azalan"""
+        entries = []
+        data = self.data
+        for index in range(self.first_index(key), self.count):
+            entry_key, move, weight, _ = ENTRY.unpack_from(data, index * ENTRY.size)
+            if entry_key != key:
+                break
+            entries.append((move, weight))
+        return entries
+
+    def moves(self, game):
+        """Tahtadaki pozisyon için kitaptaki yasal hamleler: [(hamle kodu, ağırlık), ...].
+
+        Anahtar çakışmalarına karşı her hamlenin pozisyonda yasal olduğu
+        doğrulanır.
+        """
+        color = game.current_turn
+        legal = []
+        for move, weight in self.entries(game.zobrist_key):
+            from_square = move & 63
+            piece = game.board[from_square >> 3][from_square & 7]
+            if piece is None or piece.color != color:
+                continue
+            if not game.target_mask(from_square, piece) >> ((move >> 6) & 63) & 1:
+                continue
+            game.push(move)
+            in_check = game.is_king_in_check(color)
+            game.pop()
+            if not in_check:
+                legal.append((move, weight))
+        return legal
+
+    def choose(self, game, rng=random):
+        """Kitaptan ağırlıklarına göre rastgele bir hamle kodu seç (pozisyon kitapta yoksa None)"""
+        moves = [(move, weight) for move, weight in self.moves(game) if weight]
+        if not moves:
+            return None
+        return rng.choices([move for move, _ in moves], weights=[weight for _, weight in moves])[0]
+
+
+def book_entries(games, max_ply=DEFAULT_MAX_PLY):
+    """Oyunların ilk max_ply yarım hamlesindeki (anahtar, hamle) çiftlerini say.
+
+    games: mevcut hamlesi oyunun sonunda olan ChessBoard'lar (read_pgn veya
+    kayıtlardan). Tahtalar başa geri alınıp hamleler tek tek ileri alınır.
+    """
+    counts = collections.Counter()
+    for game in games:
+        plies = min(game.current_move + 1, max_ply)
+        while game.current_move >= 0:
+            game.undo_move()
+        for move in game.move_history[:plies]:
+            counts[game.zobrist_key, move] += 1
+            game.redo_move()
+    return counts
+
+
+def write_book(path, counts, min_count=1):
+    """Sayılan (anahtar, hamle) çiftlerini sıralı kitap dosyası olarak yaz; kayıt sayısını döndür"""
+    entries = sorted((key, -count, move) for (key, move), count in counts.items() if count >= min_count)
+    temp_path = path + '.tmp'
+    with open(temp_path, 'wb') as f:
+        for key, count, move in entries:
+            f.write(ENTRY.pack(key, move, min(-count, MAX_WEIGHT), 0))
+    # Açık kitabı okuyanlar yarım yazılmış dosya görmesin
+    os.replace(temp_path, path)
+    return len(entries)
+
+
+def pgn_games(paths):
+    """PGN dosyalarındaki geçerli oyunların tahtalarını üret (geçersiz oyunlar atlanır)"""
+    from chess_pgn import read_pgn
+    for path in paths:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            for pgn_game in read_pgn(f, skip_invalid=True):
+                yield pgn_game.board
+
+
+def saved_games(saves_dir):
+    """Kayıt klasöründeki okunabilen oyunların tahtalarını üret"""
+    from chess_pgn import load_saved_game
+    for filename in sorted(os.listdir(saves_dir)):
+        if not filename.endswith('.json'):
+            continue
+        try:
+            game, _ = load_saved_game(os.path.join(saves_dir, filename))
+        except (OSError, ValueError, KeyError, TypeError):
+            continue
+        # Geri alınmış hamleler de oynanmış sayılır
+        while game.redo_move()[0]:
+            pass
+        yield game
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Açılış kitabı oluşturma ve sorgulama")
+    commands = parser.add_subparsers(dest='command', required=True)
+    build = commands.add_parser('build', help="PGN dosyalarından ve kayıtlardan kitap oluştur")
+    build.add_argument('--pgn', nargs='*', default=[], help="PGN dosyaları")
+    build.add_argument('--saves', help="kayıt klasörü (ör. saves)")
+    build.add_argument('--output', default=BOOK_PATH)
+    build.add_argument('--max-ply', type=int, default=DEFAULT_MAX_PLY, help="oyun başına en fazla yarım hamle")
+    build.add_argument('--min-count', type=int, default=1, help="kitaba girmek için en az oynanma sayısı")
+    probe = commands.add_parser('probe', help="pozisyonun kitap hamlelerini listele")
+    probe.add_argument('fen', nargs='?', help="FEN (varsayılan: başlangıç pozisyonu)")
+    probe.add_argument('--book', default=BOOK_PATH)
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        if not args.pgn and not args.saves:
+            parser.error("--pgn veya --saves gerekli")
+        games = pgn_games(args.pgn)
+        if args.saves:
+            games = itertools.chain(games, saved_games(args.saves))
+        counts = book_entries(games, args.max_ply)
+        written = write_book(args.output, counts, args.min_count)
+        print(f"{args.output}: {written} kayıt")
+        return 0
+
+    from chess_pgn import move_to_san
+    game = ChessBoard.from_fen(args.fen) if args.fen else ChessBoard()
+    with OpeningBook(args.book) as book:
+        moves = book.moves(game)
+    total = sum(weight for _, weight in moves)
+    for move, weight in moves:
+        from_pos, to_pos, promotion = decode_move(move)
+        san = move_to_san(game, from_pos, to_pos, promotion or None)
+        print(f"{san:<8}{weight:>7}{100 * weight / total:>7.1f}%")
+    if not moves:
+        print("Pozisyon kitapta yok")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+import json
+import os
+import sqlite3
+
+from chess_game import ChessBoard
+
+
+class SaveCatalog:
+    """saves/ klasöründeki kayıtlı oyunların SQLite dizini.
+
+    Her kayıt için tarih, oyuncular, hamle sayısı ve sonuç tutulur. Kayıt
+    dosyaları yalnızca dizine eklenirken ya da değiştirilme zamanları (mtime)
+    dizindekinden farklıysa okunur; yükleme menüsü sadece bu dizini sorgular.
+    """
+
+    SORT_COLUMNS = ('date', 'white_player', 'black_player', 'move_count', 'filename')
+
+    def __init__(self, saves_dir, filename='catalog.sqlite3'):
+        self.saves_dir = saves_dir
+        self.connection = sqlite3.connect(os.path.join(saves_dir, filename))
+        self.connection.row_factory = sqlite3.Row
+        self.connection.executescript("""
+            CREATE TABLE IF NOT EXISTS saves (
+                filename TEXT PRIMARY KEY,
+                mtime REAL NOT NULL,
+                date TEXT,
+                white_player TEXT,
+                black_player TEXT,
+                move_count INTEGER,
+                result TEXT
+            );
+            CREATE INDEX IF NOT EXISTS saves_date ON saves (date);
+            CREATE INDEX IF NOT EXISTS saves_white ON saves (white_player);
+            CREATE INDEX IF NOT EXISTS saves_black ON saves (black_player);
+        """)
+
+    def close(self):
+        self.connection.close()
+
+    def summarize(self, data):
+        """Kayıt verisinden dizinde tutulan özet alanları çıkar"""
+        move_count = data.get('move_count')
+        result = data.get('result')
+        if result is None and 'game' in data:
+            result = ChessBoard.from_history_dict(data['game']).get_result()
+        elif result is None and 'board' in data:
+            # Eski kayıtlarda sonuç yok: son pozisyondan bir kez hesaplanır
+            result = ChessBoard.from_dict(data['board']).get_result()
+        return {
+            'date': data.get('date'),
+            'white_player': data.get('white_player'),
+            'black_player': data.get('black_player'),
+            'move_count': move_count,
+            'result': result,
+        }
+
+    def update(self, filename, data, mtime=None):
+        """Kaydedilen oyunu dizine ekle (dosyayı yeniden okumadan)"""
+        if mtime is None:
+            mtime = os.path.getmtime(os.path.join(self.saves_dir, filename))
+        self.store(filename, mtime, self.summarize(data))
+        self.connection.commit()
+
+    def store(self, filename, mtime, summary):
+        self.connection.execute(
+            "INSERT OR REPLACE INTO saves (filename, mtime, date, white_player, black_player, move_count, result) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (filename, mtime, summary['date'], summary['white_player'], summary['black_player'],
+             summary['move_count'], summary['result']))
+
+    def sync(self):
+        """Dizini klasörle eşitle: silinen dosyaları çıkar, yeni veya değişen dosyaları oku"""
+        files = {}
+        with os.scandir(self.saves_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith('.json') and entry.is_file():
+                    files[entry.name] = entry.stat().st_mtime
+
+        known = dict(self.connection.execute("SELECT filename, mtime FROM saves"))
+        removed = [(filename,) for filename in known if filename not in files]
+        if removed:
+            self.connection.executemany("DELETE FROM saves WHERE filename = ?", removed)
+
+        for filename, mtime in files.items():
+            if known.get(filename) == mtime:
+                continue
+            try:
+                with open(os.path.join(self.saves_dir, filename), 'r') as f:
+                    summary = self.summarize(json.load(f))
+            except Exception:
+                # Okunamayan dosyalar da listelenir, menüde dosya adıyla görünür
+                summary = dict.fromkeys(('date', 'white_player', 'black_player', 'move_count', 'result'))
+            self.store(filename, mtime, summary)
+        self.connection.commit()
+
+    def filter_clause(self, player):
+        if not player:
+            return "", ()
+        # Kullanıcının yazdığı % ve _ joker değil, harf olarak aranır
+        escaped = player.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        pattern = f"%{escaped}%"
+        return " WHERE white_player LIKE ? ESCAPE '\\' OR black_player LIKE ? ESCAPE '\\'", (pattern, pattern)
+
+    def count(self, player=None):
+        """Filtreye uyan kayıt sayısı"""
+        where, params = self.filter_clause(player)
+        return self.connection.execute("SELECT COUNT(*) FROM saves" + where, params).fetchone()[0]
+
+    def query(self, offset=0, limit=20, order_by='date', descending=True, player=None):
+        """Sıralanmış ve filtrelenmiş kayıtların bir sayfasını sözlük listesi olarak döndür"""
+        if order_by not in self.SORT_COLUMNS:
+            raise ValueError(f"Geçersiz sıralama alanı: {order_by}")
+        where, params = self.filter_clause(player)
+        direction = "DESC" if descending else "ASC"
+        rows = self.connection.execute(
+            f"SELECT * FROM saves{where} ORDER BY {order_by} {direction}, filename {direction} LIMIT ? OFFSET ?",
+            params + (limit, offset))
+        return [dict(row) for row in rows]
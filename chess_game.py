@@ -1,38 +1,371 @@
+import argparse
+import base64
+import io
+import itertools
 import json
+import os
+import random
+import struct
+import sys
+import time
+
+# Taş sembolleri (bitboard sırası: beyaz P N B R Q K, siyah P N B R Q K)
+PIECE_SYMBOLS = ('♙', '♘', '♗', '♖', '♕', '♔', '♟', '♞', '♝', '♜', '♛', '♚')
+PIECE_INDEX = {symbol: index for index, symbol in enumerate(PIECE_SYMBOLS)}
+PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING = range(6)
+PROMOTION_TYPES = (KNIGHT, BISHOP, ROOK, QUEEN)
+COLOR_OFFSET = {'white': 0, 'black': 6}
+
+# FEN harfleri (PIECE_SYMBOLS ile aynı sırada)
+FEN_LETTERS = 'PNBRQKpnbrqk'
+
+# Kare indeksi: satır * 8 + sütun (0 = a8, 63 = h1)
+SQUARES = [divmod(square, 8) for square in range(64)]
+
+# Hamle tabloları: (satır farkı, sütun farkı)
+KNIGHT_OFFSETS = ((-2, -1), (-2, 1), (-1, -2), (-1, 2), (1, -2), (1, 2), (2, -1), (2, 1))
+KING_OFFSETS = ((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1))
+ROOK_DIRECTIONS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+BISHOP_DIRECTIONS = ((-1, -1), (-1, 1), (1, -1), (1, 1))
+
+def _build_jump_masks(offsets):
+    """Her kare için tek adımda gidilebilecek karelerin maskesini önceden hesapla"""
+    masks = []
+    for row, col in SQUARES:
+        mask = 0
+        for dr, dc in offsets:
+            r, c = row + dr, col + dc
+            if 0 <= r < 8 and 0 <= c < 8:
+                mask |= 1 << (r * 8 + c)
+        masks.append(mask)
+    return masks
+
+def _build_ray_masks(directions):
+    """Her yön için (kare -> ışın maskesi) tablosu ve yönün kare indeksini artırıp artırmadığı"""
+    rays = []
+    for dr, dc in directions:
+        masks = []
+        for row, col in SQUARES:
+            mask = 0
+            r, c = row + dr, col + dc
+            while 0 <= r < 8 and 0 <= c < 8:
+                mask |= 1 << (r * 8 + c)
+                r += dr
+                c += dc
+            masks.append(mask)
+        rays.append((masks, dr * 8 + dc > 0))
+    return rays
+
+def _build_between_masks():
+    """Aynı hat üzerindeki iki kare arasında kalan karelerin maskesi"""
+    between = [[0] * 64 for _ in range(64)]
+    for square, (row, col) in enumerate(SQUARES):
+        for dr, dc in ROOK_DIRECTIONS + BISHOP_DIRECTIONS:
+            mask = 0
+            r, c = row + dr, col + dc
+            while 0 <= r < 8 and 0 <= c < 8:
+                between[square][r * 8 + c] = mask
+                mask |= 1 << (r * 8 + c)
+                r += dr
+                c += dc
+    return between
+
+KNIGHT_MASKS = _build_jump_masks(KNIGHT_OFFSETS)
+KING_MASKS = _build_jump_masks(KING_OFFSETS)
+PAWN_ATTACK_MASKS = {
+    'white': _build_jump_masks(((-1, -1), (-1, 1))),
+    'black': _build_jump_masks(((1, -1), (1, 1))),
+}
+ROOK_RAYS = _build_ray_masks(ROOK_DIRECTIONS)
+BISHOP_RAYS = _build_ray_masks(BISHOP_DIRECTIONS)
+BETWEEN_MASKS = _build_between_masks()
+# Açık renkli kareler (a8 açık renklidir); yetersiz materyalde fillerin renkleri için
+LIGHT_SQUARES = sum(1 << square for square in range(64) if (square >> 3) % 2 == (square & 7) % 2)
+
+# Rok hakları (bit bayrakları) ve ilgili şah/kale kareleri
+CASTLE_WHITE_KINGSIDE = 1
+CASTLE_WHITE_QUEENSIDE = 2
+CASTLE_BLACK_KINGSIDE = 4
+CASTLE_BLACK_QUEENSIDE = 8
+CASTLING_SQUARES = (
+    (CASTLE_WHITE_KINGSIDE, (7, 4), '♔', (7, 7), '♖'),
+    (CASTLE_WHITE_QUEENSIDE, (7, 4), '♔', (7, 0), '♖'),
+    (CASTLE_BLACK_KINGSIDE, (0, 4), '♚', (0, 7), '♜'),
+    (CASTLE_BLACK_QUEENSIDE, (0, 4), '♚', (0, 0), '♜'),
+)
+CASTLE_RIGHTS_BY_COLOR = {'white': CASTLE_WHITE_KINGSIDE | CASTLE_WHITE_QUEENSIDE,
+                          'black': CASTLE_BLACK_KINGSIDE | CASTLE_BLACK_QUEENSIDE}
+# Rok hamleleri: şahın hedef karesi -> (hak, kalenin kaynak karesi, kalenin hedef karesi
+# (şahın üzerinden geçtiği kare), boş olması gereken kareler)
+CASTLING_MOVES = {
+    62: (CASTLE_WHITE_KINGSIDE, 63, 61, (1 << 61) | (1 << 62)),
+    58: (CASTLE_WHITE_QUEENSIDE, 56, 59, (1 << 57) | (1 << 58) | (1 << 59)),
+    6: (CASTLE_BLACK_KINGSIDE, 7, 5, (1 << 5) | (1 << 6)),
+    2: (CASTLE_BLACK_QUEENSIDE, 0, 3, (1 << 1) | (1 << 2) | (1 << 3)),
+}
+CASTLING_TARGETS = {'white': (62, 58), 'black': (6, 2)}
+# Bir hamlenin kaynak veya hedef karesi bu karelerden biriyse ilgili rok hakları kaybolur
+CASTLING_RIGHTS_KEPT = [15] * 64
+CASTLING_RIGHTS_KEPT[60] = 15 & ~CASTLE_RIGHTS_BY_COLOR['white']
+CASTLING_RIGHTS_KEPT[63] = 15 & ~CASTLE_WHITE_KINGSIDE
+CASTLING_RIGHTS_KEPT[56] = 15 & ~CASTLE_WHITE_QUEENSIDE
+CASTLING_RIGHTS_KEPT[4] = 15 & ~CASTLE_RIGHTS_BY_COLOR['black']
+CASTLING_RIGHTS_KEPT[7] = 15 & ~CASTLE_BLACK_KINGSIDE
+CASTLING_RIGHTS_KEPT[0] = 15 & ~CASTLE_BLACK_QUEENSIDE
+
+# Zobrist anahtarları: sabit tohum, böylece anahtarlar çalıştırmalar arasında aynı kalır
+_zobrist_random = random.Random(0x5A7C4E55)
+ZOBRIST_PIECES = [[_zobrist_random.getrandbits(64) for _ in range(64)] for _ in range(12)]
+ZOBRIST_BLACK_TO_MOVE = _zobrist_random.getrandbits(64)
+ZOBRIST_CASTLING = [0] + [_zobrist_random.getrandbits(64) for _ in range(15)]
+ZOBRIST_EP_FILE = [_zobrist_random.getrandbits(64) for _ in range(8)]
+
+def slider_attacks(square, occupied, rays):
+    """Kayan taşın saldırı maskesi: her ışın ilk engelde (engel dahil) kesilir"""
+    attacks = 0
+    for masks, increasing in rays:
+        ray = masks[square]
+        blockers = ray & occupied
+        if blockers:
+            if increasing:
+                blocker = (blockers & -blockers).bit_length() - 1
+            else:
+                blocker = blockers.bit_length() - 1
+            ray ^= masks[blocker]
+        attacks |= ray
+    return attacks
+
+# Geri alma yığınında hamle başına alan sayısı
+UNDO_STRIDE = 6
+# Elli hamle kuralı: taş alınmadan ve piyon oynatılmadan geçen yarım hamle sınırı
+FIFTY_MOVE_PLIES = 100
+
+# snapshot() baytları: 64 kare (0 boş, yoksa bitboard indeksi + 1), sıra, rok hakları, geçerken alma karesi
+SNAPSHOT_SIZE = 67
+SNAPSHOT_NO_EP = 64
+
+def encode_move(from_pos, to_pos, promotion=0):
+    """Hamleyi 16 bitlik tamsayıya sıkıştır: 6 bit kaynak, 6 bit hedef, 4 bit terfi"""
+    return (from_pos[0] * 8 + from_pos[1]) | (to_pos[0] * 8 + to_pos[1]) << 6 | promotion << 12
+
+def decode_move(code):
+    """encode_move'un tersi: (from_pos, to_pos, promotion)"""
+    return SQUARES[code & 63], SQUARES[(code >> 6) & 63], code >> 12
+
+def pack_moves(codes):
+    """16 bitlik hamle kodlarını base64 metnine çevir (kayıt dosyaları için)"""
+    return base64.b64encode(struct.pack(f'<{len(codes)}H', *codes)).decode('ascii')
+
+def unpack_moves(text):
+    """pack_moves'un tersi"""
+    data = base64.b64decode(text)
+    return list(struct.unpack(f'<{len(data) // 2}H', data))
+
+def mask_to_squares(mask):
+    """Bitboard maskesini (satır, sütun) listesine çevir"""
+    squares = []
+    while mask:
+        low = mask & -mask
+        squares.append(SQUARES[low.bit_length() - 1])
+        mask ^= low
+    return squares
 
 class ChessPiece:
-    def __init__(self, color, symbol):
-        self.color = color  # 'white' veya 'black'
-        self.symbol = symbol
-        self.has_moved = False
+    """Taşın rengi, sembolü ve bitboard indeksi.
+
+    Taşlar değişmezdir ve paylaşılır: ChessPiece(color, symbol) her çağrıda
+    PIECES tablosundaki aynı nesneyi döndürür. Oynayıp oynamadığı taşta değil,
+    tahtanın rok haklarında ve piyonun bulunduğu sırada tutulur.
+    """
+    __slots__ = ('color', 'symbol', 'index')
+
+    def __new__(cls, color, symbol):
+        index = PIECE_INDEX.get(symbol)
+        if index is None or PIECES[index].color != color:
+            raise ValueError(f"Geçersiz taş: {color} {symbol}")
+        return PIECES[index]
+
+    def __reduce__(self):
+        # copy, deepcopy ve pickle aynı paylaşılan nesneye döner
+        return (ChessPiece, (self.color, self.symbol))
+
+    def __repr__(self):
+        return f"ChessPiece({self.color!r}, {self.symbol!r})"
+
+def _build_pieces():
+    pieces = []
+    for index, symbol in enumerate(PIECE_SYMBOLS):
+        piece = object.__new__(ChessPiece)
+        piece.color = 'white' if index < 6 else 'black'
+        piece.symbol = symbol
+        piece.index = index
+        pieces.append(piece)
+    return tuple(pieces)
+
+# Bitboard indeksine göre paylaşılan taş nesneleri
+PIECES = _build_pieces()
+# snapshot() için kare içeriği -> bayt değeri
+SNAPSHOT_CODES = {None: 0, **{piece: piece.index + 1 for piece in PIECES}}
 
 class ChessBoard:
-    def __init__(self):
+    def __init__(self, setup=True):
         self.board = [[None for _ in range(8)] for _ in range(8)]
+        # Her taş türü ve renk için bir bitboard, ayrıca doluluk maskeleri
+        self.bitboards = [0] * 12
+        self.occupancy = {'white': 0, 'black': 0}
+        self.occupied = 0
+        # Şahların kare indeksleri (tahtada yoksa None)
+        self.king_squares = {'white': None, 'black': None}
+        # Pozisyonun Zobrist anahtarı (taşlar, sıra ve rok hakları)
+        self.zobrist_key = 0
+        self.castling_rights = 0
+        # Geçerken alınabilecek kare indeksi (yalnızca rakip piyon gerçekten alabiliyorsa)
+        self.ep_square = None
         self.current_turn = 'white'  # Oyuna beyaz başlar
-        self.initialize_board()
-        self.move_history = []  # [(from_pos, to_pos, captured_piece), ...]
+        if setup:
+            self.initialize_board()
+            self.set_castling_rights(CASTLE_RIGHTS_BY_COLOR['white'] | CASTLE_RIGHTS_BY_COLOR['black'])
+        # Son taş alma veya piyon hamlesinden beri geçen yarım hamle sayısı
+        self.halfmove_clock = 0
+        # Oyunda (mevcut hamleye kadar) görülen pozisyonların Zobrist anahtarı -> tekrar sayısı
+        self.position_counts = {}
+        self.reset_position_counts()
+        # Oyunun hamleleri (encode_move kodları); geri alınmış hamleler de ileri alınabilmek için durur
+        self.move_history = []
+        # push/pop geri alma yığını: hamle başına UNDO_STRIDE alan (bkz. push), gerektikçe büyütülür
+        self.undo_stack = []
+        self.ply = 0  # Yığındaki hamle sayısı
         self.current_move = -1  # Şu anki hamle indeksi
+        # Standart dışı başlangıç pozisyonu: from_dict ile yüklendiyse sözlük, from_fen ile yüklendiyse FEN,
+        # from_snapshot ile yüklendiyse snapshot baytları
+        self.initial_state = None
+        self.start_ply = 0  # Başlangıç pozisyonunun yarım hamle numarası (FEN hamle sayacı için)
+        self.cached_status = None  # Mevcut pozisyonun oyun durumu (get_game_status)
     
     def initialize_board(self):
         # Taşların başlangıç pozisyonlarını ayarla
         # Piyonları yerleştir
         for col in range(8):
-            self.board[1][col] = ChessPiece('black', '♟')
-            self.board[6][col] = ChessPiece('white', '♙')
+            self.put_piece(1, col, ChessPiece('black', '♟'))
+            self.put_piece(6, col, ChessPiece('white', '♙'))
         
         # Diğer taşları yerleştir
         piece_order = ['♜', '♞', '♝', '♛', '♚', '♝', '♞', '♜']
         white_pieces = ['♖', '♘', '♗', '♕', '♔', '♗', '♘', '♖']
         
         for col in range(8):
-            self.board[0][col] = ChessPiece('black', piece_order[col])
-            self.board[7][col] = ChessPiece('white', white_pieces[col])
+            self.put_piece(0, col, ChessPiece('black', piece_order[col]))
+            self.put_piece(7, col, ChessPiece('white', white_pieces[col]))
+
+    def put_piece(self, row, col, piece):
+        """Boş kareye taş koy ve bitboard'ları güncelle"""
+        self.board[row][col] = piece
+        square = row * 8 + col
+        bit = 1 << square
+        index = piece.index
+        self.bitboards[index] |= bit
+        self.occupancy[piece.color] |= bit
+        self.occupied |= bit
+        self.zobrist_key ^= ZOBRIST_PIECES[index][square]
+        if index % 6 == KING:
+            self.king_squares[piece.color] = square
+
+    def remove_piece(self, row, col):
+        """Karedeki taşı kaldır, bitboard'ları güncelle ve taşı döndür"""
+        piece = self.board[row][col]
+        if piece is not None:
+            self.board[row][col] = None
+            square = row * 8 + col
+            bit = 1 << square
+            index = piece.index
+            self.bitboards[index] ^= bit
+            self.occupancy[piece.color] ^= bit
+            self.occupied ^= bit
+            self.zobrist_key ^= ZOBRIST_PIECES[index][square]
+            if index % 6 == KING:
+                self.king_squares[piece.color] = None
+        return piece
+
+    def clear_board(self):
+        """Tahtadaki tüm taşları kaldır"""
+        self.board = [[None for _ in range(8)] for _ in range(8)]
+        self.bitboards = [0] * 12
+        self.occupancy = {'white': 0, 'black': 0}
+        self.occupied = 0
+        self.king_squares = {'white': None, 'black': None}
+        self.zobrist_key = ZOBRIST_BLACK_TO_MOVE if self.current_turn == 'black' else 0
+        self.castling_rights = 0
+        self.ep_square = None
+
+    def switch_turn(self):
+        """Sırayı karşı renge geçir"""
+        self.current_turn = 'black' if self.current_turn == 'white' else 'white'
+        self.zobrist_key ^= ZOBRIST_BLACK_TO_MOVE
+
+    def set_castling_rights(self, rights):
+        """Rok haklarını değiştir ve Zobrist anahtarını güncelle"""
+        self.zobrist_key ^= ZOBRIST_CASTLING[self.castling_rights] ^ ZOBRIST_CASTLING[rights]
+        self.castling_rights = rights
+
+    def set_ep_square(self, square):
+        """Geçerken alma karesini değiştir ve Zobrist anahtarını güncelle"""
+        if self.ep_square is not None:
+            self.zobrist_key ^= ZOBRIST_EP_FILE[self.ep_square & 7]
+        if square is not None:
+            self.zobrist_key ^= ZOBRIST_EP_FILE[square & 7]
+        self.ep_square = square
+
+    def validate_setup(self):
+        """Her tarafta tek şah olduğunu ve rok haklarının taşlarla uyuştuğunu denetle; değilse ValueError"""
+        for color, name in (('white', 'beyaz'), ('black', 'siyah')):
+            if bin(self.bitboards[COLOR_OFFSET[color] + KING]).count('1') != 1:
+                raise ValueError(f"{name} tarafında tek şah olmalı")
+        # Rok hakkı için şah ve kale başlangıç karelerinde olmalı
+        for right, (king_row, king_col), king_symbol, (rook_row, rook_col), rook_symbol in CASTLING_SQUARES:
+            if not self.castling_rights & right:
+                continue
+            king = self.board[king_row][king_col]
+            rook = self.board[rook_row][rook_col]
+            if not (king and king.symbol == king_symbol and rook and rook.symbol == rook_symbol):
+                raise ValueError("rok hakkı taşlarla uyuşmuyor")
+
+    def ep_square_after(self, color, from_square, to_square):
+        """color renkli piyonun from_square -> to_square iki kare ilerlemesinden sonraki geçerken alma karesi.
+
+        Yalnızca yanında onu alabilecek bir rakip piyon varsa kare döndürülür;
+        böylece aynı pozisyonlar aynı Zobrist anahtarını alır.
+        """
+        middle = (from_square + to_square) // 2
+        enemy_pawns = self.bitboards[COLOR_OFFSET['black' if color == 'white' else 'white'] + PAWN]
+        return middle if PAWN_ATTACK_MASKS[color][middle] & enemy_pawns else None
+
+    def reset_position_counts(self):
+        """Pozisyon sayacını yalnızca mevcut pozisyonla başlat (yeni başlangıç pozisyonu kurulunca)"""
+        self.position_counts = {self.zobrist_key: 1}
+
+    def compute_zobrist_key(self):
+        """Zobrist anahtarını sıfırdan hesapla (artımlı anahtarı doğrulamak için)"""
+        key = ZOBRIST_CASTLING[self.castling_rights]
+        if self.current_turn == 'black':
+            key ^= ZOBRIST_BLACK_TO_MOVE
+        if self.ep_square is not None:
+            key ^= ZOBRIST_EP_FILE[self.ep_square & 7]
+        for index, bitboard in enumerate(self.bitboards):
+            while bitboard:
+                low = bitboard & -bitboard
+                key ^= ZOBRIST_PIECES[index][low.bit_length() - 1]
+                bitboard ^= low
+        return key
+
+    def position_key(self):
+        """Pozisyonu sözlük anahtarı olarak kullanmak için 64 bitlik Zobrist anahtarı"""
+        return self.zobrist_key
     
     def is_valid_position(self, row, col):
         return 0 <= row < 8 and 0 <= col < 8
 
-    def make_move(self, from_pos, to_pos):
+    def make_move(self, from_pos, to_pos, promotion=None):
+        """Hamleyi yap. promotion: piyon son sıraya ulaşırsa olacağı taş türü (varsayılan vezir)"""
         from_row, from_col = from_pos
         to_row, to_col = to_pos
 
@@ -46,52 +379,145 @@ class ChessBoard:
         if piece.color != self.current_turn:
             return False, f"Şu an {self.current_turn} taşların sırası!"
 
-        if self.is_valid_move(from_pos, to_pos):
-            # Hamleyi geçici olarak yap
-            captured_piece = self.board[to_row][to_col]
-            self.board[to_row][to_col] = piece
-            self.board[from_row][from_col] = None
-            
-            # Hamle sonrası kendi şahımız tehdit altında mı kontrol et
-            if self.is_king_in_check(piece.color):
-                # Hamleyi geri al
-                self.board[from_row][from_col] = piece
-                self.board[to_row][to_col] = captured_piece
-                return False, "Bu hamle şahınızı tehlikeye atar!"
-            
-            # Hamle geçerliyse devam et
-            piece.has_moved = True
-            
-            # Hamle geçmişini güncelle
-            self.current_move += 1
-            if self.current_move < len(self.move_history):
-                self.move_history = self.move_history[:self.current_move]
-            self.move_history.append((from_pos, to_pos, captured_piece))
-            
-            # Sırayı değiştir
-            self.current_turn = 'black' if self.current_turn == 'white' else 'white'
-            return True, "Hamle başarılı!"
-        
-        return False, "Geçersiz hamle!"
+        if not self.is_valid_move(from_pos, to_pos):
+            return False, "Geçersiz hamle!"
+
+        # Hamle sonrası kendi şahımız tehdit altında mı kontrol et
+        if self.leaves_king_in_check(from_pos, to_pos):
+            return False, "Bu hamle şahınızı tehlikeye atar!"
+
+        move = from_row * 8 + from_col | (to_row * 8 + to_col) << 6
+        if to_row in (0, 7) and piece.index % 6 == PAWN:
+            if promotion is None:
+                promotion = QUEEN
+            elif promotion not in PROMOTION_TYPES:
+                return False, "Geçersiz terfi taşı!"
+            move |= promotion << 12
+
+        self.push(move)
+
+        # Hamle geçmişini güncelle (ileri alınabilecek hamleler silinir)
+        self.current_move += 1
+        del self.move_history[self.current_move:]
+        self.move_history.append(move)
+        return True, "Hamle başarılı!"
+
+    def push(self, move):
+        """encode_move kodlu hamleyi kontrol etmeden uygula; pop ile geri alınır.
+
+        Arama ve toplu yeniden oynatma için düşük seviyeli yol: hamlenin kurallara
+        uygun (en azından generate_moves'un ürettiği) olduğu varsayılır, şah
+        kontrolü çağırana bırakılır. Geri alma bilgisi önceden ayrılmış
+        undo_stack listesine yazılır; mesaj veya demet oluşturulmaz.
+        """
+        from_square = move & 63
+        to_square = (move >> 6) & 63
+        from_row, from_col = from_square >> 3, from_square & 7
+        to_row, to_col = to_square >> 3, to_square & 7
+
+        piece = self.remove_piece(from_row, from_col)
+        captured_piece = self.remove_piece(to_row, to_col)
+
+        base = self.ply * UNDO_STRIDE
+        stack = self.undo_stack
+        if base == len(stack):
+            stack.extend([None] * max(16 * UNDO_STRIDE, base))
+        stack[base] = move
+        stack[base + 1] = piece
+        stack[base + 3] = self.castling_rights
+        stack[base + 4] = self.ep_square
+        stack[base + 5] = self.halfmove_clock
+
+        piece_type = piece.index % 6
+        placed = piece
+        ep_square = None
+        if piece_type == PAWN:
+            if to_square == self.ep_square and from_col != to_col:
+                # Geçerken alma: yenen piyon hedef karenin değil, yanındaki karenin üzerinde
+                captured_piece = self.remove_piece(from_row, to_col)
+            elif to_row == 0 or to_row == 7:
+                placed = PIECES[COLOR_OFFSET[piece.color] + ((move >> 12) or QUEEN)]
+            elif abs(to_row - from_row) == 2:
+                ep_square = self.ep_square_after(piece.color, from_square, to_square)
+        elif piece_type == KING and abs(to_col - from_col) == 2:
+            # Rok: kale şahın üzerinden geçtiği kareye gelir
+            _, rook_from, rook_to, _ = CASTLING_MOVES[to_square]
+            rook = self.remove_piece(rook_from >> 3, rook_from & 7)
+            self.put_piece(rook_to >> 3, rook_to & 7, rook)
+        stack[base + 2] = captured_piece
+        if piece_type == PAWN or captured_piece is not None:
+            self.halfmove_clock = 0
+        else:
+            self.halfmove_clock += 1
+
+        self.put_piece(to_row, to_col, placed)
+        self.set_ep_square(ep_square)
+        self.set_castling_rights(self.castling_rights & CASTLING_RIGHTS_KEPT[from_square] & CASTLING_RIGHTS_KEPT[to_square])
+
+        # Sırayı değiştir
+        self.switch_turn()
+        counts = self.position_counts
+        counts[self.zobrist_key] = counts.get(self.zobrist_key, 0) + 1
+        self.cached_status = None
+        self.ply += 1
+
+    def pop(self):
+        """Son push'u geri al: taşlar, rok hakları, geçerken alma karesi, sayaçlar ve sıra geri yüklenir"""
+        counts = self.position_counts
+        count = counts[self.zobrist_key] - 1
+        if count:
+            counts[self.zobrist_key] = count
+        else:
+            del counts[self.zobrist_key]
+        self.ply -= 1
+        base = self.ply * UNDO_STRIDE
+        stack = self.undo_stack
+        move = stack[base]
+        piece = stack[base + 1]
+        captured_piece = stack[base + 2]
+        ep_square = stack[base + 4]
+        from_square = move & 63
+        to_square = (move >> 6) & 63
+        from_row, from_col = from_square >> 3, from_square & 7
+        to_row, to_col = to_square >> 3, to_square & 7
+
+        # Taşı geri taşı (terfi ettiyse tahtadaki terfi taşı yerine piyon konur)
+        self.remove_piece(to_row, to_col)
+        self.put_piece(from_row, from_col, piece)
+
+        if captured_piece is not None:
+            if to_square == ep_square and piece.index % 6 == PAWN:
+                self.put_piece(from_row, to_col, captured_piece)
+            else:
+                self.put_piece(to_row, to_col, captured_piece)
+        elif abs(to_col - from_col) == 2 and piece.index % 6 == KING:
+            _, rook_from, rook_to, _ = CASTLING_MOVES[to_square]
+            rook = self.remove_piece(rook_to >> 3, rook_to & 7)
+            self.put_piece(rook_from >> 3, rook_from & 7, rook)
+
+        self.set_ep_square(ep_square)
+        self.set_castling_rights(stack[base + 3])
+        self.halfmove_clock = stack[base + 5]
+
+        # Sırayı geri al
+        self.switch_turn()
+        self.cached_status = None
+
+    def captured_pieces(self):
+        """Mevcut hamleye kadar yenen taşlar (hamle sırasıyla)"""
+        captured = self.undo_stack[2:self.ply * UNDO_STRIDE:UNDO_STRIDE]
+        return [piece for piece in captured if piece is not None]
+
+    def last_captured_piece(self):
+        """Son yapılan hamlede yenen taş (yoksa None)"""
+        return self.undo_stack[(self.ply - 1) * UNDO_STRIDE + 2] if self.ply else None
 
     def undo_move(self):
         """Son hamleyi geri al"""
         if self.current_move < 0:
             return False, "Geri alınacak hamle yok!"
         
-        # Son hamleyi al
-        from_pos, to_pos, captured_piece = self.move_history[self.current_move]
-        from_row, from_col = from_pos
-        to_row, to_col = to_pos
-        
-        # Taşı geri taşı
-        piece = self.board[to_row][to_col]
-        self.board[from_row][from_col] = piece
-        self.board[to_row][to_col] = captured_piece
-        
-        # Sırayı geri al
-        self.current_turn = 'black' if self.current_turn == 'white' else 'white'
-        
+        self.pop()
         self.current_move -= 1
         return True, "Hamle geri alındı"
 
@@ -100,20 +526,8 @@ class ChessBoard:
         if self.current_move >= len(self.move_history) - 1:
             return False, "İleri alınacak hamle yok!"
         
-        # Bir sonraki hamleyi al
-        from_pos, to_pos, _ = self.move_history[self.current_move + 1]
-        
-        # Hamleyi tekrar yap
-        piece = self.board[from_pos[0]][from_pos[1]]
-        captured_piece = self.board[to_pos[0]][to_pos[1]]
-        
-        self.board[to_pos[0]][to_pos[1]] = piece
-        self.board[from_pos[0]][from_pos[1]] = None
-        
-        # Sırayı değiştir
-        self.current_turn = 'black' if self.current_turn == 'white' else 'white'
-        
         self.current_move += 1
+        self.push(self.move_history[self.current_move])
         return True, "Hamle ileri alındı"
 
     def is_valid_move(self, from_pos, to_pos):
@@ -146,19 +560,9 @@ class ChessBoard:
         from_row, from_col = from_pos
         to_row, to_col = to_pos
         
-        row_step = 0 if from_row == to_row else (to_row - from_row) // abs(to_row - from_row)
-        col_step = 0 if from_col == to_col else (to_col - from_col) // abs(to_col - from_col)
-        
-        current_row = from_row + row_step
-        current_col = from_col + col_step
-        
-        while (current_row, current_col) != (to_row, to_col):
-            if self.board[current_row][current_col] is not None:
-                return False
-            current_row += row_step
-            current_col += col_step
-        
-        return True
+        # Aradaki kareler önceden hesaplanmış maskeyle kontrol edilir
+        between = BETWEEN_MASKS[from_row * 8 + from_col][to_row * 8 + to_col]
+        return not between & self.occupied
 
     def is_valid_rook_move(self, from_pos, to_pos):
         from_row, from_col = from_pos
@@ -202,6 +606,11 @@ class ChessBoard:
         row_diff = abs(to_row - from_row)
         col_diff = abs(to_col - from_col)
         
+        # Rok: şah aynı sırada iki kare yana gider
+        if row_diff == 0 and col_diff == 2:
+            piece = self.board[from_row][from_col]
+            return bool(self.castling_targets(from_row * 8 + from_col, piece.color) >> (to_row * 8 + to_col) & 1)
+
         return row_diff <= 1 and col_diff <= 1
 
     def is_valid_pawn_move(self, from_pos, to_pos):
@@ -215,18 +624,26 @@ class ChessBoard:
             # Bir kare ilerleme
             if to_row == from_row + direction and self.board[to_row][to_col] is None:
                 return True
-            # İlk hamlede iki kare ilerleme
-            if not piece.has_moved and to_row == from_row + 2 * direction:
+            # Başlangıç sırasından iki kare ilerleme
+            if from_row == (6 if piece.color == 'white' else 1) and to_row == from_row + 2 * direction:
                 if self.board[to_row][to_col] is None and self.board[from_row + direction][from_col] is None:
                     return True
         
-        # Çapraz yeme hamlesi
+        # Çapraz yeme hamlesi (geçerken alma dahil)
         elif abs(to_col - from_col) == 1 and to_row == from_row + direction:
             if self.board[to_row][to_col] and self.board[to_row][to_col].color != piece.color:
                 return True
+            if piece.color == self.current_turn and to_row * 8 + to_col == self.ep_square:
+                return True
 
         return False
 
+    def best_move(self, time_ms=1000, max_depth=64):
+        """Bilgisayar oyuncusunun sırası gelen taraf için bulduğu hamleyi döndür"""
+        # chess_ai bu modülü içe aktardığı için burada yüklenir
+        from chess_ai import get_default_ai
+        return get_default_ai().best_move(self, time_ms=time_ms, max_depth=max_depth)
+
     def display_board(self):
         print("  a b c d e f g h")  # Sütun etiketleri
         for row in range(8):
@@ -251,118 +668,490 @@ class ChessBoard:
                 else:
                     board_row.append({
                         'color': piece.color,
-                        'symbol': piece.symbol,
-                        'has_moved': piece.has_moved
+                        'symbol': piece.symbol
                     })
             board_state.append(board_row)
         
         return {
             'board': board_state,
-            'current_turn': self.current_turn
+            'current_turn': self.current_turn,
+            'castling_rights': self.castling_rights,
+            'ep_square': self.ep_square,
+            'halfmove_clock': self.halfmove_clock
         }
 
     @classmethod
     def from_dict(cls, data):
         """Dictionary'den oyun durumunu yükle"""
-        game = cls()
+        game = cls(setup=False)
         for i, row in enumerate(data['board']):
             for j, piece_data in enumerate(row):
                 if piece_data is not None:
-                    game.board[i][j] = ChessPiece(
-                        piece_data['color'],
-                        piece_data['symbol']
-                    )
-                    game.board[i][j].has_moved = piece_data['has_moved']
-                else:
-                    game.board[i][j] = None
+                    game.put_piece(i, j, ChessPiece(piece_data['color'], piece_data['symbol']))
         
         game.current_turn = data['current_turn']
+        if 'castling_rights' in data:
+            game.castling_rights = data['castling_rights']
+        else:
+            # Eski kayıtlarda rok hakları taşların has_moved bayraklarından çıkarılır
+            for right, (king_row, king_col), king_symbol, (rook_row, rook_col), rook_symbol in CASTLING_SQUARES:
+                king = data['board'][king_row][king_col]
+                rook = data['board'][rook_row][rook_col]
+                if (king and king['symbol'] == king_symbol and not king['has_moved'] and
+                        rook and rook['symbol'] == rook_symbol and not rook['has_moved']):
+                    game.castling_rights |= right
+        game.ep_square = data.get('ep_square')
+        game.halfmove_clock = data.get('halfmove_clock', 0)
+        game.zobrist_key = game.compute_zobrist_key()
+        game.reset_position_counts()
+        game.cached_status = None
+        game.initial_state = data
+        game.start_ply = 1 if game.current_turn == 'black' else 0
         return game
 
-    def get_valid_moves(self, from_pos):
-        """Seçilen pozisyondaki taşın gidebileceği tüm geçerli konumları döndür"""
-        valid_moves = []
+    def to_fen(self):
+        """Mevcut pozisyonu FEN olarak döndür.
+
+        Geçerken alma karesi yalnızca alma mümkünse yazılır.
+        """
+        rows = []
+        for row in self.board:
+            text = ''
+            empty = 0
+            for piece in row:
+                if piece is None:
+                    empty += 1
+                    continue
+                if empty:
+                    text += str(empty)
+                    empty = 0
+                text += FEN_LETTERS[piece.index]
+            if empty:
+                text += str(empty)
+            rows.append(text)
+
+        castling = ''.join(letter for right, letter in zip(
+            (CASTLE_WHITE_KINGSIDE, CASTLE_WHITE_QUEENSIDE, CASTLE_BLACK_KINGSIDE, CASTLE_BLACK_QUEENSIDE), 'KQkq')
+            if self.castling_rights & right) or '-'
+        ep = '-'
+        if self.ep_square is not None:
+            ep_row, ep_col = SQUARES[self.ep_square]
+            ep = f"{'abcdefgh'[ep_col]}{8 - ep_row}"
+        fullmove = (self.start_ply + self.current_move + 1) // 2 + 1
+        return f"{'/'.join(rows)} {self.current_turn[0]} {castling} {ep} {self.halfmove_clock} {fullmove}"
+
+    @classmethod
+    def from_fen(cls, fen):
+        """FEN metninden oyun oluştur; hatalı FEN için ValueError yükselt"""
+        fields = fen.split()
+        if len(fields) < 2 or len(fields) > 6:
+            raise ValueError(f"Geçersiz FEN: {fen!r}")
+        placement, turn = fields[0], fields[1]
+        castling = fields[2] if len(fields) > 2 else '-'
+        ep = fields[3] if len(fields) > 3 else '-'
+        halfmove = fields[4] if len(fields) > 4 else '0'
+        fullmove = fields[5] if len(fields) > 5 else '1'
+
+        rows = placement.split('/')
+        if len(rows) != 8 or turn not in ('w', 'b') or not halfmove.isdigit() or not fullmove.isdigit():
+            raise ValueError(f"Geçersiz FEN: {fen!r}")
+
+        game = cls(setup=False)
+        game.current_turn = 'white' if turn == 'w' else 'black'
+        for row, text in enumerate(rows):
+            col = 0
+            for char in text:
+                if char.isdigit():
+                    col += int(char)
+                    continue
+                if char not in FEN_LETTERS or col > 7:
+                    raise ValueError(f"Geçersiz FEN: {fen!r}")
+                game.put_piece(row, col, PIECES[FEN_LETTERS.index(char)])
+                col += 1
+            if col != 8:
+                raise ValueError(f"Geçersiz FEN: {fen!r}")
+
+        for right, *_ in CASTLING_SQUARES:
+            if 'KQkq'[right.bit_length() - 1] in castling:
+                game.castling_rights |= right
+        try:
+            game.validate_setup()
+        except ValueError as error:
+            raise ValueError(f"FEN {error}: {fen!r}") from None
+        if ep != '-':
+            if len(ep) != 2 or ep[0] not in 'abcdefgh' or ep[1] not in ('6' if turn == 'w' else '3'):
+                raise ValueError(f"Geçersiz FEN geçerken alma karesi: {fen!r}")
+            # Karşı tarafın iki kare ilerleyen piyonunun başladığı ve vardığı kareler
+            ep_square = (8 - int(ep[1])) * 8 + 'abcdefgh'.index(ep[0])
+            step = 8 if turn == 'w' else -8
+            mover = 'black' if turn == 'w' else 'white'
+            game.ep_square = game.ep_square_after(mover, ep_square - step, ep_square + step)
+        game.halfmove_clock = int(halfmove)
+        game.zobrist_key = game.compute_zobrist_key()
+        game.reset_position_counts()
+        game.initial_state = fen
+        game.start_ply = (int(fullmove) - 1) * 2 + (game.current_turn == 'black')
+        return game
+
+    def snapshot(self):
+        """Pozisyonun değişmez ve hashlenebilir kopyası (SNAPSHOT_SIZE baytlık bytes).
+
+        Yalnızca pozisyonu (taşlar, sıra, rok hakları, geçerken alma karesi)
+        içerir; hamle geçmişi ve sayaçlar dahil değildir. Aynı pozisyonlar aynı
+        baytları verir, bu yüzden önbellek anahtarı olarak da kullanılabilir.
+        """
+        squares = bytes(map(SNAPSHOT_CODES.__getitem__, itertools.chain.from_iterable(self.board)))
+        return squares + bytes((self.current_turn == 'black', self.castling_rights,
+                                SNAPSHOT_NO_EP if self.ep_square is None else self.ep_square))
+
+    @classmethod
+    def from_snapshot(cls, data):
+        """snapshot() baytlarından oyun oluştur (başlangıç pozisyonu kurulmadan)"""
+        if len(data) != SNAPSHOT_SIZE:
+            raise ValueError(f"Geçersiz snapshot uzunluğu: {len(data)}")
+        if data[64] > 1 or data[65] > 15:
+            raise ValueError(f"Geçersiz snapshot sıra/rok baytı: {data[64]}, {data[65]}")
+        game = cls(setup=False)
+        board = game.board
+        bitboards = game.bitboards
+        key = 0
+        for square, value in enumerate(data[:64]):
+            if value:
+                if value > 12:
+                    raise ValueError(f"Geçersiz snapshot taş kodu: {value} ({square}. kare)")
+                index = value - 1
+                row, col = SQUARES[square]
+                board[row][col] = PIECES[index]
+                bitboards[index] |= 1 << square
+                key ^= ZOBRIST_PIECES[index][square]
+        white = bitboards[0] | bitboards[1] | bitboards[2] | bitboards[3] | bitboards[4] | bitboards[5]
+        black = bitboards[6] | bitboards[7] | bitboards[8] | bitboards[9] | bitboards[10] | bitboards[11]
+        game.occupancy = {'white': white, 'black': black}
+        game.occupied = white | black
+        game.king_squares = {color: bitboards[COLOR_OFFSET[color] + KING].bit_length() - 1
+                             if bitboards[COLOR_OFFSET[color] + KING] else None for color in ('white', 'black')}
+        if data[64]:
+            game.current_turn = 'black'
+            key ^= ZOBRIST_BLACK_TO_MOVE
+        game.castling_rights = data[65]
+        key ^= ZOBRIST_CASTLING[data[65]]
+        try:
+            game.validate_setup()
+        except ValueError as error:
+            raise ValueError(f"Snapshot {error}") from None
+        if data[66] != SNAPSHOT_NO_EP:
+            # FEN'deki gibi: sıradaki tarafa göre doğru satırda, rakip piyon iki kare
+            # ilerlemiş ve kare gerçekten alınabilir (snapshot yalnızca bunları yazar)
+            ep_square = data[66]
+            step = 8 if data[64] == 0 else -8
+            mover = 'black' if data[64] == 0 else 'white'
+            if (ep_square > 63 or ep_square >> 3 != (2 if data[64] == 0 else 5)
+                    or board[(ep_square + step) >> 3][ep_square & 7] is not PIECES[COLOR_OFFSET[mover] + PAWN]
+                    or game.occupied & (1 << ep_square | 1 << (ep_square - step))
+                    or game.ep_square_after(mover, ep_square - step, ep_square + step) != ep_square):
+                raise ValueError(f"Geçersiz snapshot geçerken alma karesi: {ep_square}")
+            game.ep_square = ep_square
+            key ^= ZOBRIST_EP_FILE[ep_square & 7]
+        game.zobrist_key = key
+        game.reset_position_counts()
+        game.initial_state = bytes(data)
+        game.start_ply = data[64]
+        return game
+
+    def to_history_dict(self):
+        """Oyunu başlangıç pozisyonu ve sıkıştırılmış hamle listesiyle birlikte döndür.
+
+        Geri alınmış (ileri alınabilecek) hamleler de saklanır; current_move
+        tahtanın hangi hamlede olduğunu gösterir.
+        """
+        data = {
+            'moves': pack_moves(self.move_history),
+            'current_move': self.current_move,
+        }
+        if isinstance(self.initial_state, bytes):
+            # Baytlar JSON'a yazılamaz; başlangıç pozisyonu FEN olarak saklanır
+            start = ChessBoard.from_snapshot(self.initial_state)
+            start.start_ply = self.start_ply
+            data['start'] = start.to_fen()
+        elif self.initial_state is not None:
+            data['start'] = self.initial_state
+        return data
+
+    @classmethod
+    def from_history_dict(cls, data):
+        """to_history_dict çıktısından oyunu hamleleri yeniden oynayarak kur"""
+        start = data.get('start')
+        if start is None:
+            game = cls()
+        elif isinstance(start, str):
+            game = cls.from_fen(start)
+        else:
+            game = cls.from_dict(start)
+        for code in unpack_moves(data['moves']):
+            from_pos, to_pos, promotion = decode_move(code)
+            success, message = game.make_move(from_pos, to_pos, promotion or None)
+            if not success:
+                raise ValueError(f"Kayıttaki hamle geçersiz ({from_pos} -> {to_pos}): {message}")
+        # Geri alınmış hamleler geçmişte kalır, tahta kaydedilen hamleye döner
+        while game.current_move > data['current_move']:
+            game.undo_move()
+        return game
+
+    def generate_moves(self, from_pos):
+        """Taşın kurallara uygun (şah kontrolü yapılmamış) hedef karelerini üret"""
         from_row, from_col = from_pos
         piece = self.board[from_row][from_col]
-        
         if piece is None:
-            return valid_moves
-        
-        # Tahtadaki tüm kareleri kontrol et
-        for to_row in range(8):
-            for to_col in range(8):
-                to_pos = (to_row, to_col)
-                # Aynı pozisyonu atlayalım
-                if to_pos == from_pos:
-                    continue
-                
-                # Hamle geçerli mi kontrol et
-                if self.is_valid_move(from_pos, to_pos):
-                    valid_moves.append(to_pos)
-        
-        return valid_moves
+            return []
+        return mask_to_squares(self.target_mask(from_row * 8 + from_col, piece))
+
+    def target_mask(self, square, piece):
+        """Karedeki taşın gidebileceği karelerin bitboard maskesi"""
+        color = piece.color
+        piece_type = piece.index % 6
+        enemies = self.occupancy['black' if color == 'white' else 'white']
+
+        if piece_type == PAWN:
+            # Beyaz piyonlar kare indeksini azaltarak, siyahlar artırarak ilerler
+            step = -8 if color == 'white' else 8
+            targets = PAWN_ATTACK_MASKS[color][square] & enemies
+            # Geçerken alma yalnızca sırası gelen taraf için geçerlidir
+            if self.ep_square is not None and color == self.current_turn:
+                targets |= PAWN_ATTACK_MASKS[color][square] & (1 << self.ep_square)
+            one_step = square + step
+            if 0 <= one_step < 64 and not (self.occupied >> one_step) & 1:
+                targets |= 1 << one_step
+                # Başlangıç sırasından iki kare ilerleme
+                two_step = one_step + step
+                if (square >> 3) == (6 if color == 'white' else 1) and not (self.occupied >> two_step) & 1:
+                    targets |= 1 << two_step
+            return targets
+
+        if piece_type == KNIGHT:
+            attacks = KNIGHT_MASKS[square]
+        elif piece_type == KING:
+            attacks = KING_MASKS[square]
+            if self.castling_rights & CASTLE_RIGHTS_BY_COLOR[color]:
+                attacks |= self.castling_targets(square, color)
+        elif piece_type == ROOK:
+            attacks = slider_attacks(square, self.occupied, ROOK_RAYS)
+        elif piece_type == BISHOP:
+            attacks = slider_attacks(square, self.occupied, BISHOP_RAYS)
+        else:
+            attacks = (slider_attacks(square, self.occupied, ROOK_RAYS) |
+                       slider_attacks(square, self.occupied, BISHOP_RAYS))
+
+        # Kendi taşlarımızın bulunduğu kareler hariç
+        return attacks & ~self.occupancy[color]
+
+    def castling_targets(self, square, color):
+        """Şahın rok ile gidebileceği karelerin maskesi (şah çekilmiyor, geçilen kareler güvenli)"""
+        targets = 0
+        enemy = 'black' if color == 'white' else 'white'
+        for to_square in CASTLING_TARGETS[color]:
+            right, _, passed, empty = CASTLING_MOVES[to_square]
+            if (self.castling_rights & right and not self.occupied & empty and
+                    not self.is_attacked(square, enemy) and not self.is_attacked(passed, enemy)):
+                targets |= 1 << to_square
+        return targets
+
+    def get_valid_moves(self, from_pos):
+        """Seçilen pozisyondaki taşın gidebileceği tüm geçerli konumları döndür"""
+        return self.generate_moves(from_pos)
+
+    def is_square_attacked(self, pos, by_color):
+        """Verilen karenin by_color renkli taşlar tarafından tehdit edilip edilmediğini kontrol et"""
+        return self.is_attacked(pos[0] * 8 + pos[1], by_color)
+
+    def is_attacked(self, square, by_color):
+        """Kare indeksi üzerinden tehdit kontrolü (maskeler ile)"""
+        bitboards = self.bitboards
+        base = COLOR_OFFSET[by_color]
+
+        if KNIGHT_MASKS[square] & bitboards[base + KNIGHT]:
+            return True
+        if KING_MASKS[square] & bitboards[base + KING]:
+            return True
+        # by_color piyonu bu kareyi, karenin karşı renkten bakıldığında çaprazındaysa tehdit eder
+        defender = 'black' if by_color == 'white' else 'white'
+        if PAWN_ATTACK_MASKS[defender][square] & bitboards[base + PAWN]:
+            return True
+
+        queens = bitboards[base + QUEEN]
+        rook_like = bitboards[base + ROOK] | queens
+        if rook_like and slider_attacks(square, self.occupied, ROOK_RAYS) & rook_like:
+            return True
+        bishop_like = bitboards[base + BISHOP] | queens
+        if bishop_like and slider_attacks(square, self.occupied, BISHOP_RAYS) & bishop_like:
+            return True
+
+        return False
+
+    def get_king_position(self, color):
+        """Verilen renkteki şahın (satır, sütun) konumunu döndür"""
+        king_square = self.king_squares[color]
+        return None if king_square is None else SQUARES[king_square]
 
     def is_king_in_check(self, color):
         """Verilen renkteki şahın tehdit altında olup olmadığını kontrol et"""
-        # Şahın konumunu bul
-        king_pos = None
-        king_symbol = '♔' if color == 'white' else '♚'
-        for row in range(8):
-            for col in range(8):
-                piece = self.board[row][col]
-                if piece and piece.symbol == king_symbol:
-                    king_pos = (row, col)
-                    break
-            if king_pos:
-                break
-        
-        if not king_pos:
+        # Şahın konumu her hamlede güncel tutulur, tahtayı taramaya gerek yok
+        king_square = self.king_squares[color]
+        if king_square is None:
             return False
         
         # Rakip taşların şahı tehdit edip etmediğini kontrol et
         opponent_color = 'black' if color == 'white' else 'white'
-        for row in range(8):
-            for col in range(8):
-                piece = self.board[row][col]
-                if piece and piece.color == opponent_color:
-                    if self.is_valid_move((row, col), king_pos):
-                        return True
-        return False
+        return self.is_attacked(king_square, opponent_color)
+
+    def leaves_king_in_check(self, from_pos, to_pos):
+        """Hamle yapılırsa hamle yapan tarafın şahı tehdit altında kalır mı"""
+        from_row, from_col = from_pos
+        to_row, to_col = to_pos
+        piece = self.board[from_row][from_col]
+
+        # Hamleyi geçici olarak yap (rokta kalenin yeri şahın güvenliğini etkilemez)
+        captured_piece = self.remove_piece(to_row, to_col)
+        ep_captured = None
+        if (to_row * 8 + to_col == self.ep_square and from_col != to_col and
+                piece.index % 6 == PAWN):
+            ep_captured = self.remove_piece(from_row, to_col)
+        self.remove_piece(from_row, from_col)
+        self.put_piece(to_row, to_col, piece)
+
+        in_check = self.is_king_in_check(piece.color)
+
+        # Hamleyi geri al
+        self.remove_piece(to_row, to_col)
+        self.put_piece(from_row, from_col, piece)
+        if captured_piece:
+            self.put_piece(to_row, to_col, captured_piece)
+        if ep_captured:
+            self.put_piece(from_row, to_col, ep_captured)
+        return in_check
+
+    def get_legal_moves(self, color=None):
+        """Verilen rengin (varsayılan: sırası gelen taraf) tüm yasal hamlelerini {from_pos: [to_pos, ...]} olarak döndür"""
+        color = color or self.current_turn
+        legal_moves = {}
+        for from_pos in mask_to_squares(self.occupancy[color]):
+            targets = [to_pos for to_pos in self.generate_moves(from_pos)
+                       if not self.leaves_king_in_check(from_pos, to_pos)]
+            if targets:
+                legal_moves[from_pos] = targets
+        return legal_moves
+
+    def is_threefold_repetition(self):
+        """Mevcut pozisyon (aynı sıra, rok ve geçerken alma hakları) oyunda en az üç kez oluştuysa True"""
+        return self.position_counts.get(self.zobrist_key, 0) >= 3
+
+    def is_fifty_moves(self):
+        """Son 50 hamlede (100 yarım hamle) taş alınmadı ve piyon oynatılmadıysa True"""
+        return self.halfmove_clock >= FIFTY_MOVE_PLIES
+
+    def is_insufficient_material(self):
+        """İki taraf da mat edemiyorsa True: yalnız şahlar, tek hafif taş ya da hepsi aynı renk karede filler"""
+        bitboards = self.bitboards
+        heavy = (bitboards[PAWN] | bitboards[ROOK] | bitboards[QUEEN] |
+                 bitboards[6 + PAWN] | bitboards[6 + ROOK] | bitboards[6 + QUEEN])
+        if heavy:
+            return False
+        knights = bitboards[KNIGHT] | bitboards[6 + KNIGHT]
+        bishops = bitboards[BISHOP] | bitboards[6 + BISHOP]
+        minors = knights | bishops
+        if minors & (minors - 1) == 0:
+            return True
+        return not knights and (bishops & LIGHT_SQUARES == 0 or bishops & ~LIGHT_SQUARES == 0)
+
+    def get_game_status(self):
+        """Sırası gelen tarafın oyun durumunu döndür; pozisyon başına bir kez hesaplanır.
+
+        Dönen sözlük: in_check, checkmate, stalemate, draw (beraberlik nedeni:
+        'stalemate', 'repetition', 'fifty_moves', 'insufficient_material' ya da
+        None) ve legal_moves ({from_pos: [to_pos, ...]}). Mat, beraberlik
+        kurallarından önce gelir. Hamle yapılınca, geri/ileri alınınca önbellek silinir.
+        """
+        if self.cached_status is None:
+            legal_moves = self.get_legal_moves()
+            in_check = self.is_king_in_check(self.current_turn)
+            draw = None
+            if not legal_moves:
+                draw = None if in_check else 'stalemate'
+            elif self.is_insufficient_material():
+                draw = 'insufficient_material'
+            elif self.is_threefold_repetition():
+                draw = 'repetition'
+            elif self.is_fifty_moves():
+                draw = 'fifty_moves'
+            self.cached_status = {
+                'in_check': in_check,
+                'checkmate': in_check and not legal_moves,
+                'stalemate': draw == 'stalemate',
+                'draw': draw,
+                'legal_moves': legal_moves,
+            }
+        return self.cached_status
+
+    def get_result(self):
+        """Oyunun sonucunu PGN gösterimiyle döndür ('1-0', '0-1', '1/2-1/2'; sürüyorsa '*')"""
+        status = self.get_game_status()
+        if status['checkmate']:
+            return '0-1' if self.current_turn == 'white' else '1-0'
+        if status['draw']:
+            return '1/2-1/2'
+        return '*'
 
     def is_checkmate(self, color):
         """Verilen renk için şah mat durumunu kontrol et"""
+        # Sırası gelen taraf için önbellekteki durum kullanılır
+        if color == self.current_turn:
+            return self.get_game_status()['checkmate']
+
         # Eğer şah tehdit altında değilse mat değildir
         if not self.is_king_in_check(color):
             return False
         
-        # Tüm taşları kontrol et
-        for row in range(8):
-            for col in range(8):
-                piece = self.board[row][col]
-                if piece and piece.color == color:
-                    # Bu taşın yapabileceği tüm hamleleri kontrol et
-                    for to_row in range(8):
-                        for to_col in range(8):
-                            if self.is_valid_move((row, col), (to_row, to_col)):
-                                # Hamleyi geçici olarak yap
-                                captured_piece = self.board[to_row][to_col]
-                                self.board[to_row][to_col] = piece
-                                self.board[row][col] = None
-                                
-                                # Şah hala tehdit altında mı kontrol et
-                                still_in_check = self.is_king_in_check(color)
-                                
-                                # Hamleyi geri al
-                                self.board[row][col] = piece
-                                self.board[to_row][to_col] = captured_piece
-                                
-                                # Eğer bir kurtuluş hamlesi bulunduysa mat değildir
-                                if not still_in_check:
-                                    return False
+        # Tüm taşların yapabileceği tüm hamleleri kontrol et
+        for from_pos in mask_to_squares(self.occupancy[color]):
+            for to_pos in self.generate_moves(from_pos):
+                # Eğer bir kurtuluş hamlesi bulunduysa mat değildir
+                if not self.leaves_king_in_check(from_pos, to_pos):
+                    return False
         
         # Hiçbir kurtuluş hamlesi bulunamadıysa mat olmuştur
         return True
 
+    def perft(self, depth):
+        """Verilen derinlikteki yasal hamle ağacının yaprak sayısını döndür (perft)"""
+        def count(depth):
+            nodes = 0
+            color = self.current_turn
+            pawns = self.bitboards[COLOR_OFFSET[color] + PAWN]
+            own = self.occupancy[color]
+            while own:
+                low = own & -own
+                own ^= low
+                from_square = low.bit_length() - 1
+                targets = self.target_mask(from_square, self.board[from_square >> 3][from_square & 7])
+                is_pawn = pawns & low
+                while targets:
+                    target = targets & -targets
+                    targets ^= target
+                    to_square = target.bit_length() - 1
+                    move = from_square | to_square << 6
+                    # Terfide her taş türü ayrı bir hamle sayılır
+                    if is_pawn and (to_square < 8 or to_square >= 56):
+                        moves = [move | promotion << 12 for promotion in PROMOTION_TYPES]
+                    else:
+                        moves = (move,)
+                    for move in moves:
+                        self.push(move)
+                        if not self.is_king_in_check(color):
+                            nodes += count(depth - 1) if depth > 1 else 1
+                        self.pop()
+            return nodes
+
+        return count(depth) if depth > 0 else 1
+
 def main():
     game = ChessBoard()
     while True:
@@ -386,5 +1175,115 @@ def main():
         except (IndexError, ValueError):
             print("Geçersiz giriş! Doğru format: e2 e4")
 
+def game_summary(source, game, moves, error=None):
+    """Toplu doğrulamada bir oyun için raporlanan satır"""
+    if error is not None:
+        return {'source': source, 'legal': False, 'moves': moves, 'status': None, 'result': None, 'error': error}
+    status = game.get_game_status()
+    if status['checkmate']:
+        state = 'checkmate'
+    elif status['draw']:
+        state = status['draw']
+    else:
+        state = 'check' if status['in_check'] else 'ongoing'
+    return {'source': source, 'legal': True, 'moves': moves, 'status': state, 'result': game.get_result(), 'error': None}
+
+def replay_save(path):
+    """Kayıt dosyasındaki oyunu kurallara göre yeniden oyna (işçi süreçte çalışır)"""
+    try:
+        with open(path, 'r') as f:
+            data = json.load(f)
+        if 'game' in data:
+            game = ChessBoard.from_history_dict(data['game'])
+        else:
+            game = ChessBoard.from_dict(data['board'])
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        return [game_summary(path, None, 0, str(e))]
+    return [game_summary(path, game, game.current_move + 1)]
+
+def replay_pgn_chunk(task):
+    """split_games parçasındaki oyunları doğrula (işçi süreçte çalışır)"""
+    from chess_pgn import PGNError, read_pgn
+    path, first_line, text = task
+    source = f"{path}:{first_line}"
+    results = []
+    try:
+        for pgn_game in read_pgn(io.StringIO(text)):
+            results.append(game_summary(source, pgn_game.board, len(pgn_game.moves)))
+    except PGNError as e:
+        # Satır numarası parçanın başına göre; dosyadaki satıra çevir
+        line = first_line + e.line_number - 1 if e.line_number else first_line
+        message = str(e).split(': ', 1)[-1]
+        results.append(game_summary(source, None, None, f"{line}. satır: {message}"))
+    return results
+
+def replay_tasks(path):
+    """Doğrulanacak işleri ve işçi fonksiyonunu döndür: klasör ise kayıtlar, değilse PGN parçaları"""
+    if os.path.isdir(path):
+        names = sorted(name for name in os.listdir(path) if name.endswith('.json'))
+        return replay_save, (os.path.join(path, name) for name in names)
+
+    from chess_pgn import split_games
+
+    def chunks():
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            for first_line, text in split_games(f):
+                yield path, first_line, text
+    return replay_pgn_chunk, chunks()
+
+def replay_main(argv=None):
+    """Kayıt klasörünü veya PGN dosyasını tüm çekirdeklerde doğrulayan komut satırı aracı"""
+    parser = argparse.ArgumentParser(
+        prog='chess_game.py replay',
+        description="Kayıtlı oyunları veya PGN dosyasını kurallara göre yeniden oynayıp doğrula")
+    parser.add_argument('path', help="kayıt klasörü (saves/) veya PGN dosyası")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="işçi süreç sayısı")
+    parser.add_argument('--chunksize', type=int, default=64, help="işçiye bir seferde gönderilen oyun sayısı")
+    parser.add_argument('--format', choices=['text', 'jsonl'], default='text')
+    parser.add_argument('--quiet', action='store_true', help="yalnızca özet ve geçersiz oyunları yaz")
+    args = parser.parse_args(argv)
+    # Dosya hataları işler başladıktan sonra işçi üretecinin içinden çıkmasın
+    if not os.path.exists(args.path):
+        parser.error(f"{args.path} bulunamadı")
+    if not os.access(args.path, os.R_OK):
+        parser.error(f"{args.path} okunamıyor")
+    # Kurallar modülü içe aktarılırken multiprocessing yüklenmesin diye burada
+    import multiprocessing
+
+    worker, tasks = replay_tasks(args.path)
+    # Çok büyük dosyalarda tüm işler kuyruğa yığılmasın diye işler pencereler halinde gönderilir
+    window = max(1, args.workers) * args.chunksize * 4
+    totals = {'games': 0, 'illegal': 0, 'moves': 0}
+    start = time.perf_counter()
+
+    with multiprocessing.Pool(args.workers) as pool:
+        while True:
+            batch = list(itertools.islice(tasks, window))
+            if not batch:
+                break
+            for results in pool.imap(worker, batch, chunksize=args.chunksize):
+                for row in results:
+                    totals['games'] += 1
+                    totals['moves'] += row['moves'] or 0
+                    if not row['legal']:
+                        totals['illegal'] += 1
+                    elif args.quiet:
+                        continue
+                    if args.format == 'jsonl':
+                        print(json.dumps(row, ensure_ascii=False))
+                    elif row['legal']:
+                        print(f"{row['source']}\tgeçerli\t{row['moves']} hamle\t{row['status']}\t{row['result']}")
+                    else:
+                        print(f"{row['source']}\tgeçersiz\t{row['error']}")
+
+    elapsed = time.perf_counter() - start
+    rate = totals['games'] / elapsed if elapsed > 0 else 0.0
+    print(f"{totals['games']} oyun ({totals['illegal']} geçersiz), {totals['moves']} hamle, "
+          f"{elapsed:.2f} sn, {rate:.1f} oyun/sn", file=sys.stderr)
+    return 1 if totals['illegal'] else 0
+
 if __name__ == "__main__":
+    # Argümansız çalıştırılınca etkileşimli oyun, 'replay' ile toplu doğrulama
+    if len(sys.argv) > 1 and sys.argv[1] == 'replay':
+        sys.exit(replay_main(sys.argv[2:]))
     main() 
\ No newline at end of file
@@ -1,12 +1,33 @@
 import pygame
 import os
-from chess_game import ChessBoard, ChessPiece
+from chess_ai import ChessAI
+from chess_book import BOOK_PATH, OpeningBook
+from chess_game import BISHOP, KNIGHT, QUEEN, ROOK, ChessBoard, ChessPiece
+from chess_worker import EngineWorker
+from chess_catalog import SaveCatalog
+from chess_render import DARK_SQUARE, LIGHT_SQUARE, PIECE_FILES
 import json
 from datetime import datetime
-pygame.init()
+
+# Arka plan motor işçisinin sonuçlarını taşıyan olay türü
+ENGINE_EVENT = pygame.USEREVENT + 1
 
 class ChessGUI:
-    def __init__(self):
+    # get_game_status()['draw'] değerlerinin ekranda gösterilen açıklamaları
+    DRAW_REASONS = {
+        'stalemate': "Pat: hamle yapılamıyor",
+        'repetition': "Pozisyon üç kez tekrarlandı",
+        'fifty_moves': "Elli hamle kuralı",
+        'insufficient_material': "Mat için yetersiz materyal",
+    }
+
+    def __init__(self, fps=60, headless=False):
+        # pygame modül yüklenirken değil, arayüz kurulurken başlatılır;
+        # headless kipte pencere açılmaz (SDL dummy sürücüsü), çizim bellekte yapılır
+        if headless:
+            os.environ['SDL_VIDEODRIVER'] = 'dummy'
+        pygame.init()
+        self.headless = headless
         self.SQUARE_SIZE = 80
         self.BOARD_SIZE = self.SQUARE_SIZE * 8
         self.CAPTURED_WIDTH = self.SQUARE_SIZE * 2
@@ -15,15 +36,15 @@ class ChessGUI:
         pygame.display.set_caption("Satranç")
         
         # Renkler
-        self.LIGHT_SQUARE = (240, 217, 181)
-        self.DARK_SQUARE = (181, 136, 99)
+        self.LIGHT_SQUARE = LIGHT_SQUARE
+        self.DARK_SQUARE = DARK_SQUARE
         self.HIGHLIGHT = (130, 151, 105)
         self.SIDEBAR_COLOR = (49, 46, 43)
         self.TEXT_COLOR = (255, 255, 255)
         self.INPUT_BG = (70, 70, 70)
         
-        # Font
-        self.font = pygame.font.SysFont('Arial', 24)
+        # Font ilk metin çiziminde yüklenir
+        self._font = None
         
         # Oyuncu isimleri
         self.white_player = ""
@@ -34,8 +55,17 @@ class ChessGUI:
         self.selected_pos = None
         self.captured_white = []
         self.captured_black = []
-        self.piece_images = {}
-        self.load_pieces()
+        # Eski biçimli kayıttan yüklenen oyunda başlangıçta zaten yenmiş taşlar
+        self.start_captured_white = []
+        self.start_captured_black = []
+        
+        # Sprite önbelleği: load_pieces doldurur, kare boyutu değişince yeniden kurulur
+        self.piece_sources = {}       # Dosyadan yüklenen orijinal görüntüler
+        self.piece_images = {}        # Kare boyutunda taşlar
+        self.small_piece_images = {}  # Yenen taşlar için yarım boyutlu taşlar
+        self.move_overlay = None      # Olası hamle karesi için hazır yarı saydam katman
+        self.sprite_size = None
+        self.text_cache = {}
         
         # Butonlar için renkler
         self.BUTTON_COLOR = (100, 100, 100)
@@ -57,40 +87,86 @@ class ChessGUI:
         self.undo_button = pygame.Rect(button_x, button_start_y - (button_height + 5), button_width//2 - 2, button_height)
         self.redo_button = pygame.Rect(button_x + button_width//2 + 2, button_start_y - (button_height + 5), button_width//2 - 2, button_height)
         
-        # Saves klasörünü oluştur
+        # Saves klasörü ve dizini ilk kayıtta veya yükleme menüsünde oluşturulur
         self.saves_dir = "saves"
-        if not os.path.exists(self.saves_dir):
-            os.makedirs(self.saves_dir)
+        self._catalog = None
         
         # Yeni renkler ekleyelim
         self.POSSIBLE_MOVE = (130, 151, 105, 128)  # Son değer (128) alpha/transparanlık için
         self.MOVE_INDICATOR = (100, 100, 100)
         self.CHECK_COLOR = (230, 100, 50)  # Koyu turuncu renk - şah durumu için
         
+        # Taş görüntüleri ilk tahta çiziminde yüklenir (draw_board -> load_pieces)
+        
         # Olası hamleleri tutacak liste
         self.possible_moves = []
+        
+        # Bilgisayar rakip (None ise iki kişilik oyun)
+        self.ai_color = None
+        self.AI_TIME_MS = 1000
+        self.HINT_TIME_MS = 500
+        
+        # Açılış kitabı varsa bilgisayar ve ipucu hamleleri önce kitaptan seçilir
+        self.book = OpeningBook(BOOK_PATH) if os.path.exists(BOOK_PATH) else None
+        
+        # Motor hesapları arka planda yapılır, sonuçlar ENGINE_EVENT ile gelir
+        self.worker = EngineWorker(self.post_engine_result, ChessAI(book=self.book))
+        self.hint_move = None
+        
+        # Kare hızı sınırı ve değişen bölgelerin takibi
+        self.clock = pygame.time.Clock()
+        self.FPS = fps
+        self.drawn_squares = [None] * 64  # Her karenin en son çizilen durumu
+        self.drawn_sidebar = None
+        self.full_redraw = True
+
+    @property
+    def font(self):
+        if self._font is None:
+            self._font = pygame.font.SysFont('Arial', 24)
+        return self._font
+
+    @property
+    def catalog(self):
+        """Kayıt dizini; ilk kullanımda saves klasörü ve SQLite dosyası oluşturulur"""
+        if self._catalog is None:
+            os.makedirs(self.saves_dir, exist_ok=True)
+            # Yükleme menüsü dosyaları değil, bu dizini okur
+            self._catalog = SaveCatalog(self.saves_dir)
+        return self._catalog
 
     def get_player_names(self):
         # Kayıtlı oyun yükleme seçeneği ekle
-        saves = [f for f in os.listdir(self.saves_dir) if f.startswith('chess_save_')]
+        saves = []
+        if os.path.isdir(self.saves_dir):
+            saves = [f for f in os.listdir(self.saves_dir) if f.startswith('chess_save_')]
         if saves:
             if self.show_dialog("Kayıtlı oyun yüklemek ister misiniz?") == "Evet":
                 save_file = self.show_load_game_menu()
                 if save_file and self.load_game(save_file):
                     return True
         
+        if self.show_dialog("Bilgisayara karşı oynamak ister misiniz?") == "Evet":
+            self.ai_color = 'black'
+        
         input_active = "white"
         white_input = ""
         black_input = ""
         
         while True:
-            for event in pygame.event.get():
+            # Motor sonuçları kuyrukta kalır; diyalog kapanınca ana döngü işler
+            for event in pygame.event.get(exclude=ENGINE_EVENT):
                 if event.type == pygame.QUIT:
                     return False
                 
                 if event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_RETURN:
-                        if input_active == "white":
+                        if input_active == "white" and self.ai_color == 'black':
+                            # Siyahı bilgisayar oynar, ikinci isim sorulmaz
+                            self.white_player = white_input
+                            self.black_player = "Bilgisayar"
+                            return True
+                        elif input_active == "white":
                             input_active = "black"
                         elif input_active == "black" and black_input:
                             self.white_player = white_input
@@ -145,79 +221,144 @@ class ChessGUI:
     def draw_player_info(self):
         # Oyuncu isimlerini ve sırayı göster
         current_player = self.white_player if self.game.current_turn == 'white' else self.black_player
-        turn_text = self.font.render(f"Sıra: {current_player}", True, self.TEXT_COLOR)
+        turn_text = self.render_text(f"Sıra: {current_player}")
         # Sıra bilgisini geri/ileri butonlarının üstüne taşı
         text_y = self.undo_button.top - 30
         self.screen.blit(turn_text, (self.BOARD_SIZE + 10, text_y))
 
     def load_pieces(self):
-        pieces = {
-            '♔': 'wK', '♕': 'wQ', '♖': 'wR', '♗': 'wB', '♘': 'wN', '♙': 'wP',
-            '♚': 'bK', '♛': 'bQ', '♜': 'bR', '♝': 'bB', '♞': 'bN', '♟': 'bP'
-        }
+        # Dosyalar yalnızca bir kez okunur, yeniden ölçeklemede orijinaller kullanılır
+        if not self.piece_sources:
+            for symbol, filename in PIECE_FILES.items():
+                path = os.path.join('pieces', f'{filename}.png')
+                try:
+                    self.piece_sources[symbol] = pygame.image.load(path).convert_alpha()
+                except:
+                    print(f"Hata: {path} dosyası yüklenemedi")
         
-        for symbol, filename in pieces.items():
-            path = os.path.join('pieces', f'{filename}.png')
-            try:
-                image = pygame.image.load(path)
-                image = pygame.transform.scale(image, (self.SQUARE_SIZE, self.SQUARE_SIZE))
-                self.piece_images[symbol] = image
-            except:
-                print(f"Hata: {path} dosyası yüklenemedi")
+        full_size = (self.SQUARE_SIZE, self.SQUARE_SIZE)
+        half_size = (self.SQUARE_SIZE // 2, self.SQUARE_SIZE // 2)
+        self.piece_images = {}
+        self.small_piece_images = {}
+        for symbol, image in self.piece_sources.items():
+            self.piece_images[symbol] = pygame.transform.smoothscale(image, full_size).convert_alpha()
+            self.small_piece_images[symbol] = pygame.transform.smoothscale(image, half_size).convert_alpha()
+        
+        # Olası hamle katmanı: yarı saydam yeşil kare ve ortada nokta
+        self.move_overlay = pygame.Surface(full_size, pygame.SRCALPHA)
+        self.move_overlay.fill(self.POSSIBLE_MOVE)
+        pygame.draw.circle(self.move_overlay, self.MOVE_INDICATOR,
+                           (self.SQUARE_SIZE // 2, self.SQUARE_SIZE // 2), 8)
+        self.move_overlay = self.move_overlay.convert_alpha()
+        
+        # Karelerin ekran dikdörtgenleri (kirli bölge listesi için)
+        self.square_rects = [pygame.Rect(col * self.SQUARE_SIZE, row * self.SQUARE_SIZE,
+                                         self.SQUARE_SIZE, self.SQUARE_SIZE)
+                             for row in range(8) for col in range(8)]
+        self.sprite_size = self.SQUARE_SIZE
+
+    def render_text(self, text):
+        """Metin yüzeyini önbellekten döndür; aynı metin her çizimde yeniden oluşturulmaz"""
+        surface = self.text_cache.get(text)
+        if surface is None:
+            surface = self.font.render(text, True, self.TEXT_COLOR)
+            self.text_cache[text] = surface
+        return surface
+
+    def get_square_state(self, row, col, check_squares):
+        """Karenin görünümünü belirleyen durum: (zemin rengi, olası hamle mi, taş sembolü)"""
+        color = self.LIGHT_SQUARE if (row + col) % 2 == 0 else self.DARK_SQUARE
+        possible_move = False
+        
+        # Seçili kareyi ve ipucu hamlesini vurgula
+        if self.selected_pos and self.selected_pos == (row, col):
+            color = self.HIGHLIGHT
+        elif self.hint_move and (row, col) in self.hint_move:
+            color = self.HIGHLIGHT
+        # Olası hamleleri vurgula
+        elif (row, col) in self.possible_moves:
+            possible_move = True
+        # Şah durumunu vurgula
+        elif (row, col) in check_squares:
+            color = self.CHECK_COLOR
+        
+        piece = self.game.board[row][col]
+        return color, possible_move, piece.symbol if piece else None
+
+    def draw_square(self, row, col, state):
+        """Tek bir kareyi zemini, olası hamle işareti ve taşıyla birlikte çiz"""
+        color, possible_move, symbol = state
+        rect = self.square_rects[row * 8 + col]
+        self.screen.fill(color, rect)
+        
+        if possible_move:
+            # Önceden hazırlanmış yarı saydam katman ve nokta
+            self.screen.blit(self.move_overlay, rect)
+        
+        if symbol:
+            image = self.piece_images.get(symbol)
+            if image:
+                self.screen.blit(image, rect)
+
+    def draw_board(self, dirty_rects=None):
+        """Tahtayı taşlarla birlikte çiz.
+
+        dirty_rects verilirse yalnızca son çizimden beri görünümü değişen kareler
+        çizilir ve dikdörtgenleri listeye eklenir.
+        """
+        # Kare boyutu değiştiyse sprite önbelleğini yeniden kur
+        if self.sprite_size != self.SQUARE_SIZE:
+            self.load_pieces()
+        
+        # Şah durumu pozisyon başına bir kez hesaplanıp önbellekten okunur
+        check_squares = set()
+        if self.game.get_game_status()['in_check']:
+            check_squares.add(self.game.get_king_position(self.game.current_turn))
 
-    def draw_board(self):
         for row in range(8):
             for col in range(8):
-                color = self.LIGHT_SQUARE if (row + col) % 2 == 0 else self.DARK_SQUARE
-                
-                # Seçili kareyi vurgula
-                if self.selected_pos and self.selected_pos == (row, col):
-                    color = self.HIGHLIGHT
-                
-                # Olası hamleleri vurgula
-                elif (row, col) in self.possible_moves:
-                    # Kare çiz
-                    pygame.draw.rect(self.screen, color,
-                                  (col * self.SQUARE_SIZE, 
-                                   row * self.SQUARE_SIZE,
-                                   self.SQUARE_SIZE, 
-                                   self.SQUARE_SIZE))
-                    
-                    # Yarı saydam yeşil overlay
-                    s = pygame.Surface((self.SQUARE_SIZE, self.SQUARE_SIZE), pygame.SRCALPHA)
-                    pygame.draw.rect(s, self.POSSIBLE_MOVE, s.get_rect())
-                    self.screen.blit(s, (col * self.SQUARE_SIZE, row * self.SQUARE_SIZE))
-                    
-                    # Merkeze nokta çiz
-                    center_x = col * self.SQUARE_SIZE + self.SQUARE_SIZE // 2
-                    center_y = row * self.SQUARE_SIZE + self.SQUARE_SIZE // 2
-                    pygame.draw.circle(self.screen, self.MOVE_INDICATOR, 
-                                    (center_x, center_y), 8)
+                state = self.get_square_state(row, col, check_squares)
+                index = row * 8 + col
+                if dirty_rects is not None and self.drawn_squares[index] == state:
                     continue
-                
-                # Şah durumunu vurgula
-                piece = self.game.board[row][col]
-                if piece:
-                    if ((piece.symbol == '♔' and self.game.is_king_in_check('white')) or 
-                        (piece.symbol == '♚' and self.game.is_king_in_check('black'))):
-                        color = self.CHECK_COLOR
-                
-                pygame.draw.rect(self.screen, color,
-                               (col * self.SQUARE_SIZE, 
-                                row * self.SQUARE_SIZE,
-                                self.SQUARE_SIZE, 
-                                self.SQUARE_SIZE))
+                self.draw_square(row, col, state)
+                self.drawn_squares[index] = state
+                if dirty_rects is not None:
+                    dirty_rects.append(self.square_rects[index])
 
-    def draw_pieces(self):
-        for row in range(8):
-            for col in range(8):
-                piece = self.game.board[row][col]
-                if piece:
-                    image = self.piece_images.get(piece.symbol)
-                    if image:
-                        self.screen.blit(image, 
-                                       (col * self.SQUARE_SIZE,
-                                        row * self.SQUARE_SIZE))
+    def get_sidebar_state(self):
+        """Kenar çubuğunun görünümünü belirleyen durum"""
+        mouse_pos = pygame.mouse.get_pos()
+        hovered = tuple(button.collidepoint(mouse_pos) for button in
+                        (self.save_button, self.load_button, self.exit_button,
+                         self.undo_button, self.redo_button))
+        return (tuple(piece.symbol for piece in self.captured_white),
+                tuple(piece.symbol for piece in self.captured_black),
+                self.game.current_turn, self.white_player, self.black_player, hovered)
+
+    def render(self):
+        """Ekranı güncelle: yalnızca değişen kareler ve kenar çubuğu yeniden çizilir"""
+        if self.full_redraw:
+            # Diyaloglar ve menüler ekranın üzerine çizdiği için her şeyi baştan çiz
+            self.drawn_squares = [None] * 64
+            self.drawn_sidebar = None
+        
+        dirty_rects = []
+        self.draw_board(dirty_rects)
+        
+        sidebar_state = self.get_sidebar_state()
+        if sidebar_state != self.drawn_sidebar:
+            self.draw_captured_pieces()
+            self.draw_player_info()
+            self.draw_buttons()
+            self.drawn_sidebar = sidebar_state
+            dirty_rects.append(pygame.Rect(self.BOARD_SIZE, 0, self.CAPTURED_WIDTH, self.BOARD_SIZE))
+        
+        if self.full_redraw:
+            pygame.display.flip()
+            self.full_redraw = False
+        elif dirty_rects:
+            pygame.display.update(dirty_rects)
 
     def get_square_from_mouse(self, pos):
         x, y = pos
@@ -241,23 +382,25 @@ class ChessGUI:
                 x = self.BOARD_SIZE + (i % 2) * (self.SQUARE_SIZE // 2)
                 y = base_y + (i // 2) * (self.SQUARE_SIZE // 2)
                 
-                image = self.piece_images.get(piece.symbol)
-                if image:
-                    small_image = pygame.transform.scale(image, 
-                                                      (self.SQUARE_SIZE // 2, 
-                                                       self.SQUARE_SIZE // 2))
+                small_image = self.small_piece_images.get(piece.symbol)
+                if small_image:
                     self.screen.blit(small_image, (x, y))
 
     def save_game(self):
         """Oyunu kaydet"""
+        # Tahta yerine hamle geçmişi kaydedilir; yenen taşlar geçmişten çıkarılır
         game_state = {
-            'board': self.game.to_dict(),
+            'game': self.game.to_history_dict(),
             'white_player': self.white_player,
             'black_player': self.black_player,
-            'captured_white': [piece.symbol for piece in self.captured_white],
-            'captured_black': [piece.symbol for piece in self.captured_black],
+            'ai_color': self.ai_color,
+            'move_count': self.game.current_move + 1,
+            'result': self.game.get_result(),
             'date': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         }
+        if self.start_captured_white or self.start_captured_black:
+            game_state['start_captured_white'] = [piece.symbol for piece in self.start_captured_white]
+            game_state['start_captured_black'] = [piece.symbol for piece in self.start_captured_black]
         
         # Dosya adını oluştur
         current_time = datetime.now()
@@ -274,9 +417,11 @@ class ChessGUI:
         
         filename = f"{date_str}_{white_name}_vs_{black_name}_{time_str}.json"
         
+        os.makedirs(self.saves_dir, exist_ok=True)
         filepath = os.path.join(self.saves_dir, filename)
         with open(filepath, 'w') as f:
             json.dump(game_state, f)
+        self.catalog.update(filename, game_state)
         return filename
 
     def load_game(self, filename):
@@ -286,13 +431,22 @@ class ChessGUI:
             with open(filepath, 'r') as f:
                 data = json.load(f)
             
-            self.game = ChessBoard.from_dict(data['board'])
+            if 'game' in data:
+                # Yeni biçim: hamleler yeniden oynanır, geri alma/ileri alma geçmişi korunur
+                self.game = ChessBoard.from_history_dict(data['game'])
+                self.start_captured_white = [ChessPiece('white', symbol) for symbol in data.get('start_captured_white', [])]
+                self.start_captured_black = [ChessPiece('black', symbol) for symbol in data.get('start_captured_black', [])]
+            else:
+                # Eski biçim: yalnızca son pozisyon ve yenen taşlar var
+                self.game = ChessBoard.from_dict(data['board'])
+                self.start_captured_white = [ChessPiece('white', symbol) for symbol in data['captured_white']]
+                self.start_captured_black = [ChessPiece('black', symbol) for symbol in data['captured_black']]
             self.white_player = data['white_player']
             self.black_player = data['black_player']
+            self.ai_color = data.get('ai_color')
             
             # Yenen taşları yükle
-            self.captured_white = [ChessPiece('white', symbol) for symbol in data['captured_white']]
-            self.captured_black = [ChessPiece('black', symbol) for symbol in data['captured_black']]
+            self.update_captured_pieces()
             
             return True
         except Exception as e:
@@ -314,7 +468,7 @@ class ChessGUI:
                 color = self.BUTTON_COLOR
             
             pygame.draw.rect(self.screen, color, button)
-            text_surface = self.font.render(text, True, self.TEXT_COLOR)
+            text_surface = self.render_text(text)
             text_rect = text_surface.get_rect(center=button.center)
             self.screen.blit(text_surface, text_rect)
         
@@ -327,7 +481,7 @@ class ChessGUI:
             color = self.BUTTON_HOVER if button.collidepoint(mouse_pos) else self.BUTTON_COLOR
             
             pygame.draw.rect(self.screen, color, button)
-            text_surface = self.font.render(text, True, self.TEXT_COLOR)
+            text_surface = self.render_text(text)
             text_rect = text_surface.get_rect(center=button.center)
             self.screen.blit(text_surface, text_rect)
 
@@ -348,14 +502,19 @@ class ChessGUI:
             save_file = self.show_load_game_menu()
             if save_file:
                 if self.load_game(save_file):
+                    self.on_position_changed()
                     print(f"Oyun yüklendi: {save_file}")
                     return True
         
         elif self.undo_button.collidepoint(pos):
             success, message = self.game.undo_move()
+            # Bilgisayara karşı oynarken oyuncunun son hamlesine kadar geri al
+            if success and self.game.current_turn == self.ai_color:
+                self.game.undo_move()
             if success:
                 # Yenen taşları da güncelle
                 self.update_captured_pieces()
+                self.on_position_changed()
             print(message)
             return True
         
@@ -364,6 +523,7 @@ class ChessGUI:
             if success:
                 # Yenen taşları da güncelle
                 self.update_captured_pieces()
+                self.on_position_changed()
             print(message)
             return True
         
@@ -371,16 +531,18 @@ class ChessGUI:
 
     def show_dialog(self, message, options=["Evet", "Hayır"]):
         """Dialog penceresi göster"""
-        dialog_width = 400
-        dialog_height = 150
-        dialog_x = (self.WINDOW_SIZE[0] - dialog_width) // 2
-        dialog_y = (self.WINDOW_SIZE[1] - dialog_height) // 2
-        
         # Dialog butonları
         button_width = 100
         button_height = 40
         button_spacing = 20
         total_buttons_width = len(options) * button_width + (len(options) - 1) * button_spacing
+
+        # Butonlar sığmazsa dialog genişletilir
+        dialog_width = max(400, total_buttons_width + 40)
+        dialog_height = 150
+        dialog_x = (self.WINDOW_SIZE[0] - dialog_width) // 2
+        dialog_y = (self.WINDOW_SIZE[1] - dialog_height) // 2
+        
         first_button_x = dialog_x + (dialog_width - total_buttons_width) // 2
         
         buttons = []
@@ -390,7 +552,8 @@ class ChessGUI:
             buttons.append((pygame.Rect(x, y, button_width, button_height), text))
         
         while True:
-            for event in pygame.event.get():
+            # Motor sonuçları kuyrukta kalır; diyalog kapanınca ana döngü işler
+            for event in pygame.event.get(exclude=ENGINE_EVENT):
                 if event.type == pygame.MOUSEBUTTONDOWN:
                     for button, text in buttons:
                         if button.collidepoint(event.pos):
@@ -419,9 +582,11 @@ class ChessGUI:
 
     def show_load_game_menu(self):
         """Kayıtlı oyunları listele ve seçim yap"""
-        # Tüm .json dosyalarını al (sadece chess_save_ ile başlayanları değil)
-        saves = sorted([f for f in os.listdir(self.saves_dir) if f.endswith('.json')], reverse=True)
-        if not saves:
+        # Dizin menü açılırken bir kez klasörle eşitlenir; menü yalnızca dizini sorgular
+        self.catalog.sync()
+        player_filter = ""
+        total = self.catalog.count()
+        if not total:
             return None
         
         menu_width = 600
@@ -434,28 +599,47 @@ class ChessGUI:
         content_width = menu_width - scroll_bar_width - 40  # 40 piksel padding
         
         button_height = 50
-        visible_items = min(6, len(saves))
+        max_visible_items = 6
         scroll_position = 0
-        
-        # Scroll bar hesaplamaları
-        total_height = len(saves) * button_height
-        visible_height = visible_items * button_height
-        scroll_ratio = visible_height / total_height if total_height > visible_height else 1
-        scroll_bar_height = max(50, visible_height * scroll_ratio)
+        page = None          # Görünen satırlar (yalnızca kaydırma veya filtre değişince sorgulanır)
+        page_key = None
         
         while True:
-            for event in pygame.event.get():
+            visible_items = min(max_visible_items, total)
+            visible_height = visible_items * button_height
+            
+            # Scroll bar hesaplamaları
+            total_height = total * button_height
+            scroll_ratio = visible_height / total_height if total_height > visible_height else 1
+            scroll_bar_height = max(50, visible_height * scroll_ratio)
+            
+            # Motor sonuçları kuyrukta kalır; diyalog kapanınca ana döngü işler
+            for event in pygame.event.get(exclude=ENGINE_EVENT):
                 if event.type == pygame.QUIT:
                     return None
                 
-                if event.type == pygame.MOUSEBUTTONDOWN:
+                if event.type == pygame.KEYDOWN:
+                    # Yazılan metin oyuncu adına göre filtreler
+                    if event.key == pygame.K_ESCAPE:
+                        return None
+                    if event.key == pygame.K_BACKSPACE:
+                        player_filter = player_filter[:-1]
+                    elif event.unicode and event.unicode.isprintable():
+                        player_filter += event.unicode
+                    else:
+                        continue
+                    total = self.catalog.count(player_filter)
+                    scroll_position = 0
+                    visible_items = min(max_visible_items, total)
+                
+                elif event.type == pygame.MOUSEBUTTONDOWN:
                     mouse_pos = pygame.mouse.get_pos()
                     
                     # macOS touchpad scroll işlemi için
                     if event.button in [4, 5]:  # 4: yukarı scroll, 5: aşağı scroll
                         direction = -1 if event.button == 4 else 1
                         scroll_position = max(0, min(scroll_position + direction, 
-                                                  len(saves) - visible_items))
+                                                  total - visible_items))
                         continue
                     
                     # Geri dön butonu
@@ -473,26 +657,36 @@ class ChessGUI:
                     if scroll_bar_rect.collidepoint(mouse_pos):
                         # Scroll bar'a tıklandığında pozisyonu güncelle
                         relative_y = (mouse_pos[1] - (menu_y + 70)) / visible_height
-                        scroll_position = int(relative_y * (len(saves) - visible_items))
-                        scroll_position = max(0, min(scroll_position, len(saves) - visible_items))
+                        scroll_position = int(relative_y * (total - visible_items))
+                        scroll_position = max(0, min(scroll_position, total - visible_items))
                     
                     # Kayıtlı oyunlar
-                    for i in range(visible_items):
-                        idx = scroll_position + i
-                        if idx >= len(saves):
-                            break
-                        
-                        button = pygame.Rect(menu_x + 20, 
-                                           menu_y + 70 + i * button_height, 
-                                           content_width,
-                                           button_height - 5)
-                        if button.collidepoint(mouse_pos):
-                            return saves[idx]
+                    if page is not None:
+                        for i, (filename, _) in enumerate(page):
+                            button = pygame.Rect(menu_x + 20, 
+                                               menu_y + 70 + i * button_height, 
+                                               content_width,
+                                               button_height - 5)
+                            if button.collidepoint(mouse_pos):
+                                return filename
                 
                 # Mouse tekerleği için scroll işlemi
                 elif event.type == pygame.MOUSEWHEEL:
                     scroll_position = max(0, min(scroll_position - event.y * 2,  # Scroll hızını artırmak için 2 ile çarptık
-                                              len(saves) - visible_items))
+                                              total - visible_items))
+            
+            # Görünen sayfayı yalnızca kaydırma konumu veya filtre değiştiğinde sorgula ve yazıları hazırla
+            if page_key != (scroll_position, player_filter, total):
+                page = []
+                for row in self.catalog.query(offset=scroll_position, limit=visible_items, player=player_filter):
+                    if row['date'] is not None:
+                        white = row['white_player'] or 'Beyaz'
+                        black = row['black_player'] or 'Siyah'
+                        text = f"{row['date']} - {white} vs {black}"
+                    else:
+                        text = row['filename']
+                    page.append((row['filename'], self.font.render(text, True, self.TEXT_COLOR)))
+                page_key = (scroll_position, player_filter, total)
             
             # Menü arkaplanı
             pygame.draw.rect(self.screen, self.SIDEBAR_COLOR, 
@@ -500,8 +694,9 @@ class ChessGUI:
             pygame.draw.rect(self.screen, self.TEXT_COLOR, 
                             (menu_x, menu_y, menu_width, menu_height), 2)
             
-            # Başlık
-            title = self.font.render("Kayıtlı Oyunlar", True, self.TEXT_COLOR)
+            # Başlık (filtre varsa gösterilir)
+            title_text = f"Kayıtlı Oyunlar - Oyuncu: {player_filter}" if player_filter else "Kayıtlı Oyunlar"
+            title = self.font.render(title_text, True, self.TEXT_COLOR)
             title_rect = title.get_rect(center=(menu_x + menu_width//2, menu_y + 30))
             self.screen.blit(title, title_rect)
             
@@ -513,7 +708,7 @@ class ChessGUI:
                              visible_height))
             
             # Scroll bar
-            scroll_pos = menu_y + 70 + (visible_height - scroll_bar_height) * (scroll_position / (len(saves) - visible_items)) if len(saves) > visible_items else menu_y + 70
+            scroll_pos = menu_y + 70 + (visible_height - scroll_bar_height) * (scroll_position / (total - visible_items)) if total > visible_items else menu_y + 70
             pygame.draw.rect(self.screen, self.TEXT_COLOR,
                             (menu_x + menu_width - scroll_bar_width - 10,
                              scroll_pos,
@@ -521,30 +716,13 @@ class ChessGUI:
                              scroll_bar_height))
             
             # Kayıtlı oyunları listele
-            for i in range(visible_items):
-                idx = scroll_position + i
-                if idx >= len(saves):
-                    break
-                
-                save_file = saves[idx]
-                try:
-                    filepath = os.path.join(self.saves_dir, save_file)
-                    with open(filepath, 'r') as f:
-                        data = json.load(f)
-                        date = data.get('date', 'Tarih bilinmiyor')
-                        white = data.get('white_player', 'Beyaz')
-                        black = data.get('black_player', 'Siyah')
-                        text = f"{date} - {white} vs {black}"
-                except:
-                    text = save_file
-                
+            for i, (_, text_surface) in enumerate(page):
                 button = pygame.Rect(menu_x + 20, 
                                    menu_y + 70 + i * button_height, 
                                    content_width,
                                    button_height - 5)
                 pygame.draw.rect(self.screen, self.BUTTON_COLOR, button)
                 
-                text_surface = self.font.render(text, True, self.TEXT_COLOR)
                 text_rect = text_surface.get_rect(midleft=(button.left + 10, button.centery))
                 self.screen.blit(text_surface, text_rect)
             
@@ -557,40 +735,80 @@ class ChessGUI:
             
             pygame.display.flip()
 
+    def play_move(self, from_pos, to_pos, promotion=None):
+        """Hamleyi yap ve yenen taşı kaydet"""
+        success, message = self.game.make_move(from_pos, to_pos, promotion)
+        if success:
+            # Geçerken almada yenen taş hedef karede olmadığı için geri alma yığınından okunur
+            target = self.game.last_captured_piece()
+            if target:
+                if target.color == 'white':
+                    self.captured_white.append(target)
+                else:
+                    self.captured_black.append(target)
+            self.on_position_changed()
+        print(message)
+        return success
+
+    def ask_promotion(self):
+        """Terfi edecek taşı oyuncuya sor"""
+        choices = {"Vezir": QUEEN, "Kale": ROOK, "Fil": BISHOP, "At": KNIGHT}
+        choice = self.show_dialog("Piyon hangi taşa terfi etsin?", list(choices))
+        self.full_redraw = True
+        return choices[choice]
+
+    def post_engine_result(self, kind, request_id, result):
+        """İşçi iş parçacığından çağrılır: sonucu olay kuyruğuna bırak"""
+        pygame.event.post(pygame.event.Event(ENGINE_EVENT, kind=kind,
+                                             request_id=request_id, result=result))
+
+    def on_position_changed(self):
+        """Pozisyon değişince eski motor isteklerini iptal et ve yenilerini başlat"""
+        self.worker.cancel()
+        self.hint_move = None
+        if self.game.current_turn == self.ai_color:
+            self.worker.request_move(self.game, time_ms=self.AI_TIME_MS)
+
+    def handle_engine_event(self, event):
+        """Arka plan işçisinden gelen sonucu uygula"""
+        if not self.worker.is_current(event.request_id):
+            return
+        if event.kind == 'hint':
+            self.hint_move = event.result
+        elif event.kind == 'move' and event.result and self.game.current_turn == self.ai_color:
+            self.play_move(*event.result)
+
     def update_captured_pieces(self):
         """Yenen taşları hamle geçmişine göre güncelle"""
-        self.captured_white = []
-        self.captured_black = []
+        self.captured_white = list(self.start_captured_white)
+        self.captured_black = list(self.start_captured_black)
         
-        for i in range(self.game.current_move + 1):
-            _, _, captured_piece = self.game.move_history[i]
+        for captured_piece in self.game.captured_pieces():
             if captured_piece:
                 if captured_piece.color == 'white':
                     self.captured_white.append(captured_piece)
                 else:
                     self.captured_black.append(captured_piece)
 
-    def show_checkmate_dialog(self, winner):
-        """Şah mat durumunda kazananı gösteren dialog"""
+    def show_game_over_dialog(self, title, message):
+        """Oyun bittiğinde başlığı (ŞAH MAT!, BERABERE!) ve sonucu gösteren dialog"""
         dialog_width = 400
         dialog_height = 200
         dialog_x = (self.WINDOW_SIZE[0] - dialog_width) // 2
         dialog_y = (self.WINDOW_SIZE[1] - dialog_height) // 2
         
-        winner_name = self.white_player if winner == 'white' else self.black_player
-        message = f"ŞAH MAT! {winner_name} kazandı!"
-        
         button_width = 150
         button_height = 40
         button = pygame.Rect(dialog_x + (dialog_width - button_width) // 2,
                             dialog_y + dialog_height - button_height - 20,
                             button_width, button_height)
         
-        # Kazananı daha büyük fontla göster
+        # Başlığı daha büyük fontla göster
         big_font = pygame.font.SysFont('Arial', 32, bold=True)
         
         while True:
-            for event in pygame.event.get():
+            # Motor sonuçları kuyrukta kalır; diyalog kapanınca ana döngü işler
+            for event in pygame.event.get(exclude=ENGINE_EVENT):
                 if event.type == pygame.QUIT:
                     return
                 
@@ -604,17 +822,17 @@ class ChessGUI:
             pygame.draw.rect(self.screen, self.TEXT_COLOR, 
                             (dialog_x, dialog_y, dialog_width, dialog_height), 2)
             
-            # Şah Mat mesajı
-            text_surface = big_font.render("ŞAH MAT!", True, self.TEXT_COLOR)
+            # Başlık
+            text_surface = big_font.render(title, True, self.TEXT_COLOR)
             text_rect = text_surface.get_rect(center=(dialog_x + dialog_width//2, 
                                                     dialog_y + 50))
             self.screen.blit(text_surface, text_rect)
             
-            # Kazanan mesajı
-            winner_text = self.font.render(f"{winner_name} kazandı!", True, self.TEXT_COLOR)
-            winner_rect = winner_text.get_rect(center=(dialog_x + dialog_width//2, 
-                                                     dialog_y + 100))
-            self.screen.blit(winner_text, winner_rect)
+            # Sonuç mesajı
+            message_text = self.font.render(message, True, self.TEXT_COLOR)
+            message_rect = message_text.get_rect(center=(dialog_x + dialog_width//2, 
+                                                       dialog_y + 100))
+            self.screen.blit(message_text, message_rect)
             
             # Buton
             pygame.draw.rect(self.screen, self.BUTTON_COLOR, button)
@@ -631,35 +849,53 @@ class ChessGUI:
 
         running = True
         success = False  # success değişkenini başlangıçta tanımla
+        self.on_position_changed()
         while running:
-            # Mevcut durumda şah mat kontrolü yap
-            if self.game.current_turn == 'white':
-                if self.game.is_checkmate('white'):
-                    self.show_checkmate_dialog('black')  # Siyah kazandı
-                    running = False
-                    continue
-            else:
-                if self.game.is_checkmate('black'):
-                    self.show_checkmate_dialog('white')  # Beyaz kazandı
-                    running = False
-                    continue
+            # Mevcut durumda mat ve beraberlik kontrolü yap (durum pozisyon başına bir kez hesaplanır)
+            status = self.game.get_game_status()
+            if status['checkmate']:
+                winner_name = self.black_player if self.game.current_turn == 'white' else self.white_player
+                self.show_game_over_dialog("ŞAH MAT!", f"{winner_name} kazandı!")
+                running = False
+                continue
+            if status['draw']:
+                self.show_game_over_dialog("BERABERE!", self.DRAW_REASONS[status['draw']])
+                running = False
+                continue
 
-            for event in pygame.event.get():
+            events = pygame.event.get()
+            for event in events:
                 if event.type == pygame.QUIT:
                     running = False
                 
+                elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                    self.full_redraw = True
+                
+                elif event.type == ENGINE_EVENT:
+                    self.handle_engine_event(event)
+                
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_h:
+                    # H tuşu: sırası gelen taraf için ipucu hamlesi iste
+                    if self.game.current_turn != self.ai_color:
+                        self.worker.request_hint(self.game, time_ms=self.HINT_TIME_MS)
+                
                 elif event.type == pygame.MOUSEBUTTONDOWN:
                     pos = pygame.mouse.get_pos()
                     
                     # Önce buton tıklamalarını kontrol et
                     button_result = self.handle_button_click(pos)
                     if button_result is not None:
+                        # Buton diyalog açmış olabilir, ekranı tamamen yenile
+                        self.full_redraw = True
                         if not button_result:
                             running = False
                         continue
                     
                     # Tahta tıklamalarını işle
                     board_pos = self.get_square_from_mouse(pos)
+                    # Bilgisayar düşünürken tahta tıklamaları yok sayılır
+                    if self.game.current_turn == self.ai_color:
+                        continue
                     if board_pos[0] < 8 and board_pos[1] < 8:
                         success = False  # Her hamle denemesinde success'i sıfırla
                         if self.selected_piece is None:
@@ -667,20 +903,15 @@ class ChessGUI:
                             if piece and piece.color == self.game.current_turn:
                                 self.selected_piece = piece
                                 self.selected_pos = board_pos
-                                # Olası hamleleri hesapla
-                                self.possible_moves = self.game.get_valid_moves(board_pos)
+                                # Olası hamleler önbellekteki yasal hamle listesinden okunur
+                                self.possible_moves = self.game.get_game_status()['legal_moves'].get(board_pos, [])
                         else:
                             # Hamle yap
                             if board_pos in self.possible_moves:  # Sadece geçerli hamlelere izin ver
-                                target = self.game.board[board_pos[0]][board_pos[1]]
-                                if target and target.color != self.selected_piece.color:
-                                    if target.color == 'white':
-                                        self.captured_white.append(target)
-                                    else:
-                                        self.captured_black.append(target)
-                                
-                                success, message = self.game.make_move(self.selected_pos, board_pos)
-                                print(message)
+                                promotion = None
+                                if self.selected_piece.symbol in ('♙', '♟') and board_pos[0] in (0, 7):
+                                    promotion = self.ask_promotion()
+                                success = self.play_move(self.selected_pos, board_pos, promotion)
                             
                             # Seçimi ve olası hamleleri temizle
                             self.selected_piece = None
@@ -690,16 +921,20 @@ class ChessGUI:
                         # Hamle yapıldıktan sonra şah mat kontrolünü kaldır
                         # (Çünkü her döngü başında kontrol ediyoruz)
 
-            # Ekranı güncelle
-            self.draw_board()
-            self.draw_pieces()
-            self.draw_captured_pieces()
-            self.draw_player_info()
-            self.draw_buttons()
-            pygame.display.flip()
+            # Ekranı yalnızca bir olay geldiyse güncelle; boşta kareler atlanır
+            if events or self.full_redraw:
+                self.render()
+            self.clock.tick(self.FPS)
 
+        self.worker.shutdown()
+        if self.book is not None:
+            self.book.close()
         pygame.quit()
 
 if __name__ == "__main__":
-    gui = ChessGUI()
+    import argparse
+    parser = argparse.ArgumentParser(description="Satranç")
+    parser.add_argument('--fps', type=int, default=60, help="saniyedeki en fazla kare sayısı")
+    args = parser.parse_args()
+    gui = ChessGUI(fps=args.fps)
     gui.run() 
\ No newline at end of file
@@ -0,0 +1,451 @@
+"""PGN okuma/yazma.
+
+read_pgn() çok büyük PGN dosyalarını satır satır okur ve oyunları tek tek
+üretir (generator); bellekte yalnızca o an okunan oyun tutulur. Her hamle
+okunurken ChessBoard üzerinde oynanarak doğrulanır. write_pgn() ve
+game_to_pgn() oyunları PGN olarak dışa aktarır.
+
+Komut satırı:
+    python chess_pgn.py check oyunlar.pgn       # dosyadaki oyunları doğrula
+    python chess_pgn.py export saves/*.json     # kayıtlı oyunları PGN'e çevir
+"""
+import argparse
+import json
+import re
+import sys
+
+from chess_game import (
+    ChessBoard, COLOR_OFFSET, KING, PAWN, QUEEN, decode_move, encode_move, mask_to_squares
+)
+
+FILES = 'abcdefgh'
+PIECE_LETTERS = ' NBRQK'  # Taş türü indeksine göre SAN harfi (piyonun harfi yok)
+RESULTS = ('1-0', '0-1', '1/2-1/2', '*')
+SEVEN_TAG_ROSTER = ('Event', 'Site', 'Date', 'Round', 'White', 'Black', 'Result')
+
+HEADER_RE = re.compile(r'\[\s*(\w+)\s+"((?:[^"\\]|\\.)*)"\s*\]')
+SAN_RE = re.compile(r'^([NBRQK])?([a-h])?([1-8])?(x)?([a-h][1-8])(=[NBRQ])?[+#]?[!?]*$')
+MOVE_NUMBER_RE = re.compile(r'^\d+\.+')
+UNESCAPE_RE = re.compile(r'\\(.)')
+
+
+class PGNError(ValueError):
+    """PGN metni okunamadığında veya hamle geçersiz olduğunda yükseltilir"""
+
+    def __init__(self, message, line_number=None):
+        if line_number is not None:
+            message = f"{line_number}. satır: {message}"
+        super().__init__(message)
+        self.line_number = line_number
+
+
+def square_name(pos):
+    """(satır, sütun) konumunu 'e4' biçimine çevir"""
+    return f"{FILES[pos[1]]}{8 - pos[0]}"
+
+
+def parse_square(name):
+    """'e4' biçimindeki kare adını (satır, sütun) konumuna çevir"""
+    return 8 - int(name[1]), FILES.index(name[0])
+
+
+def move_to_san(game, from_pos, to_pos, promotion=None):
+    """Sırası gelen tarafın yasal hamlesini SAN gösterimine çevir (örn. 'Nbd7', 'exd5', 'O-O', 'e8=Q', 'Qh4#')"""
+    legal_moves = game.get_game_status()['legal_moves']
+    if to_pos not in legal_moves.get(from_pos, ()):
+        raise PGNError(f"Yasal olmayan hamle: {square_name(from_pos)}{square_name(to_pos)}")
+
+    piece = game.board[from_pos[0]][from_pos[1]]
+    piece_type = piece.index % 6
+    capture = game.board[to_pos[0]][to_pos[1]] is not None
+
+    if piece_type == KING and abs(to_pos[1] - from_pos[1]) == 2:
+        san = 'O-O' if to_pos[1] == 6 else 'O-O-O'
+    elif piece_type == PAWN:
+        # Çapraz piyon hamlesi her zaman alımdır (geçerken almada hedef kare boştur)
+        san = f"{FILES[from_pos[1]]}x{square_name(to_pos)}" if from_pos[1] != to_pos[1] else square_name(to_pos)
+        if to_pos[0] in (0, 7):
+            san += '=' + PIECE_LETTERS[promotion or QUEEN]
+    else:
+        san = PIECE_LETTERS[piece_type]
+        # Aynı kareye gidebilen aynı türden diğer taşlar varsa ayırt edici sütun/satır ekle
+        rivals = [pos for pos, targets in legal_moves.items()
+                  if pos != from_pos and to_pos in targets and game.board[pos[0]][pos[1]].symbol == piece.symbol]
+        if rivals:
+            if all(pos[1] != from_pos[1] for pos in rivals):
+                san += FILES[from_pos[1]]
+            elif all(pos[0] != from_pos[0] for pos in rivals):
+                san += str(8 - from_pos[0])
+            else:
+                san += square_name(from_pos)
+        if capture:
+            san += 'x'
+        san += square_name(to_pos)
+
+    # Şah/mat işareti için hamle geçici olarak yapılır (oyun geçmişine dokunmadan)
+    game.push(encode_move(from_pos, to_pos, promotion or 0))
+    try:
+        status = game.get_game_status()
+        if status['checkmate']:
+            san += '#'
+        elif status['in_check']:
+            san += '+'
+    finally:
+        game.pop()
+    return san
+
+
+def parse_san(game, san):
+    """SAN hamlesini sırası gelen taraf için (from_pos, to_pos, promotion) olarak çöz; geçersizse PGNError"""
+    castling = san.rstrip('+#!?').replace('0', 'O')
+    if castling in ('O-O', 'O-O-O'):
+        # Rok, şahın iki kare yana gitmesi olarak çözülür
+        row = 7 if game.current_turn == 'white' else 0
+        letter, from_file, from_rank, capture, promotion = 'K', 'e', str(8 - row), None, None
+        to_pos = (row, 6 if castling == 'O-O' else 2)
+    else:
+        match = SAN_RE.match(san)
+        if not match:
+            raise PGNError(f"Okunamayan hamle: {san}")
+        letter, from_file, from_rank, capture, target, promotion = match.groups()
+        to_pos = parse_square(target)
+
+    piece_type = PIECE_LETTERS.index(letter) if letter else PAWN
+    if promotion:
+        promotion = PIECE_LETTERS.index(promotion[1])
+        if piece_type != PAWN or to_pos[0] not in (0, 7):
+            raise PGNError(f"Geçersiz terfi: {san}")
+    elif piece_type == PAWN and to_pos[0] in (0, 7):
+        raise PGNError(f"Terfi taşı belirtilmemiş: {san}")
+    to_square = to_pos[0] * 8 + to_pos[1]
+    # Alım işareti hedef kareyle uyuşmalı: 'x' rakip taşa veya geçerken alma karesine, diğerleri boş kareye
+    target_piece = game.board[to_pos[0]][to_pos[1]]
+    if capture:
+        if (target_piece is None or target_piece.color == game.current_turn) and not (
+                piece_type == PAWN and to_square == game.ep_square):
+            raise PGNError(f"Alınacak taş yok: {san}")
+    elif target_piece is not None:
+        raise PGNError(f"Alım işareti eksik: {san}")
+    # Tüm yasal hamleleri üretmek yerine yalnızca bu türden taşların hedef kareye gidip gidemediğine bakılır
+    candidates = []
+    for from_pos in mask_to_squares(game.bitboards[COLOR_OFFSET[game.current_turn] + piece_type]):
+        if from_file and FILES[from_pos[1]] != from_file:
+            continue
+        if from_rank and str(8 - from_pos[0]) != from_rank:
+            continue
+        # Alım olmayan piyon hamlesi kendi sütununda kalır
+        if piece_type == PAWN and not capture and from_pos[1] != to_pos[1]:
+            continue
+        piece = game.board[from_pos[0]][from_pos[1]]
+        if not (game.target_mask(from_pos[0] * 8 + from_pos[1], piece) >> to_square) & 1:
+            continue
+        if game.leaves_king_in_check(from_pos, to_pos):
+            continue
+        candidates.append(from_pos)
+
+    if not candidates:
+        if castling in ('O-O', 'O-O-O'):
+            raise PGNError(f"Rok yapılamaz (rok hakkı yok, arada taş var veya şah tehdit altında): {san}")
+        raise PGNError(f"Yasal olmayan hamle: {san}")
+    if len(candidates) > 1:
+        raise PGNError(f"Belirsiz hamle: {san}")
+    return candidates[0], to_pos, promotion
+
+
+class PGNGame:
+    """read_pgn'in ürettiği oyun: başlıklar, oynanmış ChessBoard ve SAN hamle listesi"""
+
+    def __init__(self, headers, board, moves, result):
+        self.headers = headers
+        self.board = board
+        self.moves = moves
+        self.result = result
+
+
+def tokenize(stream, state):
+    """PGN akışını (satır numarası, tür, değer) parçalarına ayır.
+
+    Türler: 'header', 'move', 'result'. Yorumlar ({...}, ;), varyasyonlar
+    ((...)) ve NAG'ler ($n) atlanır. state['line'] okunan son satırı tutar.
+    """
+    comment = False
+    variation = 0
+    for line_number, line in enumerate(stream, 1):
+        state['line'] = line_number
+        if line.startswith('%'):
+            continue
+        position = 0
+        if not comment and not variation:
+            stripped = line.strip()
+            if stripped.startswith('['):
+                match = HEADER_RE.match(stripped)
+                if not match:
+                    raise PGNError(f"Okunamayan başlık: {stripped}", line_number)
+                yield line_number, 'header', (match.group(1), UNESCAPE_RE.sub(r'\1', match.group(2)))
+                continue
+
+        while position < len(line):
+            if comment:
+                end = line.find('}', position)
+                if end < 0:
+                    break
+                comment = False
+                position = end + 1
+                continue
+
+            char = line[position]
+            if char.isspace():
+                position += 1
+            elif char == '{':
+                comment = True
+                position += 1
+            elif char == ';':
+                break
+            elif char == '(':
+                variation += 1
+                position += 1
+            elif char == ')':
+                variation -= 1
+                position += 1
+            else:
+                end = position
+                while end < len(line) and not line[end].isspace() and line[end] not in '{;()':
+                    end += 1
+                token = line[position:end]
+                position = end
+                if variation:
+                    continue
+                token = MOVE_NUMBER_RE.sub('', token)
+                if not token or token.startswith('$'):
+                    continue
+                yield line_number, 'result' if token in RESULTS else 'move', token
+
+
+def skip_movetext(line, comment, variation):
+    """Satırdaki yorum ({...}, ;) ve varyasyon ((...)) sınırlarını izle; satır sonundaki (comment, variation) durumunu döndür.
+
+    tokenize ile aynı kurallar: '{' yorumu '}' bitirir, ';' satırın geri kalanını
+    yorum yapar, yorum içindeki parantezler sayılmaz.
+    """
+    position = 0
+    while position < len(line):
+        if comment:
+            end = line.find('}', position)
+            if end < 0:
+                break
+            comment = False
+            position = end + 1
+            continue
+        char = line[position]
+        if char == '{':
+            comment = True
+        elif char == ';':
+            break
+        elif char == '(':
+            variation += 1
+        elif char == ')':
+            variation -= 1
+        position += 1
+    return comment, variation
+
+
+def split_games(stream):
+    """PGN akışını hamleleri doğrulamadan (ilk satır numarası, oyun metni) parçalarına böl.
+
+    Oyunları paralel doğrulamak için kullanılır: bölme ucuzdur, doğrulama
+    read_pgn ile her parça için ayrı yapılır. Yeni oyun yalnızca hamlelerden
+    sonra, yorum ve varyasyon dışında gelen başlık satırıyla başlar.
+    """
+    lines = []
+    first_line = 1
+    has_moves = False
+    comment = False
+    variation = 0
+    for line_number, line in enumerate(stream, 1):
+        top_level = not comment and not variation
+        is_header = top_level and line.lstrip().startswith('[')
+        if is_header and has_moves:
+            yield first_line, ''.join(lines)
+            lines = []
+            has_moves = False
+        if not lines:
+            first_line = line_number
+        if not is_header and not line.startswith('%'):
+            if line.strip():
+                has_moves = True
+            comment, variation = skip_movetext(line, comment, variation)
+        lines.append(line)
+    if any(line.strip() for line in lines):
+        yield first_line, ''.join(lines)
+
+
+def read_pgn(stream, skip_invalid=False):
+    """Metin akışındaki PGN oyunlarını tek tek PGNGame olarak üret.
+
+    Hamleler okunurken tahtada oynanır; geçersiz hamlede PGNError yükseltilir.
+    skip_invalid=True ise geçersiz oyunlar atlanır ve okuma bir sonraki
+    oyundan devam eder.
+    """
+    state = {'line': 0}
+    headers = {}
+    board = None
+    moves = []
+    failed = False
+
+    def new_board(headers):
+        if headers.get('SetUp') == '1' and 'FEN' in headers:
+            try:
+                return ChessBoard.from_fen(headers['FEN'])
+            except ValueError as e:
+                raise PGNError(str(e), state['line'])
+        return ChessBoard()
+
+    for line_number, kind, value in tokenize(stream, state):
+        if kind == 'header':
+            if moves or board is not None:
+                # Sonuç işareti olmadan biten oyun
+                if not failed:
+                    yield PGNGame(headers, board or new_board(headers), moves, headers.get('Result', '*'))
+                headers, board, moves, failed = {}, None, [], False
+            headers[value[0]] = value[1]
+        elif kind == 'move':
+            if failed:
+                continue
+            try:
+                if board is None:
+                    board = new_board(headers)
+                from_pos, to_pos, promotion = parse_san(board, value)
+                success, message = board.make_move(from_pos, to_pos, promotion)
+                if not success:
+                    raise PGNError(f"{value}: {message}")
+            except PGNError as e:
+                if not skip_invalid:
+                    raise PGNError(str(e), line_number) from None
+                failed = True
+                continue
+            moves.append(value)
+        else:
+            if not failed:
+                yield PGNGame(headers, board or new_board(headers), moves, value)
+            headers, board, moves, failed = {}, None, [], False
+
+    if (headers or moves) and not failed:
+        yield PGNGame(headers, board or new_board(headers), moves, headers.get('Result', '*'))
+
+
+def game_to_pgn(game, headers=None):
+    """ChessBoard'daki oyunu (mevcut hamleye kadar) PGN metni olarak döndür"""
+    headers = dict(headers or {})
+    result = headers.get('Result') or game.get_result()
+    tags = {'Event': '?', 'Site': '?', 'Date': '????.??.??', 'Round': '?', 'White': '?', 'Black': '?'}
+    tags.update(headers)
+    tags['Result'] = result
+
+    # Hamleler başlangıç pozisyonundan yeniden oynanarak SAN'a çevrilir
+    if isinstance(game.initial_state, str):
+        board = ChessBoard.from_fen(game.initial_state)
+        tags['SetUp'] = '1'
+        tags['FEN'] = board.to_fen()
+    elif game.initial_state is not None:
+        if isinstance(game.initial_state, bytes):
+            board = ChessBoard.from_snapshot(game.initial_state)
+        else:
+            board = ChessBoard.from_dict(game.initial_state)
+        board.start_ply = game.start_ply
+        tags['SetUp'] = '1'
+        tags['FEN'] = board.to_fen()
+    else:
+        board = ChessBoard()
+
+    def tag(name, value):
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"')
+        return f'[{name} "{value}"]'
+
+    lines = [tag(name, tags[name]) for name in SEVEN_TAG_ROSTER]
+    lines += [tag(name, value) for name, value in tags.items() if name not in SEVEN_TAG_ROSTER]
+    lines.append('')
+
+    tokens = []
+    for ply, move in enumerate(game.move_history[:game.current_move + 1], board.start_ply):
+        if ply % 2 == 0:
+            tokens.append(f"{ply // 2 + 1}.")
+        elif not tokens:
+            tokens.append(f"{ply // 2 + 1}...")
+        from_pos, to_pos, promotion = decode_move(move)
+        tokens.append(move_to_san(board, from_pos, to_pos, promotion))
+        board.push(move)
+    tokens.append(result)
+
+    # Hamle metni 80 karakterde satırlara bölünür
+    line = ''
+    for token in tokens:
+        if line and len(line) + 1 + len(token) > 80:
+            lines.append(line)
+            line = token
+        else:
+            line = f"{line} {token}" if line else token
+    lines.append(line)
+    return '\n'.join(lines) + '\n'
+
+
+def write_pgn(stream, game, headers=None):
+    """Oyunu PGN olarak akışa yaz (birden çok oyun arka arkaya yazılabilir)"""
+    stream.write(game_to_pgn(game, headers))
+    stream.write('\n')
+
+
+def load_saved_game(path):
+    """saves/ klasöründeki JSON kaydını (ChessBoard, PGN başlıkları) olarak yükle"""
+    with open(path, 'r') as f:
+        data = json.load(f)
+    if 'game' in data:
+        game = ChessBoard.from_history_dict(data['game'])
+    else:
+        game = ChessBoard.from_dict(data['board'])
+    headers = {
+        'Event': 'Chess Game',
+        'White': data.get('white_player') or '?',
+        'Black': data.get('black_player') or '?',
+    }
+    if data.get('date'):
+        headers['Date'] = data['date'][:10].replace('-', '.')
+    return game, headers
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PGN doğrulama ve dışa aktarma")
+    commands = parser.add_subparsers(dest='command', required=True)
+    check = commands.add_parser('check', help="PGN dosyasındaki oyunları doğrula")
+    check.add_argument('path')
+    check.add_argument('--skip-invalid', action='store_true', help="geçersiz oyunları atla")
+    export = commands.add_parser('export', help="kayıtlı oyunları PGN olarak yaz")
+    export.add_argument('saves', nargs='+')
+    export.add_argument('--output', help="çıktı dosyası (varsayılan: standart çıktı)")
+    args = parser.parse_args()
+
+    if args.command == 'check':
+        games = moves = 0
+        with open(args.path, 'r', encoding='utf-8', errors='replace') as f:
+            try:
+                for game in read_pgn(f, skip_invalid=args.skip_invalid):
+                    games += 1
+                    moves += len(game.moves)
+            except PGNError as e:
+                print(f"Hata: {e}", file=sys.stderr)
+                return 1
+        print(f"{games} oyun, {moves} hamle")
+        return 0
+
+    output = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    try:
+        for path in args.saves:
+            game, headers = load_saved_game(path)
+            write_pgn(output, game, headers)
+    finally:
+        if args.output:
+            output.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,149 @@
+"""Pencere açmadan tahta görüntüsü (PNG) oluşturma.
+
+Kayıt listesindeki küçük resimler ve paylaşım için pozisyonları PNG'ye
+çizer. pygame yerine Pillow kullanılır; bu nedenle sunucuda ekran ve SDL
+gerekmez. Taş görüntüleri (pieces/) iki zemin rengi üzerinde bir kez,
+istenen kare boyutunda ve ortak bir paletle hazırlanır; her çizim yalnızca
+hazır kareleri boş tahtanın kopyasına yapıştırır. Üretilen PNG'ler taş
+yerleşimine göre LRU önbelleğinde tutulur; aynı pozisyon yeniden
+istendiğinde kodlama yapılmaz.
+
+Komut satırı:
+    python chess_render.py "rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq - 0 1" -o tahta.png
+    python chess_render.py --save saves/oyun.json --size 32 --flip -o kucuk.png
+"""
+import argparse
+import collections
+import io
+import os
+import sys
+
+from PIL import Image
+
+from chess_game import PIECES, SNAPSHOT_CODES, SNAPSHOT_SIZE, ChessBoard
+
+# ChessGUI ile aynı kare renkleri ve taş dosyaları
+LIGHT_SQUARE = (240, 217, 181)
+DARK_SQUARE = (181, 136, 99)
+PIECE_FILES = {
+    '♔': 'wK', '♕': 'wQ', '♖': 'wR', '♗': 'wB', '♘': 'wN', '♙': 'wP',
+    '♚': 'bK', '♛': 'bQ', '♜': 'bR', '♝': 'bB', '♞': 'bN', '♟': 'bP'
+}
+PIECES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'pieces')
+DEFAULT_CACHE_SIZE = 4096
+# zlib sıkıştırma düzeyi: paletli tahta resimlerinde 1 ile 6 arasındaki boyut farkı azdır, hız farkı büyüktür
+PNG_COMPRESS_LEVEL = 1
+
+
+def placement_of(source):
+    """ChessBoard'dan veya snapshot baytlarından 64 baytlık taş yerleşimi (önbellek anahtarı)"""
+    if isinstance(source, ChessBoard):
+        return source.snapshot()[:64]
+    if len(source) not in (64, SNAPSHOT_SIZE):
+        raise ValueError(f"Geçersiz yerleşim uzunluğu: {len(source)}")
+    return bytes(source[:64])
+
+
+class BoardRenderer:
+    """Tahta pozisyonlarını PNG'ye çizen, sprite ve görüntü önbellekli çizici"""
+
+    def __init__(self, square_size=80, pieces_dir=PIECES_DIR, cache_size=DEFAULT_CACHE_SIZE,
+                 compress_level=PNG_COMPRESS_LEVEL):
+        self.square_size = square_size
+        self.cache_size = cache_size
+        self.compress_level = compress_level
+        self.cache = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+        # Her taş (ve boş kare) iki zemin rengi üzerinde bir kez çizilir; tüm kareler
+        # tek bir paletle 256 renge indirilir. Paletli PNG hem çok daha hızlı
+        # kodlanır hem de küçük olur; çizimde yalnızca hazır kareler kopyalanır.
+        codes = len(PIECES) + 1
+        strip = Image.new('RGB', (2 * codes * square_size, square_size))
+        for piece in (None,) + PIECES:
+            sprite = None
+            if piece is not None:
+                path = os.path.join(pieces_dir, f'{PIECE_FILES[piece.symbol]}.png')
+                with Image.open(path) as image:
+                    sprite = image.convert('RGBA').resize((square_size, square_size), Image.LANCZOS)
+            code = SNAPSHOT_CODES[piece]
+            for shade, color in enumerate((LIGHT_SQUARE, DARK_SQUARE)):
+                tile = Image.new('RGB', (square_size, square_size), color)
+                if sprite is not None:
+                    tile.paste(sprite, (0, 0), sprite)
+                strip.paste(tile, ((2 * code + shade) * square_size, 0))
+        strip = strip.quantize(256, dither=Image.Dither.NONE)
+
+        # tiles[zemin][snapshot kodu]: kare boyutunda paletli kare görüntüsü
+        self.tiles = [[strip.crop(((2 * code + shade) * square_size, 0, (2 * code + shade + 1) * square_size,
+                                   square_size)) for code in range(codes)] for shade in range(2)]
+        self.background = Image.new('P', (8 * square_size, 8 * square_size))
+        self.background.putpalette(strip.getpalette())
+        for square in range(64):
+            self.background.paste(self.tiles[self.shade(square)][0], self.origin(square))
+
+    def shade(self, square):
+        """Karenin zemini: 0 açık, 1 koyu (tahta çevrilince değişmez)"""
+        return ((square >> 3) + square) & 1
+
+    def origin(self, square):
+        return ((square & 7) * self.square_size, (square >> 3) * self.square_size)
+
+    def draw(self, placement, flipped=False):
+        """Yerleşimi paletli PIL görüntüsü olarak çiz (önbelleğe bakmaz)"""
+        image = self.background.copy()
+        for square, code in enumerate(placement):
+            if code:
+                image.paste(self.tiles[self.shade(square)][code], self.origin(63 - square if flipped else square))
+        return image
+
+    def render(self, source, flipped=False):
+        """Pozisyonun PNG baytları; source ChessBoard, snapshot veya 64 baytlık yerleşim olabilir"""
+        key = (placement_of(source), flipped)
+        data = self.cache.get(key)
+        if data is not None:
+            self.hits += 1
+            self.cache.move_to_end(key)
+            return data
+
+        self.misses += 1
+        output = io.BytesIO()
+        self.draw(key[0], flipped).save(output, 'PNG', compress_level=self.compress_level)
+        data = output.getvalue()
+        self.cache[key] = data
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return data
+
+    def clear_cache(self):
+        self.cache.clear()
+        self.hits = self.misses = 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tahta pozisyonunu PNG olarak kaydet")
+    parser.add_argument('fen', nargs='?', help="FEN (varsayılan: başlangıç pozisyonu)")
+    parser.add_argument('--save', help="son pozisyonu çizilecek kayıt dosyası (saves/*.json)")
+    parser.add_argument('-o', '--output', default='board.png')
+    parser.add_argument('--size', type=int, default=80, help="kare boyutu (piksel)")
+    parser.add_argument('--flip', action='store_true', help="tahtayı siyahın tarafından göster")
+    args = parser.parse_args()
+
+    if args.save:
+        from chess_pgn import load_saved_game
+        game, _ = load_saved_game(args.save)
+    elif args.fen:
+        game = ChessBoard.from_fen(args.fen)
+    else:
+        game = ChessBoard()
+
+    renderer = BoardRenderer(square_size=args.size)
+    with open(args.output, 'wb') as f:
+        f.write(renderer.render(game, flipped=args.flip))
+    print(f"{args.output}: {8 * args.size}x{8 * args.size}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
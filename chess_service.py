@@ -0,0 +1,314 @@
+"""Yerel analiz servisi.
+
+ChessBoard motorunu uzun ömürlü bir asyncio servisi olarak çalıştırır;
+istemciler (web arayüzü, botlar) her sorgu için yeni bir Python süreci
+başlatmak yerine tek bir bağlantı üzerinden ardışık istek gönderir.
+
+Protokol: satır başına bir JSON nesnesi (UTF-8). İstek alanları:
+    id        - yanıtta aynen döner; istekler sıralı beklenmeden (pipelined)
+                gönderilebilir, yanıtlar tamamlanma sırasıyla gelir
+    op        - 'ping', 'legal_moves', 'status', 'evaluate' veya 'best_move'
+    fen       - pozisyon (FEN) ya da
+    snapshot  - ChessBoard.snapshot() baytlarının base64 metni
+    moves     - isteğe bağlı, pozisyondan sonra oynanacak hamleler ('e2e4', 'e7e8n')
+    time_ms, max_depth - best_move için arama sınırları (en fazla 30 sn ve 64 derinlik)
+    session   - isteğe bağlı; aynı oturumun aramaları aynı işçiye gider ve
+                o işçinin transpozisyon tablosunu sıcak kullanır
+Yanıt: {"id": ..., "ok": true, "result": ...} ya da {"id": ..., "ok": false, "error": "..."}
+
+Aramalar ayrı süreçlerde çalışan işçilerde yapılır; her işçinin ChessAI
+nesnesi (ve transpozisyon tablosu) istekler arasında korunur.
+
+Kullanım:
+    python chess_service.py --port 8765 --workers 4
+    python chess_service.py --unix /tmp/chess.sock --book book.bin
+"""
+import argparse
+import asyncio
+import base64
+import binascii
+import concurrent.futures
+import json
+import os
+import sys
+
+from chess_ai import ChessAI, evaluate
+from chess_game import BISHOP, KNIGHT, QUEEN, ROOK, ChessBoard
+from chess_pgn import parse_square, square_name
+
+PROMOTION_LETTERS = {'n': KNIGHT, 'b': BISHOP, 'r': ROOK, 'q': QUEEN}
+PROMOTION_NAMES = {piece_type: letter for letter, piece_type in PROMOTION_LETTERS.items()}
+# Tek bir aramanın alabileceği en uzun süre ve istek satırı sınırı
+MAX_TIME_MS = 30000
+MAX_DEPTH = 64
+MAX_LINE_BYTES = 1 << 16
+# Bağlantı başına aynı anda işlenen en fazla istek
+MAX_PIPELINE = 64
+
+# İşçi süreç başlarken kurulan ve istekler arasında korunan motor
+_engine = None
+
+
+def _init_worker(tt_size, book_path):
+    global _engine
+    book = None
+    if book_path:
+        from chess_book import OpeningBook
+        book = OpeningBook(book_path)
+    _engine = ChessAI(tt_size=tt_size, book=book)
+
+
+def move_text(from_pos, to_pos, promotion=None):
+    """Hamleyi istek biçiminde yaz: 'e2e4', terfide 'e7e8n'"""
+    text = square_name(from_pos) + square_name(to_pos)
+    if promotion is not None:
+        text += PROMOTION_NAMES[promotion]
+    return text
+
+
+def _search(snapshot, time_ms, max_depth):
+    """İşçi süreçte en iyi hamleyi ara (transpozisyon tablosu önceki aramalardan kalır)"""
+    game = ChessBoard.from_snapshot(snapshot)
+    move, score, depth = _engine.search(game, time_ms=time_ms, max_depth=max_depth)
+    return {
+        'move': None if move is None else move_text(*move),
+        'score': score,
+        'depth': depth,
+        'nodes': _engine.nodes,
+    }
+
+
+class SearchPool:
+    """Her biri tek süreçli havuzdan oluşan arama işçileri.
+
+    Oturum anahtarı verilen istekler hep aynı işçiye gider (sıcak
+    transpozisyon tablosu); diğerleri en az bekleyen işi olan işçiye verilir.
+    """
+
+    def __init__(self, workers, tt_size=1 << 18, book_path=None):
+        self.executors = [
+            concurrent.futures.ProcessPoolExecutor(1, initializer=_init_worker, initargs=(tt_size, book_path))
+            for _ in range(workers)
+        ]
+        self.pending = [0] * workers
+
+    async def search(self, snapshot, time_ms, max_depth, session=None):
+        if session is not None:
+            index = hash(session) % len(self.executors)
+        else:
+            index = self.pending.index(min(self.pending))
+        self.pending[index] += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executors[index], _search, snapshot, time_ms, max_depth)
+        finally:
+            self.pending[index] -= 1
+
+    def shutdown(self):
+        for executor in self.executors:
+            executor.shutdown(cancel_futures=True)
+
+
+def board_from_request(request):
+    """İstekteki fen/snapshot ve moves alanlarından tahtayı kur; hatalı girdide ValueError"""
+    if 'snapshot' in request:
+        if not isinstance(request['snapshot'], str):
+            raise ValueError("snapshot bir base64 metni olmalı")
+        try:
+            data = base64.b64decode(request['snapshot'], validate=True)
+        except binascii.Error:
+            raise ValueError("snapshot geçerli bir base64 metni değil") from None
+        # from_snapshot baytları FEN kurallarıyla denetler (taş kodları, şahlar, rok, geçerken alma)
+        game = ChessBoard.from_snapshot(data)
+    elif 'fen' in request:
+        if not isinstance(request['fen'], str):
+            raise ValueError("fen bir metin olmalı")
+        game = ChessBoard.from_fen(request['fen'])
+    else:
+        game = ChessBoard()
+    moves = request.get('moves', [])
+    if not isinstance(moves, list) or not all(isinstance(text, str) for text in moves):
+        raise ValueError("moves bir metin listesi olmalı")
+    for text in moves:
+        if len(text) not in (4, 5) or (len(text) == 5 and text[4] not in PROMOTION_LETTERS):
+            raise ValueError(f"Geçersiz hamle: {text!r}")
+        try:
+            from_pos, to_pos = parse_square(text[:2]), parse_square(text[2:4])
+        except (ValueError, IndexError):
+            raise ValueError(f"Geçersiz hamle: {text!r}")
+        success, message = game.make_move(from_pos, to_pos, PROMOTION_LETTERS.get(text[4:]))
+        if not success:
+            raise ValueError(f"{text}: {message}")
+    return game
+
+
+class AnalysisService:
+    """JSON satır protokolüyle analiz isteklerini karşılayan asyncio sunucusu"""
+
+    def __init__(self, pool):
+        self.pool = pool
+
+    async def handle_request(self, request):
+        op = request.get('op')
+        if op == 'ping':
+            return 'pong'
+        game = board_from_request(request)
+        if op == 'legal_moves':
+            return [square_name(from_pos) + square_name(to_pos)
+                    for from_pos, targets in game.get_legal_moves().items() for to_pos in targets]
+        if op == 'status':
+            status = game.get_game_status()
+            return {
+                'fen': game.to_fen(),
+                'turn': game.current_turn,
+                'in_check': status['in_check'],
+                'checkmate': status['checkmate'],
+                'stalemate': status['stalemate'],
+                'draw': status['draw'],
+                'result': game.get_result(),
+                'legal_move_count': sum(len(targets) for targets in status['legal_moves'].values()),
+            }
+        if op == 'evaluate':
+            score = evaluate(game)
+            return {'score': score, 'white_score': score if game.current_turn == 'white' else -score}
+        if op == 'best_move':
+            time_ms = min(int(request.get('time_ms', 1000)), MAX_TIME_MS)
+            max_depth = int(request.get('max_depth', MAX_DEPTH))
+            if max_depth < 1:
+                raise ValueError(f"Geçersiz max_depth: {max_depth}")
+            max_depth = min(max_depth, MAX_DEPTH)
+            return await self.pool.search(game.snapshot(), time_ms, max_depth, request.get('session'))
+        raise ValueError(f"Bilinmeyen işlem: {op!r}")
+
+    async def respond(self, writer, limit, line):
+        # Yanıt ne olursa olsun yazılmaya çalışılır ve boru hattı yeri geri verilir
+        try:
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError("İstek bir JSON nesnesi olmalı")
+            except ValueError as e:
+                response = {'id': None, 'ok': False, 'error': f"Geçersiz istek: {e}"}
+            else:
+                try:
+                    response = {'id': request.get('id'), 'ok': True, 'result': await self.handle_request(request)}
+                except (ValueError, TypeError, KeyError, IndexError) as e:
+                    response = {'id': request.get('id'), 'ok': False, 'error': str(e)}
+                except Exception as e:
+                    # Beklenmeyen hatalar da (ör. çöken işçi havuzu) istemciye bildirilir
+                    response = {'id': request.get('id'), 'ok': False, 'error': f"{type(e).__name__}: {e}"}
+            writer.write(json.dumps(response).encode('utf-8') + b'\n')
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            limit.release()
+
+    async def handle_connection(self, reader, writer):
+        """Bağlantıdaki istekleri okur; her istek ayrı görevde işlenir, yanıtlar hazır oldukça yazılır"""
+        limit = asyncio.Semaphore(MAX_PIPELINE)
+        tasks = set()
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ValueError, ConnectionError):
+                    # Çok uzun satır veya kopan bağlantı
+                    break
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                await limit.acquire()
+                task = asyncio.create_task(self.respond(writer, limit, line))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+        finally:
+            writer.close()
+
+    async def serve(self, host='127.0.0.1', port=8765, unix_path=None):
+        if unix_path:
+            server = await asyncio.start_unix_server(self.handle_connection, unix_path, limit=MAX_LINE_BYTES)
+        else:
+            server = await asyncio.start_server(self.handle_connection, host, port, limit=MAX_LINE_BYTES)
+        async with server:
+            await server.serve_forever()
+
+
+class AnalysisClient:
+    """Servise tek bağlantı üzerinden istek gönderen asyncio istemcisi (istekler ardışık gönderilebilir)"""
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.next_id = 0
+        self.waiting = {}
+        self.reader_task = asyncio.create_task(self.read_responses())
+
+    @classmethod
+    async def connect(cls, host='127.0.0.1', port=8765, unix_path=None):
+        if unix_path:
+            reader, writer = await asyncio.open_unix_connection(unix_path, limit=MAX_LINE_BYTES)
+        else:
+            reader, writer = await asyncio.open_connection(host, port, limit=MAX_LINE_BYTES)
+        return cls(reader, writer)
+
+    async def read_responses(self):
+        while True:
+            line = await self.reader.readline()
+            if not line:
+                break
+            response = json.loads(line)
+            future = self.waiting.pop(response.get('id'), None)
+            if future is not None and not future.done():
+                future.set_result(response)
+        for future in self.waiting.values():
+            if not future.done():
+                future.set_exception(ConnectionError("Servis bağlantısı kapandı"))
+
+    async def request(self, op, **fields):
+        """İsteği gönder ve sonucunu döndür; servis hata bildirirse ValueError"""
+        self.next_id += 1
+        request_id = self.next_id
+        future = asyncio.get_running_loop().create_future()
+        self.waiting[request_id] = future
+        self.writer.write(json.dumps({'id': request_id, 'op': op, **fields}).encode('utf-8') + b'\n')
+        await self.writer.drain()
+        response = await future
+        if not response['ok']:
+            raise ValueError(response['error'])
+        return response['result']
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+        self.reader_task.cancel()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ChessBoard analiz servisi")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--unix', help="TCP yerine bu Unix soket yolunu dinle")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="arama işçisi sayısı")
+    parser.add_argument('--tt-size', type=int, default=1 << 18, help="işçi başına transpozisyon tablosu boyutu")
+    parser.add_argument('--book', help="açılış kitabı dosyası")
+    args = parser.parse_args()
+
+    pool = SearchPool(args.workers, args.tt_size, args.book)
+    service = AnalysisService(pool)
+    address = args.unix or f"{args.host}:{args.port}"
+    print(f"Analiz servisi {address} adresinde ({args.workers} işçi)", file=sys.stderr)
+    try:
+        asyncio.run(service.serve(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        pool.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
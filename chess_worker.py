@@ -0,0 +1,76 @@
+import queue
+import threading
+
+from chess_ai import ChessAI
+from chess_game import ChessBoard
+
+
+class EngineWorker:
+    """Motor hesaplamalarını (bilgisayar hamlesi, ipucu) arka planda yapan işçi.
+
+    İstekler sırayla tek bir iş parçacığında işlenir ve sonuçlar
+    on_result(kind, request_id, result) geri çağrısıyla bildirilir. GUI bu
+    çağrıda bir pygame olayı gönderir; böylece olay döngüsü hiç beklemez.
+    cancel() o ana kadar gönderilmiş tüm istekleri iptal eder.
+    """
+
+    def __init__(self, on_result, ai=None):
+        self.on_result = on_result
+        self.ai = ai or ChessAI()
+        self.tasks = queue.Queue()
+        self.lock = threading.Lock()
+        self.last_request_id = 0
+        # Bu kimlikten küçük istekler iptal edilmiş sayılır
+        self.first_valid_id = 1
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def submit(self, kind, game, **params):
+        """İsteği kuyruğa ekle ve kimliğini döndür"""
+        with self.lock:
+            self.last_request_id += 1
+            request_id = self.last_request_id
+        # Arama tahtayı değiştirdiği için işçi oyunun bir kopyası üzerinde çalışır
+        board = ChessBoard.from_snapshot(game.snapshot())
+        self.tasks.put((request_id, kind, board, params))
+        return request_id
+
+    def request_move(self, game, time_ms=1000):
+        return self.submit('move', game, time_ms=time_ms)
+
+    def request_hint(self, game, time_ms=500):
+        return self.submit('hint', game, time_ms=time_ms)
+
+    def cancel(self):
+        """Bekleyen ve çalışan tüm istekleri iptal et"""
+        with self.lock:
+            self.first_valid_id = self.last_request_id + 1
+        self.ai.stop()
+
+    def is_current(self, request_id):
+        """İstek iptal edilmediyse True"""
+        return request_id >= self.first_valid_id
+
+    def shutdown(self):
+        self.cancel()
+        self.tasks.put(None)
+        self.thread.join(timeout=1)
+
+    def run(self):
+        while True:
+            task = self.tasks.get()
+            if task is None:
+                return
+
+            request_id, kind, board, params = task
+            # Durdurma bayrağı aramanın içinde değil burada temizlenir: bu noktadan sonra
+            # gelen cancel() arama başlamadan önce gelse bile kaybolmaz
+            self.ai.clear_stop()
+            if not self.is_current(request_id):
+                continue
+
+            result = self.ai.best_move(board, **params)
+
+            # Hesap sürerken iptal edildiyse sonucu bildirme
+            if self.is_current(request_id):
+                self.on_result(kind, request_id, result)
@@ -0,0 +1,53 @@
+"""ChessAI hamle üretimi ve aramasının testleri"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from chess_ai import INFINITY, ChessAI
+from chess_game import BISHOP, KNIGHT, QUEEN, ROOK, ChessBoard, decode_move
+
+
+def play(game, *moves):
+    for text in moves:
+        from_pos = (8 - int(text[1]), ord(text[0]) - ord('a'))
+        to_pos = (8 - int(text[3]), ord(text[2]) - ord('a'))
+        success, message = game.make_move(from_pos, to_pos)
+        assert success, message
+
+
+def test_generate_moves_includes_every_promotion():
+    game = ChessBoard.from_fen('8/4P3/8/8/8/8/k7/4K3 w - - 0 1')
+    promotions = {decode_move(move)[2] for move in ChessAI().generate_moves(game)
+                  if decode_move(move)[0] == (1, 4)}
+    assert promotions == {QUEEN, ROOK, BISHOP, KNIGHT}
+
+
+def test_search_finds_knight_underpromotion():
+    # Yalnızca f8=N mat eder; vezire terfi mat etmez
+    game = ChessBoard.from_fen('6bb/5Ppk/6pp/8/8/8/8/K7 w - - 0 1')
+    move, score, _ = ChessAI().search(game, time_ms=5000, max_depth=3)
+    assert move == ((1, 5), (0, 5), KNIGHT)
+    assert score > 0
+
+
+def test_search_returns_promotion_none_for_normal_moves():
+    move, _, _ = ChessAI().search(ChessBoard(), time_ms=5000, max_depth=2)
+    assert len(move) == 3 and move[2] is None
+
+
+def test_repeated_position_scores_as_draw():
+    game = ChessBoard()
+    play(game, 'g1f3', 'g8f6', 'f3g1', 'f6g8')
+    ai = ChessAI()
+    ai.deadline = float('inf')
+    # Başlangıç pozisyonu ikinci kez görüldü: kök dışındaki düğümlerde beraberlik
+    assert ai.negamax(game, 3, -INFINITY, INFINITY, 1) == 0
+
+
+def test_fifty_move_rule_scores_as_draw():
+    # Beyaz bir vezir önde ama elli hamle sınırı dolmuş
+    game = ChessBoard.from_fen('7k/8/8/8/8/8/8/Q6K b - - 100 120')
+    ai = ChessAI()
+    ai.deadline = float('inf')
+    assert ai.negamax(game, 3, -INFINITY, INFINITY, 1) == 0
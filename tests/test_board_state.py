@@ -0,0 +1,128 @@
+"""ChessBoard'un artımlı tuttuğu durumun ve hamle üretiminin testleri.
+
+Rastgele make_move/undo_move/redo_move dizilerinden sonra bitboard'lar,
+doluluk maskeleri, şah kareleri ve Zobrist anahtarı tahtadan sıfırdan
+hesaplananlarla karşılaştırılır. Perft sayıları rok, geçerken alma ve
+terfi kurallarını ve push/pop geri almasını sınar.
+"""
+import copy
+import os
+import pickle
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from chess_game import PROMOTION_TYPES, ChessBoard
+
+# (FEN (None = başlangıç pozisyonu), derinliğe göre standart perft düğüm sayıları);
+# derinlikler testler birkaç saniyede bitecek şekilde seçilmiştir
+PERFT_POSITIONS = [
+    (None, {1: 20, 2: 400, 3: 8902}),
+    ('r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1', {1: 48, 2: 2039}),
+    ('8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1', {1: 14, 2: 191, 3: 2812, 4: 43238}),
+    ('r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1', {1: 6, 2: 264, 3: 9467}),
+    ('rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8', {1: 44, 2: 1486}),
+]
+
+
+def recomputed_state(game):
+    """Bitboard'ları, doluluk maskelerini ve şah karelerini yalnızca game.board'dan hesapla"""
+    bitboards = [0] * 12
+    occupancy = {'white': 0, 'black': 0}
+    king_squares = {'white': None, 'black': None}
+    for row in range(8):
+        for col in range(8):
+            piece = game.board[row][col]
+            if piece is None:
+                continue
+            square = row * 8 + col
+            bitboards[piece.index] |= 1 << square
+            occupancy[piece.color] |= 1 << square
+            if piece.symbol in ('♔', '♚'):
+                king_squares[piece.color] = square
+    return bitboards, occupancy, king_squares
+
+
+def assert_state_consistent(game):
+    bitboards, occupancy, king_squares = recomputed_state(game)
+    assert game.bitboards == bitboards
+    assert game.occupancy == occupancy
+    assert game.occupied == occupancy['white'] | occupancy['black']
+    assert game.king_squares == king_squares
+    assert game.zobrist_key == game.compute_zobrist_key()
+
+
+def random_legal_move(game, rng):
+    moves = [(from_pos, to_pos) for from_pos, targets in game.get_legal_moves().items() for to_pos in targets]
+    if not moves:
+        return None
+    from_pos, to_pos = rng.choice(moves)
+    return from_pos, to_pos, rng.choice(PROMOTION_TYPES)
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_tracked_state_matches_recompute(seed):
+    rng = random.Random(seed)
+    game = ChessBoard()
+    for _ in range(300):
+        action = rng.random()
+        if action < 0.15:
+            game.undo_move()
+        elif action < 0.25:
+            game.redo_move()
+        else:
+            move = random_legal_move(game, rng)
+            if move is None:
+                game.undo_move()
+            else:
+                success, message = game.make_move(*move)
+                assert success, message
+        assert_state_consistent(game)
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_undo_to_start_restores_position(seed):
+    rng = random.Random(seed)
+    game = ChessBoard()
+    start_key = game.zobrist_key
+    start_snapshot = game.snapshot()
+    for _ in range(80):
+        move = random_legal_move(game, rng)
+        if move is None:
+            break
+        game.make_move(*move)
+    while game.current_move >= 0:
+        game.undo_move()
+    assert game.zobrist_key == start_key
+    assert game.snapshot() == start_snapshot
+    assert_state_consistent(game)
+
+
+@pytest.mark.parametrize('fen, expected_counts', PERFT_POSITIONS)
+def test_perft(fen, expected_counts):
+    game = ChessBoard.from_fen(fen) if fen else ChessBoard()
+    snapshot = game.snapshot()
+    for depth, expected in sorted(expected_counts.items()):
+        assert game.perft(depth) == expected
+    # perft push/pop ile gezer; pozisyon değişmeden kalmalı
+    assert game.snapshot() == snapshot
+    assert_state_consistent(game)
+
+
+def test_pieces_and_boards_survive_copy_and_pickle():
+    game = ChessBoard()
+    game.make_move((6, 4), (4, 4))
+    piece = game.board[4][4]
+    assert copy.copy(piece) is piece
+    assert copy.deepcopy(piece) is piece
+    assert pickle.loads(pickle.dumps(piece)) is piece
+
+    for clone in (copy.deepcopy(game), pickle.loads(pickle.dumps(game))):
+        assert clone.board[4][4] is piece
+        assert clone.to_fen() == game.to_fen()
+        assert_state_consistent(clone)
+        clone.undo_move()
+        assert clone.to_fen() == ChessBoard().to_fen()
@@ -0,0 +1,62 @@
+"""Açılış kitabı testleri: kitap yazma, ikili arama ve hamle seçimi"""
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from chess_book import ENTRY, OpeningBook, book_entries, write_book
+from chess_game import ChessBoard, encode_move
+
+E2E4 = encode_move((6, 4), (4, 4))
+D2D4 = encode_move((6, 3), (4, 3))
+
+
+def played(*moves):
+    game = ChessBoard()
+    for from_pos, to_pos in moves:
+        success, message = game.make_move(from_pos, to_pos)
+        assert success, message
+    return game
+
+
+def build(tmp_path, games, **kwargs):
+    path = str(tmp_path / 'book.bin')
+    write_book(path, book_entries(games), **kwargs)
+    return path
+
+
+def test_book_orders_moves_by_weight(tmp_path):
+    games = [played(((6, 4), (4, 4)), ((1, 4), (3, 4))) for _ in range(3)] + [played(((6, 3), (4, 3)))]
+    with OpeningBook(build(tmp_path, games)) as book:
+        assert len(book) == 3
+        start = ChessBoard()
+        assert book.entries(start.zobrist_key) == [(E2E4, 3), (D2D4, 1)]
+        assert book.moves(start) == [(E2E4, 3), (D2D4, 1)]
+        assert book.entries(start.zobrist_key ^ 1) == []
+        assert book.choose(start, random.Random(0)) in (E2E4, D2D4)
+        # Kitapta olmayan pozisyon
+        assert book.choose(played(((6, 7), (5, 7)))) is None
+
+
+def test_min_count_and_max_ply(tmp_path):
+    games = [played(((6, 4), (4, 4)), ((1, 4), (3, 4))), played(((6, 4), (4, 4)))]
+    path = str(tmp_path / 'book.bin')
+    assert write_book(path, book_entries(games, max_ply=1), min_count=2) == 1
+    with OpeningBook(path) as book:
+        assert book.moves(ChessBoard()) == [(E2E4, 2)]
+
+
+def test_book_skips_illegal_entries_from_key_collisions(tmp_path):
+    # Başlangıç anahtarına yasadışı bir hamle (e2e5) yazılmış kitap
+    path = tmp_path / 'book.bin'
+    path.write_bytes(ENTRY.pack(ChessBoard().zobrist_key, encode_move((6, 4), (3, 4)), 5, 0))
+    with OpeningBook(str(path)) as book:
+        assert book.entries(ChessBoard().zobrist_key) == [(encode_move((6, 4), (3, 4)), 5)]
+        assert book.moves(ChessBoard()) == []
+
+
+def test_empty_book(tmp_path):
+    with OpeningBook(build(tmp_path, [])) as book:
+        assert len(book) == 0
+        assert book.choose(ChessBoard()) is None
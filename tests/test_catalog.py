@@ -0,0 +1,61 @@
+"""SaveCatalog testleri: klasör eşitleme, sıralama ve oyuncu filtresi"""
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from chess_catalog import SaveCatalog
+from chess_game import ChessBoard
+
+
+def write_save(directory, filename, white, black, date, moves=0):
+    game = ChessBoard()
+    data = {
+        'game': game.to_history_dict(),
+        'white_player': white,
+        'black_player': black,
+        'move_count': moves,
+        'date': date,
+    }
+    with open(os.path.join(directory, filename), 'w') as f:
+        json.dump(data, f)
+    return data
+
+
+def test_sync_adds_and_removes_files(tmp_path):
+    write_save(tmp_path, 'a.json', 'Ali', 'Ayşe', '2024-01-01 10:00:00')
+    write_save(tmp_path, 'b.json', 'Can', 'Deniz', '2024-01-02 10:00:00')
+    (tmp_path / 'bozuk.json').write_text('{')
+    catalog = SaveCatalog(str(tmp_path))
+    catalog.sync()
+    assert catalog.count() == 3
+    rows = catalog.query()
+    # Okunamayan kayıt da listelenir; NULL tarih azalan sıralamada en sonda kalır
+    assert [row['filename'] for row in rows] == ['b.json', 'a.json', 'bozuk.json']
+    assert rows[0]['result'] == '*'
+
+    os.remove(tmp_path / 'a.json')
+    catalog.sync()
+    assert catalog.count() == 2
+    catalog.close()
+
+
+def test_update_indexes_without_sync(tmp_path):
+    catalog = SaveCatalog(str(tmp_path))
+    data = write_save(tmp_path, 'c.json', 'Ece', 'Fatih', '2024-02-01 09:00:00', moves=12)
+    catalog.update('c.json', data)
+    assert catalog.query(player='ece')[0]['move_count'] == 12
+    catalog.close()
+
+
+def test_player_filter_treats_wildcards_literally(tmp_path):
+    write_save(tmp_path, 'a.json', 'ali_veli', 'x', '2024-01-01 10:00:00')
+    write_save(tmp_path, 'b.json', 'aliXveli', 'y', '2024-01-02 10:00:00')
+    write_save(tmp_path, 'c.json', '100%', 'z', '2024-01-03 10:00:00')
+    catalog = SaveCatalog(str(tmp_path))
+    catalog.sync()
+    assert [row['filename'] for row in catalog.query(player='ali_veli')] == ['a.json']
+    assert [row['filename'] for row in catalog.query(player='%')] == ['c.json']
+    assert catalog.count('ali') == 2
+    catalog.close()
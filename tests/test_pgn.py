@@ -0,0 +1,106 @@
+"""FEN ve PGN okuma/yazma testleri"""
+import io
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from chess_game import ChessBoard
+from chess_pgn import PGNError, game_to_pgn, move_to_san, parse_san, read_pgn, write_pgn
+
+FENS = [
+    'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1',
+    'r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1',
+    'rnbqkbnr/ppp1p1pp/8/3pPp2/8/8/PPPP1PPP/RNBQKBNR w KQkq f6 0 3',
+    '8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 b - - 37 60',
+]
+
+
+def random_game(seed, plies=60):
+    rng = random.Random(seed)
+    game = ChessBoard()
+    for _ in range(plies):
+        moves = [(from_pos, to_pos) for from_pos, targets in game.get_legal_moves().items() for to_pos in targets]
+        if not moves:
+            break
+        game.make_move(*rng.choice(moves))
+    return game
+
+
+@pytest.mark.parametrize('fen', FENS)
+def test_fen_round_trip(fen):
+    assert ChessBoard.from_fen(fen).to_fen() == fen
+
+
+@pytest.mark.parametrize('fen', [
+    'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP w KQkq - 0 1',
+    'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR x KQkq - 0 1',
+    'rnbqkbnr/pppppppp/9/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1',
+])
+def test_invalid_fen_raises_value_error(fen):
+    with pytest.raises(ValueError):
+        ChessBoard.from_fen(fen)
+
+
+def test_pgn_write_read_round_trip():
+    games = [random_game(seed) for seed in range(10)]
+    stream = io.StringIO()
+    for index, game in enumerate(games):
+        write_pgn(stream, game, {'White': 'A', 'Black': 'B', 'Round': str(index)})
+    read_back = list(read_pgn(io.StringIO(stream.getvalue())))
+    assert len(read_back) == len(games)
+    for game, pgn_game in zip(games, read_back):
+        assert pgn_game.board.to_fen() == game.to_fen()
+        assert pgn_game.headers['Round'] == str(games.index(game))
+
+
+def test_san_round_trip_for_every_legal_move():
+    game = ChessBoard.from_fen(FENS[1])
+    for from_pos, targets in game.get_legal_moves().items():
+        for to_pos in targets:
+            san = move_to_san(game, from_pos, to_pos)
+            assert parse_san(game, san)[:2] == (from_pos, to_pos)
+
+
+def test_read_pgn_skips_comments_variations_and_nags():
+    text = ('[Event "x"]\n\n1. e4 {yorum\n[%clk 0:01:00] devam} e5 (1... c5 2. Nf3) '
+            '2. Nf3 $1 ; satır yorumu\nNc6 1-0\n')
+    (game,) = read_pgn(io.StringIO(text))
+    assert game.moves == ['e4', 'e5', 'Nf3', 'Nc6']
+    assert game.result == '1-0'
+
+
+def test_read_pgn_skip_invalid_continues_with_next_game():
+    text = '1. e4 e4 *\n\n[Event "iki"]\n\n1. d4 d5 *\n'
+    with pytest.raises(PGNError):
+        list(read_pgn(io.StringIO(text)))
+    games = list(read_pgn(io.StringIO(text), skip_invalid=True))
+    assert [game.moves for game in games] == [['d4', 'd5']]
+
+
+def test_setup_fen_header_is_used():
+    text = '[SetUp "1"]\n[FEN "4k3/8/8/8/8/8/4P3/4K3 b - - 0 30"]\n\n30... Kd7 31. e4 *\n'
+    (game,) = read_pgn(io.StringIO(text))
+    assert game.board.to_fen() == '8/3k4/8/8/4P3/8/8/4K3 b - - 0 31'
+    assert '[FEN "4k3/8/8/8/8/8/4P3/4K3 b - - 0 30"]' in game_to_pgn(game.board)
+
+
+@pytest.mark.parametrize('fen, san', [
+    ('4k3/8/8/8/4p3/3P4/8/4K3 w - - 0 1', 'e4'),
+    (None, 'Nxf3'),
+    ('4k3/8/8/8/8/4p3/8/R3K3 w Q - 0 1', 'Re1'),
+])
+def test_parse_san_rejects_wrong_capture_marks(fen, san):
+    game = ChessBoard.from_fen(fen) if fen else ChessBoard()
+    with pytest.raises(PGNError):
+        parse_san(game, san)
+
+
+def test_parse_san_reports_unavailable_castling():
+    game = ChessBoard.from_fen('r3k2r/8/8/8/8/8/8/R3K2R w Qkq - 0 1')
+    with pytest.raises(PGNError, match='Rok'):
+        parse_san(game, 'O-O')
+    assert parse_san(game, 'O-O-O') == ((7, 4), (7, 2), None)
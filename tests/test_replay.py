@@ -0,0 +1,56 @@
+"""PGN bölme ve toplu yeniden oynatma (chess_game.py replay) testleri"""
+import io
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from chess_game import replay_main, replay_pgn_chunk
+from chess_pgn import split_games
+
+TWO_GAMES = (
+    '[Event "a"]\n'
+    '\n'
+    '1. e4 {uzun yorum\n'
+    '[%clk 0:01:00] devam} e5 2. Nf3 Nc6 *\n'
+    '\n'
+    '[Event "b"]\n'
+    '\n'
+    '1. d4 (1. c4 ; satır yorumu [x]\n'
+    '[y] e5) d5 2. c4 *\n'
+)
+
+
+def test_split_games_ignores_tag_like_lines_in_comments_and_variations():
+    chunks = list(split_games(io.StringIO(TWO_GAMES)))
+    assert [first_line for first_line, _ in chunks] == [1, 6]
+    assert chunks[0][1].startswith('[Event "a"]') and chunks[1][1].startswith('[Event "b"]')
+
+
+def test_split_games_without_headers_between_games():
+    text = '[Event "a"]\n1. e4 *\n[Event "b"]\n[Site "?"]\n1. d4 *\n'
+    assert [first_line for first_line, _ in split_games(io.StringIO(text))] == [1, 3]
+
+
+def test_replay_chunks_validate_every_game():
+    rows = [row for first_line, text in split_games(io.StringIO(TWO_GAMES))
+            for row in replay_pgn_chunk(('x.pgn', first_line, text))]
+    assert [row['legal'] for row in rows] == [True, True]
+    assert [row['moves'] for row in rows] == [4, 3]
+
+
+def test_replay_reports_illegal_move_with_file_line():
+    text = '[Event "a"]\n\n1. e4 e5 *\n\n[Event "b"]\n\n1. e4 e4 *\n'
+    chunks = list(split_games(io.StringIO(text)))
+    (row,) = replay_pgn_chunk(('x.pgn',) + chunks[1])
+    assert not row['legal']
+    assert row['error'].startswith('7. satır')
+
+
+def test_replay_main_rejects_missing_path(tmp_path, capsys):
+    with pytest.raises(SystemExit) as excinfo:
+        replay_main([str(tmp_path / 'yok.pgn')])
+    assert excinfo.value.code == 2
+    assert 'bulunamadı' in capsys.readouterr().err
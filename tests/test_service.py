@@ -0,0 +1,73 @@
+"""Analiz servisi testleri: gerçek bir TCP bağlantısı üzerinden istek/yanıt"""
+import asyncio
+import base64
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from chess_game import SNAPSHOT_NO_EP, SNAPSHOT_SIZE, ChessBoard
+from chess_service import MAX_LINE_BYTES, AnalysisClient, AnalysisService, SearchPool
+
+
+def kings_only_snapshot(castling):
+    data = bytearray(SNAPSHOT_SIZE)
+    data[4] = 12   # e8 siyah şah
+    data[60] = 6   # e1 beyaz şah
+    data[64:] = bytes((0, castling, SNAPSHOT_NO_EP))
+    return base64.b64encode(bytes(data)).decode('ascii')
+
+
+def run_requests(pool, requests):
+    """Servisi rastgele bir portta başlat, (op, alanlar) isteklerini sırayla gönder ve yanıtları döndür"""
+    async def session():
+        service = AnalysisService(pool)
+        server = await asyncio.start_server(service.handle_connection, '127.0.0.1', 0, limit=MAX_LINE_BYTES)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            client = await AnalysisClient.connect('127.0.0.1', port)
+            results = []
+            for op, fields in requests:
+                try:
+                    results.append((True, await client.request(op, **fields)))
+                except ValueError as e:
+                    results.append((False, str(e)))
+            await client.close()
+        return results
+    return asyncio.run(session())
+
+
+def test_status_and_legal_moves():
+    (ok, status), (ok_moves, moves) = run_requests(None, [
+        ('status', {'moves': ['e2e4', 'e7e5']}),
+        ('legal_moves', {'fen': '4k3/8/8/8/8/8/8/4K2R w K - 0 1'}),
+    ])
+    assert ok and status['turn'] == 'white' and status['legal_move_count'] == 29
+    assert ok_moves and 'e1g1' in moves
+
+
+@pytest.mark.parametrize('fields, message', [
+    ({'snapshot': kings_only_snapshot(15)}, 'rok'),
+    ({'snapshot': base64.b64encode(bytes(10)).decode('ascii')}, 'uzunluğu'),
+    ({'snapshot': '!!bozuk!!'}, 'base64'),
+    ({'snapshot': 123}, 'base64'),
+    ({'fen': 'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP w KQkq - 0 1'}, 'FEN'),
+    ({'fen': '8/8/8/8/8/8/8/4K3 w - - 0 1'}, 'şah'),
+    ({'moves': ['e2e5']}, 'e2e5'),
+])
+def test_bad_position_input_is_reported(fields, message):
+    ((ok, error),) = run_requests(None, [('legal_moves', fields)])
+    assert not ok
+    assert message in error
+
+
+def test_best_move_uses_worker_pool():
+    pool = SearchPool(1, tt_size=1 << 12)
+    try:
+        snapshot = base64.b64encode(ChessBoard.from_fen('6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1').snapshot()).decode('ascii')
+        ((ok, result),) = run_requests(pool, [('best_move', {'snapshot': snapshot, 'time_ms': 5000, 'max_depth': 2})])
+    finally:
+        pool.shutdown()
+    assert ok and result['move'] == 'a1a8'
@@ -0,0 +1,58 @@
+"""snapshot/from_snapshot testleri: gidiş-dönüş ve geçersiz baytların reddi"""
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from chess_game import SNAPSHOT_NO_EP, SNAPSHOT_SIZE, ChessBoard
+
+
+def kings_only(castling=0, turn=0, ep=SNAPSHOT_NO_EP):
+    data = bytearray(SNAPSHOT_SIZE)
+    data[4] = 12   # e8 siyah şah
+    data[60] = 6   # e1 beyaz şah
+    data[64:] = bytes((turn, castling, ep))
+    return data
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_snapshot_round_trip(seed):
+    rng = random.Random(seed)
+    game = ChessBoard()
+    for _ in range(60):
+        moves = [(from_pos, to_pos) for from_pos, targets in game.get_legal_moves().items() for to_pos in targets]
+        if not moves:
+            break
+        game.make_move(*rng.choice(moves))
+        copy = ChessBoard.from_snapshot(game.snapshot())
+        assert copy.to_fen().split()[:4] == game.to_fen().split()[:4]
+        assert copy.zobrist_key == game.zobrist_key
+
+
+def test_snapshot_keeps_capturable_en_passant():
+    game = ChessBoard.from_fen('4k3/8/8/3pP3/8/8/8/4K3 w - d6 0 1')
+    assert ChessBoard.from_snapshot(game.snapshot()).ep_square == game.ep_square == 19
+
+
+@pytest.mark.parametrize('data, message', [
+    (kings_only()[:-1], 'uzunluğu'),
+    (kings_only(castling=15), 'rok'),
+    (kings_only(castling=16), 'rok'),
+    (kings_only(turn=2), 'sıra'),
+    (kings_only()[:4] + bytes([13]) + kings_only()[5:], 'taş kodu'),
+    (bytes(4) + bytes([0]) + kings_only()[5:], 'şah'),
+    (kings_only()[:3] + bytes([12]) + kings_only()[4:], 'şah'),
+    (kings_only(ep=19), 'geçerken'),
+    (kings_only(ep=99), 'geçerken'),
+])
+def test_invalid_snapshot_raises_value_error(data, message):
+    with pytest.raises(ValueError, match=message):
+        ChessBoard.from_snapshot(bytes(data))
+
+
+def test_fen_requires_one_king_per_side():
+    with pytest.raises(ValueError, match='şah'):
+        ChessBoard.from_fen('8/8/8/8/8/8/8/4K3 w - - 0 1')